@@ -0,0 +1,265 @@
+"""
+Compiler frontend benchmark suite.
+
+Generates synthetic programs of several shapes and sizes and measures, for
+every program, the time to capture it (run the program and build its AST
+operations), the time of `nada_dsl_to_nada_mir`, the time to serialize the MIR
+into JSON, the peak resident memory and the size of the MIR.
+
+Every program is compiled in a fresh process, so the peak resident memory is
+the one of that program only.
+
+The results can be written into a JSON file, and compared with a previous
+results file to detect regressions:
+
+    python benchmarks/frontend.py --output benchmarks/baseline.json
+    python benchmarks/frontend.py --baseline benchmarks/baseline.json
+
+When comparing, the benchmark exits with status 1 if any measurement is worse
+than the baseline by more than the tolerance.
+
+Usage:
+
+    python benchmarks/frontend.py [--sizes N [N ...]] [--shapes SHAPE [SHAPE ...]]
+        [--source-refs {eager,lazy,off}] [--output PATH] [--baseline PATH]
+        [--tolerance RATIO]
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from nada_dsl import (
+    Array,
+    Input,
+    Integer,
+    NTuple,
+    Object,
+    Output,
+    Party,
+    SecretInteger,
+    nada_fn,
+)
+from nada_dsl.compilation_context import SOURCE_REF_MODES, CompilationContext
+from nada_dsl.compiler_frontend import nada_dsl_to_nada_mir
+
+# Measurements compared with the baseline, a higher value is worse
+MEASUREMENTS = (
+    "capture_seconds",
+    "mir_seconds",
+    "serialize_seconds",
+    "peak_rss_bytes",
+    "mir_bytes",
+)
+# Time differences below this are noise, whatever their ratio
+MIN_SECONDS_DIFFERENCE = 0.01
+
+
+def inputs(count: int):
+    """Returns a party and `count` secret inputs."""
+    party = Party(name="Party1")
+    return party, [
+        SecretInteger(Input(name=f"input_{i}", party=party)) for i in range(count)
+    ]
+
+
+def wide_sum(size: int) -> List[Output]:
+    """Many independent products summed by a balanced tree of additions."""
+    party, (a,) = inputs(1)
+    terms = [a * Integer(i) for i in range(size // 3)]
+    while len(terms) > 1:
+        pairs = [left + right for left, right in zip(terms[::2], terms[1::2])]
+        terms = pairs + terms[len(pairs) * 2 :]
+    return [Output(terms[0], "sum", party)]
+
+
+def deep_chain(size: int) -> List[Output]:
+    """A single chain of dependent multiplications and additions."""
+    party, (a, b) = inputs(2)
+    total = a
+    for _ in range(size // 2):
+        total = total * b + a
+    return [Output(total, "chain", party)]
+
+
+def map_reduce(size: int) -> List[Output]:
+    """Maps applied on top of each other, each one reduced into a sum."""
+    party, (a, b) = inputs(2)
+    array = Array(SecretInteger(Input(name="array", party=party)), size=10)
+
+    @nada_fn
+    def increment(x: SecretInteger) -> SecretInteger:
+        return x + b
+
+    @nada_fn
+    def add(x: SecretInteger, y: SecretInteger) -> SecretInteger:
+        return x + y
+
+    total = a
+    for _ in range(size // 3):
+        array = array.map(increment)
+        total = total + array.reduce(add, a)
+    return [Output(total, "total", party)]
+
+
+def array_new(size: int) -> List[Output]:
+    """A single large array built from its elements."""
+    party, (a,) = inputs(1)
+    elements = [a + Integer(i) for i in range(size // 2)]
+    return [Output(Array.new(*elements), "array", party)]
+
+
+def accessors(size: int) -> List[Output]:
+    """Repeated accesses to the elements of a tuple and an object."""
+    party, (a, b) = inputs(2)
+    ntuple = NTuple.new([a, b])
+    obj = Object.new({"a": a, "b": b})
+    total = a
+    for i in range(size // 4):
+        total = total + ntuple[i % 2]
+        total = total + (obj.a if i % 2 else obj.b)
+    return [Output(total, "total", party)]
+
+
+def functions(size: int) -> List[Output]:
+    """Many small Nada functions, each one called once."""
+    party, (a, b) = inputs(2)
+    total = a
+    for _ in range(size // 4):
+
+        @nada_fn
+        def step(x: SecretInteger) -> SecretInteger:
+            return x + b
+
+        total = step(total)
+    return [Output(total, "total", party)]
+
+
+SHAPES: Dict[str, Callable[[int], List[Output]]] = {
+    "wide_sum": wide_sum,
+    "deep_chain": deep_chain,
+    "map_reduce": map_reduce,
+    "array_new": array_new,
+    "accessors": accessors,
+    "functions": functions,
+}
+
+
+def run_case(shape: str, size: int, source_ref_mode: str) -> Dict[str, Any]:
+    """Compile a generated program and return its measurements."""
+    with CompilationContext(source_ref_mode=source_ref_mode) as context:
+        start = time.perf_counter()
+        outputs = SHAPES[shape](size)
+        captured = time.perf_counter()
+        operations = len(context.operations)
+        mir = nada_dsl_to_nada_mir(outputs)
+        converted = time.perf_counter()
+        serialized = json.dumps(mir)
+        serialized_time = time.perf_counter()
+    return {
+        "shape": shape,
+        "size": size,
+        "operations": operations,
+        "capture_seconds": captured - start,
+        "mir_seconds": converted - captured,
+        "serialize_seconds": serialized_time - converted,
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        "mir_bytes": len(serialized.encode("utf-8")),
+    }
+
+
+def run_isolated(shape: str, size: int, source_ref_mode: str) -> Dict[str, Any]:
+    """Run a case in a new process."""
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        return pool.submit(run_case, shape, size, source_ref_mode).result()
+
+
+def regressions(
+    results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float
+) -> List[str]:
+    """Returns a description of every measurement worse than the baseline by more
+    than `tolerance`."""
+    baseline_cases = {(case["shape"], case["size"]): case for case in baseline}
+    found = []
+    for case in results:
+        reference = baseline_cases.get((case["shape"], case["size"]))
+        if reference is None:
+            continue
+        for measurement in MEASUREMENTS:
+            difference = case[measurement] - reference[measurement]
+            if measurement.endswith("_seconds") and difference < MIN_SECONDS_DIFFERENCE:
+                continue
+            if difference > reference[measurement] * tolerance:
+                found.append(
+                    f"{case['shape']}[{case['size']}] {measurement}: "
+                    f"{reference[measurement]:.4g} -> {case[measurement]:.4g}"
+                )
+    return found
+
+
+def main() -> int:
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--shapes", nargs="+", choices=list(SHAPES), default=SHAPES)
+    parser.add_argument("--source-refs", choices=SOURCE_REF_MODES, default="eager")
+    parser.add_argument("--output", metavar="PATH", help="Write the results")
+    parser.add_argument(
+        "--baseline", metavar="PATH", help="Compare the results with a baseline"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    arguments = parser.parse_args()
+
+    results = []
+    print(
+        f"{'shape':<12} {'size':>8} {'ops':>8} {'capture':>9} {'mir':>9} "
+        f"{'json':>9} {'rss MB':>8} {'mir MB':>8}"
+    )
+    for shape in arguments.shapes:
+        for size in arguments.sizes:
+            case = run_isolated(shape, size, arguments.source_refs)
+            results.append(case)
+            print(
+                f"{shape:<12} {size:>8} {case['operations']:>8} "
+                f"{case['capture_seconds']:>8.3f}s {case['mir_seconds']:>8.3f}s "
+                f"{case['serialize_seconds']:>8.3f}s "
+                f"{case['peak_rss_bytes'] / 2**20:>8.1f} "
+                f"{case['mir_bytes'] / 2**20:>8.2f}"
+            )
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "source_refs": arguments.source_refs,
+                    "cases": results,
+                },
+                file,
+                indent=2,
+            )
+    if arguments.baseline:
+        with open(arguments.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["cases"]
+        found = regressions(results, baseline, arguments.tolerance)
+        for regression in found:
+            print(f"regression: {regression}", file=sys.stderr)
+        if found:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Import time benchmark.
+
+Imports nada_dsl modules in fresh interpreters with `python -X importtime` and
+reports their median cumulative import time, and the modules that took the
+longest to import in the last run.
+
+Usage:
+
+    python benchmarks/import_time.py [--runs N] [--top N] [MODULE ...]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict
+
+DEFAULT_MODULES = ["nada_dsl", "nada_dsl.compile", "nada_dsl.audit"]
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """Import a module in a new interpreter and return the cumulative import time
+    of every imported module, in microseconds."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10)
+    arguments = parser.parse_args()
+
+    for module in arguments.modules:
+        runs = [import_times(module) for _ in range(arguments.runs)]
+        median = statistics.median(times[module] for times in runs)
+        print(f"{module}: {median / 1000:.1f}ms (median of {arguments.runs})")
+        slowest = sorted(runs[-1].items(), key=lambda item: item[1], reverse=True)
+        for name, cumulative in slowest[1 : arguments.top + 1]:
+            print(f"    {name:<50} {cumulative / 1000:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
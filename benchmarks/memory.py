@@ -0,0 +1,58 @@
+"""
+Memory benchmark of the compiler frontend.
+
+Measures the memory used per captured operation, including the AST operation,
+the operation object, the Nada type wrapper and the source reference.
+
+Usage:
+
+    python benchmarks/memory.py [--operations N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from nada_dsl import Input, Output, Party, SecretInteger
+from nada_dsl.compilation_context import CompilationContext
+
+
+def build_program(size: int):
+    """Build a program with `size` secret operations and keep all the wrappers alive."""
+    party = Party(name="Party1")
+    left = SecretInteger(Input(name="left", party=party))
+    right = SecretInteger(Input(name="right", party=party))
+    values = [left]
+    for i in range(size):
+        if i % 2 == 0:
+            values.append(values[-1] + right)
+        else:
+            values.append(values[-1] * right)
+    return values, [Output(values[-1], "output", party)]
+
+
+def bytes_per_operation(size: int) -> float:
+    """Returns the number of bytes used per captured operation."""
+    gc.collect()
+    tracemalloc.start()
+    with CompilationContext() as context:
+        baseline = tracemalloc.get_traced_memory()[0]
+        program = build_program(size)
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - baseline
+        operations = len(context.operations)
+    tracemalloc.stop()
+    del program
+    return used / operations
+
+
+def main():
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operations", type=int, default=100_000)
+    arguments = parser.parse_args()
+    print(f"{bytes_per_operation(arguments.operations):.1f} bytes per operation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Source reference benchmark.
+
+Compiles a generated program with one operation per line and compares the
+source reference line lookup using the line table of the compilation context
+with the previous lookup, which split and scanned the whole file for every
+operation, and with the lazy and disabled source reference modes.
+
+Usage:
+
+    python benchmarks/source_refs.py [--lines N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Tuple
+from unittest import mock
+
+from nada_dsl.compile import compile_script, isolated_compilation
+from nada_dsl.source_ref import USED_SOURCES, SourceRef
+
+
+def write_program(directory: str, lines: int) -> str:
+    """Write a program with one input per line and return its path."""
+    path = os.path.join(directory, "generated_program.py")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("from nada_dsl import *\n\n\n")
+        file.write("def nada_main():\n")
+        file.write('    party = Party(name="Party1")\n')
+        file.write('    a = SecretInteger(Input(name="a", party=party))\n')
+        file.write("    total = a\n")
+        for i in range(lines):
+            file.write(
+                f'    total = total + SecretInteger(Input(name="i{i}", party=party))\n'
+            )
+        file.write('    return [Output(total, "total", party)]\n')
+    return path
+
+
+def scanning_line_info(backend_frame, lineno) -> Tuple[int, int]:
+    """Line lookup that splits and scans the whole file for every operation."""
+    if "nada_dsl" in backend_frame.f_code.co_filename:
+        return 0, 0
+    filename = os.path.basename(backend_frame.f_code.co_filename)
+    try:
+        if filename not in USED_SOURCES:
+            with open(backend_frame.f_code.co_filename, encoding="utf-8") as file:
+                USED_SOURCES[filename] = file.read()
+        src = USED_SOURCES[filename]
+    except OSError:
+        return 0, 0
+    lines = src.splitlines()
+    if lineno < len(lines):
+        offset = 0
+        for i in range(lineno - 1):
+            offset += len(lines[i]) + 1
+        return offset, len(lines[lineno - 1])
+    return 0, 0
+
+
+def compile_seconds(path: str, source_ref_mode: str = "eager") -> Tuple[float, str]:
+    """Compile a program and return the elapsed time and the MIR."""
+    start = time.perf_counter()
+    with isolated_compilation({"source_ref_mode": source_ref_mode}):
+        mir = compile_script(path).mir
+    return time.perf_counter() - start, mir
+
+
+def main():
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=50_000)
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_program(directory, arguments.lines)
+        indexed, indexed_mir = compile_seconds(path)
+        lazy, lazy_mir = compile_seconds(path, "lazy")
+        off, _ = compile_seconds(path, "off")
+        with mock.patch.object(
+            SourceRef, "try_get_line_info", staticmethod(scanning_line_info)
+        ):
+            scanning, scanning_mir = compile_seconds(path)
+    assert indexed_mir == scanning_mir == lazy_mir
+    print(f"{arguments.lines} lines")
+    print(f"line table:       {indexed:.2f}s")
+    print(f"file scan:        {scanning:.2f}s ({scanning / indexed:.1f}x)")
+    print(f"lazy source refs: {lazy:.2f}s")
+    print(f"no source refs:   {off:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
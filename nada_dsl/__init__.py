@@ -1,8 +1,10 @@
 """
 Package exports.
+
+The names of the auditor (`nada_dsl.audit`) are imported on first access, so
+programs that are only compiled do not pay for importing it.
 """
 
-from nada_dsl.audit import *
 from nada_dsl.source_ref import *
 from nada_dsl.nada_types.scalar_types import *
 from nada_dsl.nada_types.generics import *
@@ -10,3 +12,32 @@ from nada_dsl.nada_types.collections import *
 from nada_dsl.nada_types.function import *
 from nada_dsl.program_io import *
 from nada_dsl.compiler_frontend import nada_compile
+from nada_dsl.compilation_context import CompilationContext
+
+# Names exported from the auditor, imported on first access
+_AUDIT_EXPORTS = frozenset(
+    [
+        "Abstract",
+        "AbstractBoolean",
+        "AbstractInteger",
+        "Constant",
+        "Metaclass",
+        "Public",
+        "Secret",
+        "html",
+        "signature",
+        "strict",
+    ]
+)
+
+
+def __getattr__(name):
+    """Import the names of the auditor on first access."""
+    if name in _AUDIT_EXPORTS:
+        # pylint: disable=import-outside-toplevel
+        import importlib
+
+        value = getattr(importlib.import_module("nada_dsl.audit"), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,24 +1,28 @@
 """AST utilities."""
 
 from abc import ABC
+from array import array
+import base64
 from dataclasses import dataclass
-import hashlib
-from typing import Dict, List
-from sortedcontainers import SortedDict
+import json
+import sys
+from typing import Dict, Hashable, List, Tuple
+from nada_dsl.compilation_context import ContextMapping, current_context
 from nada_dsl.nada_types import NadaTypeRepr, Party
+from nada_dsl.profiler import profiler
 from nada_dsl.source_ref import SourceRef
 
-OPERATION_ID_COUNTER = 0
-
 
 def next_operation_id() -> int:
-    """Returns the next value of the operation id counter."""
-    global OPERATION_ID_COUNTER
-    OPERATION_ID_COUNTER += 1
-    return OPERATION_ID_COUNTER
+    """Returns the next value of the operation id counter of the current
+    compilation context."""
+    operation_id = current_context().next_operation_id()
+    if profiler.enabled:
+        profiler.start(operation_id)
+    return operation_id
 
 
-@dataclass
+@dataclass(slots=True)
 class ASTOperation(ABC):
     """AST Operations.
 
@@ -52,15 +56,47 @@ class ASTOperation(ABC):
         return {}
 
 
-# Map of operations identified by the Python compiler
+# Map of operations identified by the Python compiler, in the current compilation context
 # The key is the operation identifier, the value the operation
-AST_OPERATIONS: Dict[int, ASTOperation] = SortedDict()
+AST_OPERATIONS: Dict[int, ASTOperation] = ContextMapping("operations")
+
+# Map of literal keys to index, in the current compilation context
+LITERALS: Dict[Hashable, int] = ContextMapping("literal_indexes")
+
 
-# Map of literal hashes to index
-LITERALS: Dict[str, int] = {}
+def type_key(ty: NadaTypeRepr) -> Hashable:
+    """Returns a hashable key for a type representation."""
+    if isinstance(ty, str):
+        return ty
+    return json.dumps(ty, sort_keys=True)
 
 
-@dataclass
+def common_subexpression(
+    operation_id: int, name: str, children: Tuple[Hashable, ...], ty: NadaTypeRepr
+) -> int:
+    """Find an operation equal to the given one.
+
+    If common subexpression elimination is enabled in the current compilation
+    context and an operation with the same name, children and type was already
+    stored, returns its identifier. Otherwise, returns `operation_id`.
+
+    The children are the identifiers of the operands, or the interned index of
+    the value of a literal.
+    """
+    context = current_context()
+    if not context.cse:
+        return operation_id
+    key = (name, children, type_key(ty))
+    existing_id = context.cse_table.get(key)
+    if existing_id is None or existing_id not in context.operations:
+        context.cse_table[key] = operation_id
+        return operation_id
+    if existing_id != operation_id:
+        context.deduplicated_operations += 1
+    return existing_id
+
+
+@dataclass(slots=True)
 class BinaryASTOperation(ASTOperation):
     """Superclass of all the Binary operations in AST representation"""
 
@@ -83,7 +119,7 @@ class BinaryASTOperation(ASTOperation):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class UnaryASTOperation(ASTOperation):
     """Superclass of all the unary operations in AST representation"""
 
@@ -104,7 +140,7 @@ class UnaryASTOperation(ASTOperation):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class IfElseASTOperation(ASTOperation):
     """AST Representation of an IfElse operation."""
 
@@ -128,7 +164,7 @@ class IfElseASTOperation(ASTOperation):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class RandomASTOperation(ASTOperation):
     """AST Representation of a Random operation."""
 
@@ -145,7 +181,7 @@ class RandomASTOperation(ASTOperation):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class InputASTOperation(ASTOperation):
     """AST representation of an Input."""
 
@@ -164,7 +200,7 @@ class InputASTOperation(ASTOperation):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class LiteralASTOperation(ASTOperation):
     """AST Representation of a Literal."""
 
@@ -180,24 +216,26 @@ class LiteralASTOperation(ASTOperation):
         value: object,
         source_ref: SourceRef,
     ):
-        self.id = operation_id
+        ASTOperation.__init__(self, id=operation_id, source_ref=source_ref, ty=ty)
         self.name = name
-        self.ty = ty
         self.value = value
-        self.source_ref = source_ref
-        # Generate a unique name depending on the value and type
-        # to prevent duplicating literals in the bytecode.
-        literal_name = hashlib.md5(
-            (str(self.value) + str(self.ty)).encode("UTF-8")
-        ).hexdigest()
-
-        # Replace the literal name by an index so it is shorter
-        if literal_name not in LITERALS:
-            LITERALS[literal_name] = len(LITERALS)
-
-        self.literal_index = str(LITERALS[literal_name])
-
-        super().__init__(id=self.id, source_ref=self.source_ref, ty=self.ty)
+        # Intern the literal by value and type to prevent duplicating literals
+        # in the bytecode. The Python type of the value is part of the key, as
+        # values like `1` and `True` are equal but are written differently.
+        literal_indexes = current_context().literal_indexes
+        key = self.literal_key()
+        index = literal_indexes.get(key)
+        if index is None:
+            index = literal_indexes[key] = len(literal_indexes)
+        self.literal_index = str(index)
+
+    def literal_key(self) -> Hashable:
+        """Returns the key used to intern the literal."""
+        return (type(self.value), self.value, type_key(self.ty))
+
+    def mir_value(self) -> str:
+        """Returns the value of the literal in the MIR."""
+        return str(self.value)
 
     def to_mir(self):
         return {
@@ -210,7 +248,76 @@ class LiteralASTOperation(ASTOperation):
         }
 
 
-@dataclass
+def store_literal(operation: LiteralASTOperation) -> int:
+    """Store a literal operation in the AST.
+
+    Literals with the same value and type are interned into the same literal
+    index. With common subexpression elimination, their references are merged
+    too, so the operations that use equal literals can be merged as well.
+
+    Returns the identifier of the stored literal reference, which is the one of
+    an equal literal stored before, if any.
+    """
+    operation_id = common_subexpression(
+        operation.id, "LiteralReference", (operation.literal_index,), operation.ty
+    )
+    if operation_id == operation.id:
+        AST_OPERATIONS[operation.id] = operation
+    return operation_id
+
+
+class LiteralBlockASTOperation(LiteralASTOperation):
+    """AST Representation of a literal block.
+
+    A literal block is a literal of array type whose value holds all the
+    elements of the array, packed with `pack_literal_block`.
+    """
+
+    __slots__ = ()
+
+    value: array
+
+    def literal_key(self) -> Hashable:
+        values = self.value
+        return (
+            array,
+            values.typecode,  # pylint: disable=E1101
+            values.tobytes(),  # pylint: disable=E1101
+            type_key(self.ty),
+        )
+
+    def mir_value(self) -> str:
+        return pack_literal_block(self.value)
+
+
+def pack_literal_block(values: array) -> str:
+    """Packs 64-bit integers into the base64 encoding of their little-endian
+    representation."""
+    if values.itemsize != 8:
+        raise ValueError(f"Expected 64-bit integers, found {values.itemsize} bytes")
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def unpack_literal_block(data: str, typecode: str = "q") -> array:
+    """Unpacks the value of a literal block packed by `pack_literal_block`.
+
+    Arguments
+    ---------
+    data: str
+        The packed value
+    typecode: str
+        "q" for signed integers, "Q" for unsigned integers
+    """
+    values = array(typecode, base64.b64decode(data))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+@dataclass(slots=True)
 class ReduceASTOperation(ASTOperation):
     """AST Representation of a Reduce operation."""
 
@@ -234,7 +341,7 @@ class ReduceASTOperation(ASTOperation):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class MapASTOperation(ASTOperation):
     """AST representation of a Map operation."""
 
@@ -256,7 +363,7 @@ class MapASTOperation(ASTOperation):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class NewASTOperation(ASTOperation):
     """AST Representation of a New operation."""
 
@@ -277,7 +384,7 @@ class NewASTOperation(ASTOperation):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class NadaFunctionCallASTOperation(ASTOperation):
     """AST representation of a NadaFunctionCall operation."""
 
@@ -300,7 +407,7 @@ class NadaFunctionCallASTOperation(ASTOperation):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class NadaFunctionArgASTOperation(ASTOperation):
     """AST representation of a NadaFunctionArg operation."""
 
@@ -319,7 +426,7 @@ class NadaFunctionArgASTOperation(ASTOperation):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class NadaFunctionASTOperation(ASTOperation):
     """AST representation of a nada function."""
 
@@ -356,7 +463,7 @@ class NadaFunctionASTOperation(ASTOperation):
 
 
 # Partially implemented
-@dataclass
+@dataclass(slots=True)
 class CastASTOperation(ASTOperation):
     """AST Representation of a Cast operation."""
 
@@ -377,7 +484,7 @@ class CastASTOperation(ASTOperation):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class NTupleAccessorASTOperation(ASTOperation):
     """AST representation of a n tuple accessor operation."""
 
@@ -399,7 +506,29 @@ class NTupleAccessorASTOperation(ASTOperation):
         }
 
 
-@dataclass
+@dataclass(slots=True)
+class ArrayAccessorASTOperation(ASTOperation):
+    """AST representation of an array accessor operation."""
+
+    index: int
+    source: int
+
+    def child_operations(self):
+        return [self.source]
+
+    def to_mir(self):
+        return {
+            "ArrayAccessor": {
+                "id": self.id,
+                "index": self.index,
+                "source": self.source,
+                "type": self.ty,
+                "source_ref_index": self.source_ref.to_index(),
+            }
+        }
+
+
+@dataclass(slots=True)
 class ObjectAccessorASTOperation(ASTOperation):
     """AST representation of an object accessor operation."""
 
@@ -0,0 +1,266 @@
+"""
+Compilation context.
+
+The compilation context owns all the state built while a Nada program is
+compiled: the AST operations, the operation id counter, the literals, the
+inputs, parties and functions found in the program, and the source references.
+
+The context is activated using a `with` statement and is tracked with a
+context variable, so programs can be compiled concurrently in different threads
+or asyncio tasks, each one in its own context:
+
+    with CompilationContext():
+        mir = nada_compile(nada_main())
+
+Code running outside of any `with CompilationContext()` block uses a process
+wide default context.
+
+The module level names that historically held this state (for instance
+`nada_dsl.ast_util.AST_OPERATIONS`) are proxies to the corresponding attribute
+of the current context.
+"""
+
+from collections.abc import MutableMapping, MutableSequence
+import contextvars
+from types import CodeType
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from sortedcontainers import SortedDict
+
+from nada_dsl.operation_table import OperationTable
+
+# Source reference capture modes, see `CompilationContext.source_ref_mode`
+SOURCE_REF_MODES = ("eager", "lazy", "off")
+
+
+class CompilationContext:  # pylint: disable=too-many-instance-attributes
+    """Compilation context.
+
+    Attributes
+    ----------
+    operation_id_counter: int
+        The last operation identifier handed out by `next_operation_id()`
+    operations: OperationTable
+        Table of operations identified by the Python compiler, indexed by identifier
+    literal_indexes: Dict[Hashable, int]
+        Map of literal keys, made of the value and the type key, to their index
+    literals: Dict[str, Tuple[str, object]]
+        Map of literal indexes to their value and type, for the literals used in the MIR
+    inputs: Dict[str, Dict[str, Tuple[InputASTOperation, NadaTypeRepr]]]
+        Inputs used in the MIR, indexed by party and name
+    parties: Dict[str, Party]
+        Parties used in the MIR, indexed by name
+    functions: Dict[int, NadaFunctionASTOperation]
+        Nada functions used in the MIR, indexed by identifier
+    used_sources: Dict[str, str]
+        Source code of the files referenced by source references, indexed by file name
+    source_lines: Dict[str, Tuple[List[int], List[int]]]
+        Start offset and length of every line of the used sources, indexed by file name
+    code_lines: Dict[CodeType, Tuple[List[int], List[int]]]
+        Bytecode offset where every line starts and line numbers, indexed by code
+        object, used to resolve lazy source references
+    source_refs: List[Dict]
+        Source references, in MIR format
+    source_ref_indexes: Dict[Tuple, int]
+        Map of source reference keys to their index in `source_refs`
+    cse: bool
+        Whether common subexpression elimination is enabled. When enabled, an
+        operation equal to an existing one (same operation, operands and type)
+        reuses the identifier of the existing operation.
+    cse_table: Dict[Tuple, int]
+        Map of operation keys to operation identifiers, used by common
+        subexpression elimination
+    deduplicated_operations: int
+        Number of operations removed by common subexpression elimination
+    rebalance: bool
+        Whether chains of secret additions and multiplications are rebalanced into
+        trees of logarithmic depth (see `rebalance_associative_chains`)
+    rebalance_report: Optional[RebalanceReport]
+        Result of the last rebalancing pass, if enabled
+    source_ref_mode: str
+        How source references are captured: "eager" resolves the line of every
+        operation when it is created, "lazy" only records the code location and
+        resolves it when the operation is added to the MIR, and "off" does not
+        capture them, all operations share an empty source reference
+    eliminate_dead_operations: bool
+        Whether the operations that do not reach an output are removed before the
+        MIR is generated (see `eliminate_dead_operations`). The MIR is the same
+        either way, only the memory held by the context changes.
+    dead_operation_report: Optional[DeadOperationReport]
+        Result of the last dead operation elimination pass, if enabled
+    """
+
+    operation_id_counter: int
+    operations: OperationTable
+    literal_indexes: Dict[Hashable, int]
+    literals: Dict[str, Tuple[str, object]]
+    inputs: Dict[str, Dict[str, Tuple[Any, Any]]]
+    parties: Dict[str, Any]
+    functions: Dict[int, Any]
+    used_sources: Dict[str, str]
+    source_lines: Dict[str, Tuple[List[int], List[int]]]
+    code_lines: Dict[CodeType, Tuple[List[int], List[int]]]
+    source_refs: List[Dict]
+    source_ref_indexes: Dict[Tuple, int]
+    cse: bool
+    cse_table: Dict[Tuple, int]
+    deduplicated_operations: int
+    rebalance: bool
+    rebalance_report: Optional[Any]
+    source_ref_mode: str
+    eliminate_dead_operations: bool
+    dead_operation_report: Optional[Any]
+
+    def __init__(
+        self,
+        cse: bool = False,
+        rebalance: bool = False,
+        source_ref_mode: str = "eager",
+        eliminate_dead_operations: bool = False,
+    ):
+        if source_ref_mode not in SOURCE_REF_MODES:
+            raise ValueError(f"invalid source reference mode: {source_ref_mode}")
+        self._tokens: List[contextvars.Token] = []
+        self.cse = cse
+        self.rebalance = rebalance
+        self.source_ref_mode = source_ref_mode
+        self.eliminate_dead_operations = eliminate_dead_operations
+        self.reset()
+
+    def options(self) -> Dict[str, Any]:
+        """Returns the options of this context that change the produced MIR."""
+        return {
+            "cse": self.cse,
+            "rebalance": self.rebalance,
+            "source_ref_mode": self.source_ref_mode,
+        }
+
+    def reset(self):
+        """Drop all the state of this context and restart the operation id counter."""
+        self.operation_id_counter = 0
+        self.operations = OperationTable()
+        self.literal_indexes = {}
+        self.literals = {}
+        self.inputs = SortedDict()
+        self.parties = SortedDict()
+        self.functions = {}
+        self.used_sources = {}
+        self.source_lines = {}
+        self.code_lines = {}
+        self.source_refs = []
+        self.source_ref_indexes = {}
+        self.cse_table = {}
+        self.deduplicated_operations = 0
+        self.rebalance_report = None
+        self.dead_operation_report = None
+
+    def next_operation_id(self) -> int:
+        """Returns the next value of the operation id counter."""
+        self.operation_id_counter += 1
+        return self.operation_id_counter
+
+    def __enter__(self) -> "CompilationContext":
+        self._tokens.append(_CURRENT_CONTEXT.set(self))
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        _CURRENT_CONTEXT.reset(self._tokens.pop())
+
+
+_CURRENT_CONTEXT: contextvars.ContextVar[CompilationContext] = contextvars.ContextVar(
+    "nada_compilation_context", default=CompilationContext()
+)
+
+
+def current_context() -> CompilationContext:
+    """Returns the active compilation context."""
+    return _CURRENT_CONTEXT.get()
+
+
+class ContextMapping(MutableMapping):
+    """Mapping that forwards to an attribute of the current compilation context."""
+
+    __slots__ = ("attribute",)
+
+    def __init__(self, attribute: str):
+        self.attribute = attribute
+
+    def target(self) -> Dict:
+        """Returns the mapping of the current compilation context."""
+        return getattr(_CURRENT_CONTEXT.get(), self.attribute)
+
+    def __getitem__(self, key):
+        return getattr(_CURRENT_CONTEXT.get(), self.attribute)[key]
+
+    def __setitem__(self, key, value):
+        getattr(_CURRENT_CONTEXT.get(), self.attribute)[key] = value
+
+    def __delitem__(self, key):
+        del getattr(_CURRENT_CONTEXT.get(), self.attribute)[key]
+
+    def __contains__(self, key):
+        return key in getattr(_CURRENT_CONTEXT.get(), self.attribute)
+
+    def __iter__(self):
+        return iter(self.target())
+
+    def __len__(self):
+        return len(self.target())
+
+    def __repr__(self):
+        return repr(self.target())
+
+    def get(self, key, default=None):
+        return self.target().get(key, default)
+
+    def keys(self):
+        return self.target().keys()
+
+    def values(self):
+        return self.target().values()
+
+    def items(self):
+        return self.target().items()
+
+    def clear(self):
+        self.target().clear()
+
+
+class ContextList(MutableSequence):
+    """List that forwards to an attribute of the current compilation context."""
+
+    __slots__ = ("attribute",)
+
+    def __init__(self, attribute: str):
+        self.attribute = attribute
+
+    def target(self) -> List:
+        """Returns the list of the current compilation context."""
+        return getattr(_CURRENT_CONTEXT.get(), self.attribute)
+
+    def __getitem__(self, index):
+        return self.target()[index]
+
+    def __setitem__(self, index, value):
+        self.target()[index] = value
+
+    def __delitem__(self, index):
+        del self.target()[index]
+
+    def __iter__(self):
+        return iter(self.target())
+
+    def __len__(self):
+        return len(self.target())
+
+    def __repr__(self):
+        return repr(self.target())
+
+    def insert(self, index, value):
+        self.target().insert(index, value)
+
+    def append(self, value):
+        self.target().append(value)
+
+    def clear(self):
+        self.target().clear()
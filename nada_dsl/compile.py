@@ -2,6 +2,8 @@
 Compilation functions.
 """
 
+import argparse
+from contextlib import contextmanager
 import sys
 import os.path
 import base64
@@ -9,8 +11,19 @@ import json
 from dataclasses import dataclass
 import traceback
 import importlib.util
-from nada_dsl.compiler_frontend import nada_compile
+from typing import Any, Dict, List, Optional
+from nada_dsl.compile_cache import MirCache, cache_key
+from nada_dsl.compilation_context import (
+    SOURCE_REF_MODES,
+    CompilationContext,
+    current_context,
+)
+from nada_dsl.compiler_frontend import nada_compile, write_nada_mir
+from nada_dsl.cost import estimate_cost
+from nada_dsl.debug_symbols import strip_mir
 from nada_dsl.errors import MissingEntryPointError, MissingProgramArgumentError
+from nada_dsl.profiler import profiler
+from nada_dsl.program_io import Output
 from nada_dsl.timer import add_timer, timer
 
 
@@ -21,16 +34,82 @@ class CompilerOutput:
     mir: str
 
 
+# Name of the module holding programs compiled from a string
+TEMP_PROGRAM_NAME = "temp_program"
+COST_FILE = "nada-cost.json"
+DEBUG_SYMBOLS_FILE = "nada-debug-symbols.json"
+TIMERS_FILE = "nada-timers.json"
+TRACE_FILE = "nada-timers.trace.json"
+FOLDED_STACKS_FILE = "nada-timers.folded"
+PROFILE_FILE = "nada-operations.json"
+
+
+@contextmanager
+def isolated_compilation(options: Optional[Dict[str, Any]] = None):
+    """Context manager to compile a program in isolation from previous compilations.
+
+    The program is compiled in a new compilation context, created with the given
+    options (see `CompilationContext`), which is dropped when leaving. Program
+    modules imported inside the context and any directory added to `sys.path` are
+    removed when leaving, so a program is always loaded from its current source in
+    long lived processes.
+    """
+    sys_path = list(sys.path)
+    modules = set(sys.modules)
+    try:
+        with CompilationContext(**(options or {})) as context:
+            yield context
+    finally:
+        added_dirs = [
+            os.path.realpath(path) + os.sep for path in sys.path if path not in sys_path
+        ]
+        sys.path[:] = sys_path
+        for name in set(sys.modules) - modules:
+            module_file = getattr(sys.modules[name], "__file__", None)
+            if name == TEMP_PROGRAM_NAME or (
+                module_file is not None
+                and os.path.realpath(module_file).startswith(tuple(added_dirs))
+            ):
+                del sys.modules[name]
+        globals().pop(TEMP_PROGRAM_NAME, None)
+
+
 @add_timer(timer_name="nada_dsl.compile.compile")
-def compile_script(script_path: str) -> CompilerOutput:
+def compile_script(
+    script_path: str, cache: Optional[MirCache] = None
+) -> CompilerOutput:
     """Compiles a NADA program
 
     Args:
         script_path (str): The nada program path
+        cache (MirCache, optional): The compilation cache. If the program is found
+            in the cache, the stored MIR is returned without executing `nada_main`.
 
     Returns:
         CompilerOutput: The Compiler Output
     """
+    key = None
+    if cache is not None:
+        key = cache_key(script_path, current_context().options())
+        mir = cache.get(key)
+        if mir is not None:
+            return CompilerOutput(mir)
+
+    compile_output = nada_compile(load_script(script_path))
+    if cache is not None:
+        cache.put(key, compile_output)
+    return CompilerOutput(compile_output)
+
+
+def load_script(script_path: str) -> List[Output]:
+    """Import a NADA program and run its `nada_main` entry point.
+
+    Args:
+        script_path (str): The nada program path
+
+    Returns:
+        List[Output]: The outputs of the program
+    """
     script_dir = os.path.dirname(script_path)
     sys.path.insert(0, script_dir)
     script_name = os.path.basename(script_path)
@@ -46,9 +125,7 @@ def compile_script(script_path: str) -> CompilerOutput:
         raise MissingEntryPointError(
             "'nada_dsl' entrypoint function is missing in program " + script_name
         ) from exc
-    outputs = main()
-    compile_output = nada_compile(outputs)
-    return CompilerOutput(compile_output)
+    return main()
 
 
 @add_timer(timer_name="nada_dsl.compile.compile_string")
@@ -61,17 +138,71 @@ def compile_string(script: str) -> CompilerOutput:
     Returns:
         CompilerOutput: The Compiler Output
     """
+    compile_output = nada_compile(load_string(script))
+    return CompilerOutput(compile_output)
+
+
+def load_string(script: str) -> List[Output]:
+    """Load a NADA program from a string and run its `nada_main` entry point.
+
+    Args:
+        script (str): The nada program as a base64 encoded string (UTF-8)
+
+    Returns:
+        List[Output]: The outputs of the program
+    """
     decoded_program = base64.b64decode(script).decode("utf-8")
-    temp_name = "temp_program"
+    temp_name = TEMP_PROGRAM_NAME
     spec = importlib.util.spec_from_loader(temp_name, loader=None)
     module = importlib.util.module_from_spec(spec)
     exec(decoded_program, module.__dict__)  # pylint:disable=W0122
     sys.modules[temp_name] = module
     globals()[temp_name] = module
 
-    outputs = module.nada_main()
-    compile_output = nada_compile(outputs)
-    return CompilerOutput(compile_output)
+    return module.nada_main()
+
+
+@add_timer(timer_name="nada_dsl.compile.write_mir")
+def write_mir(outputs: List[Output], path: str):
+    """Stream the MIR of a program into a file, without the JSON envelope of
+    `print_output`.
+
+    The MIR is written as it is generated, so it is never fully held in memory.
+    The compilation cache is not used.
+
+    Args:
+        outputs (List[Output]): The outputs of the program
+        path (str): The path of the MIR file, or "-" to write to the standard output
+    """
+    if path == "-":
+        write_nada_mir(outputs, sys.stdout)
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+        return
+    with open(path, "w", encoding="utf-8") as file:
+        write_nada_mir(outputs, file)
+
+
+@add_timer(timer_name="nada_dsl.compile.write_proto_mir")
+def write_proto_mir(outputs: List[Output], path: str):
+    """Write the binary protobuf MIR of a program into a file.
+
+    Needs the optional `nada-mir-proto` dependency.
+
+    Args:
+        outputs (List[Output]): The outputs of the program
+        path (str): The path of the MIR file, or "-" to write to the standard output
+    """
+    # pylint: disable=import-outside-toplevel
+    from nada_dsl.mir_proto import nada_compile_proto
+
+    mir = nada_compile_proto(outputs)
+    if path == "-":
+        sys.stdout.buffer.write(mir)
+        sys.stdout.buffer.flush()
+        return
+    with open(path, "wb") as file:
+        file.write(mir)
 
 
 def print_output(out: CompilerOutput):
@@ -87,19 +218,206 @@ def print_output(out: CompilerOutput):
     print(json.dumps(output_json))
 
 
+def write_cost(mir: Dict[str, Any], path: str):
+    """Write the estimated MPC cost of a program into a JSON file.
+
+    Args:
+        mir (Dict[str, Any]): The MIR of the program
+        path (str): The path of the cost file
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(estimate_cost(mir).to_dict(), file, indent=2)
+
+
+def strip_debug_symbols(mir: Dict[str, Any], strip: str, path: str) -> Dict[str, Any]:
+    """Strip the debugging information of a MIR into a debug symbols file.
+
+    Args:
+        mir (Dict[str, Any]): The MIR of the program
+        strip (str): "sources" to remove the embedded source files, "all" to also
+            remove the source references
+        path (str): The path of the debug symbols file
+
+    Returns:
+        Dict[str, Any]: The stripped MIR
+    """
+    stripped, symbols = strip_mir(mir, drop_source_refs=strip == "all")
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(symbols, file)
+    return stripped
+
+
+def parse_args(args=None) -> argparse.Namespace:
+    """Parse the command line namespace of the compiler."""
+    parser = argparse.ArgumentParser(
+        prog="python -m nada_dsl.compile", description="Compile a Nada program."
+    )
+    parser.add_argument("program", nargs="?", help="Nada program path")
+    parser.add_argument(
+        "-s",
+        dest="program_string",
+        metavar="PROGRAM",
+        help="Nada program as a base64 encoded string",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="PATH",
+        help="Stream the raw MIR, without the JSON envelope, into a file or "
+        "into the standard output with '-'",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "protobuf"],
+        default="json",
+        help="Format of the MIR written with --output (default: json)",
+    )
+    parser.add_argument(
+        "--cse",
+        action="store_true",
+        help="Enable common subexpression elimination",
+    )
+    parser.add_argument(
+        "--rebalance",
+        action="store_true",
+        help="Rebalance chains of secret additions and multiplications",
+    )
+    parser.add_argument(
+        "--dce",
+        action="store_true",
+        help="Free the operations that do not reach an output before generating "
+        "the MIR",
+    )
+    parser.add_argument(
+        "--source-refs",
+        choices=SOURCE_REF_MODES,
+        default="eager",
+        help="How source references are captured (default: eager)",
+    )
+    parser.add_argument(
+        "--cost",
+        nargs="?",
+        const=COST_FILE,
+        metavar="PATH",
+        help=f"Write the estimated MPC cost of the program (default: {COST_FILE})",
+    )
+    parser.add_argument(
+        "--strip",
+        choices=["sources", "all"],
+        help="Release build: move the embedded source files ('sources') and the "
+        "source references ('all') of the MIR into a debug symbols file",
+    )
+    parser.add_argument(
+        "--debug-symbols",
+        default=DEBUG_SYMBOLS_FILE,
+        metavar="PATH",
+        help=f"Path of the debug symbols file (default: {DEBUG_SYMBOLS_FILE})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the compilation cache",
+    )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Print the compilation cache statistics and exit",
+    )
+    namespace = parser.parse_args(args)
+    if namespace.cost and namespace.output == "-":
+        parser.error("--cost needs the MIR to be written into a file")
+    if namespace.format == "protobuf":
+        if namespace.output is None:
+            parser.error("--format protobuf needs --output")
+        if namespace.cost:
+            parser.error("--cost needs the JSON MIR")
+        if namespace.strip:
+            parser.error("--strip needs the JSON MIR")
+    if namespace.strip and namespace.output == "-":
+        parser.error("--strip needs the MIR to be written into a file")
+    return namespace
+
+
 if __name__ == "__main__":
     try:
         if os.environ.get("NADA_TIMER"):
-            timer.enable()
-        args_length = len(sys.argv)
-        if args_length < 2:
-            raise MissingProgramArgumentError("expected program as argument")
-        if args_length == 2:
-            output = compile_script(sys.argv[1])
-            print_output(output)
-        if args_length == 3 and sys.argv[1] == "-s":
-            output = compile_string(sys.argv[2])
-            print_output(output)
+            timer.enable(track_memory=bool(os.environ.get("NADA_TIMER_MEMORY")))
+        if os.environ.get("NADA_PROFILE"):
+            profiler.enable()
+        arguments = parse_args()
+        with CompilationContext(
+            cse=arguments.cse,
+            rebalance=arguments.rebalance,
+            source_ref_mode=arguments.source_refs,
+            eliminate_dead_operations=arguments.dce,
+        ) as compilation_context:
+            if arguments.cache_stats:
+                print(json.dumps(MirCache().stats().to_dict()))
+            elif arguments.output is not None:
+                if arguments.program_string is not None:
+                    program_outputs = load_string(arguments.program_string)
+                elif arguments.program is not None:
+                    program_outputs = load_script(arguments.program)
+                else:
+                    raise MissingProgramArgumentError("expected program as argument")
+                if arguments.format == "protobuf":
+                    write_proto_mir(program_outputs, arguments.output)
+                else:
+                    write_mir(program_outputs, arguments.output)
+                if arguments.strip or arguments.cost:
+                    with open(arguments.output, encoding="utf-8") as mir_file:
+                        program_mir = json.load(mir_file)
+                if arguments.strip:
+                    program_mir = strip_debug_symbols(
+                        program_mir, arguments.strip, arguments.debug_symbols
+                    )
+                    with open(arguments.output, "w", encoding="utf-8") as mir_file:
+                        json.dump(program_mir, mir_file)
+                if arguments.cost:
+                    write_cost(program_mir, arguments.cost)
+            else:
+                if arguments.program_string is not None:
+                    output = compile_string(arguments.program_string)
+                elif arguments.program is not None:
+                    output = compile_script(
+                        arguments.program,
+                        cache=None if arguments.no_cache else MirCache(),
+                    )
+                else:
+                    raise MissingProgramArgumentError("expected program as argument")
+                if arguments.strip:
+                    output = CompilerOutput(
+                        json.dumps(
+                            strip_debug_symbols(
+                                json.loads(output.mir),
+                                arguments.strip,
+                                arguments.debug_symbols,
+                            )
+                        )
+                    )
+                print_output(output)
+                if arguments.cost:
+                    write_cost(json.loads(output.mir), arguments.cost)
+        if arguments.cse:
+            print(
+                "common subexpression elimination: removed "
+                f"{compilation_context.deduplicated_operations} operations",
+                file=sys.stderr,
+            )
+        if compilation_context.rebalance_report is not None:
+            report = compilation_context.rebalance_report
+            print(
+                f"rebalancing: {report.chains} chains, critical path depth "
+                f"{report.depth_before} -> {report.depth_after}",
+                file=sys.stderr,
+            )
+        if compilation_context.dead_operation_report is not None:
+            report = compilation_context.dead_operation_report
+            print(
+                f"dead operation elimination: removed {report.removed} of "
+                f"{report.operations} operations",
+                file=sys.stderr,
+            )
 
     except Exception as ex:
         output = {
@@ -111,5 +429,12 @@ if __name__ == "__main__":
 
     finally:
         if timer.is_enabled():
-            with open("nada-timers.json", "w", encoding="utf-8") as fd:
+            with open(TIMERS_FILE, "w", encoding="utf-8") as fd:
                 json.dump(timer.report(), fd)
+            with open(TRACE_FILE, "w", encoding="utf-8") as fd:
+                json.dump(timer.chrome_trace(), fd)
+            with open(FOLDED_STACKS_FILE, "w", encoding="utf-8") as fd:
+                fd.write(timer.folded_stacks())
+        if profiler.enabled:
+            with open(PROFILE_FILE, "w", encoding="utf-8") as fd:
+                json.dump(profiler.report(), fd, indent=2)
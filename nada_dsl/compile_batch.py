@@ -0,0 +1,229 @@
+"""
+Batch compilation.
+
+Compiles many Nada programs across a pool of worker processes. Every program is
+compiled in its own `CompilationContext`, created with the options given on the
+command line, and the work is spread over processes rather than threads so the
+programs are compiled in parallel, outside of the GIL.
+
+Usage:
+
+    python -m nada_dsl.compile_batch programs/ "more/**/*.py" -j 8 -o target/
+
+It writes one MIR file per program and a `summary.json` file with the timing and
+the failures of every program.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from nada_dsl.compile import compile_script, isolated_compilation
+from nada_dsl.compilation_context import SOURCE_REF_MODES
+from nada_dsl.compile_cache import MirCache
+from nada_dsl.compiler_frontend import get_target_dir
+
+MIR_SUFFIX = ".mir.json"
+SUMMARY_FILE = "summary.json"
+
+
+def _is_program(path: str) -> bool:
+    """Returns true if a file defines the `nada_main` entry point."""
+    with open(path, encoding="utf-8") as file:
+        return "def nada_main(" in file.read()
+
+
+def find_programs(paths: List[str]) -> List[str]:
+    """Find the programs to compile.
+
+    Args:
+        paths (List[str]): Program files, directories or glob patterns. Directories
+            are searched recursively for files defining `nada_main`, so local helper
+            modules are not compiled as programs.
+
+    Returns:
+        List[str]: The sorted list of program paths.
+    """
+    programs = set()
+    for path in paths:
+        if os.path.isdir(path):
+            pattern = os.path.join(path, "**", "*.py")
+            programs.update(
+                program
+                for program in glob.glob(pattern, recursive=True)
+                if _is_program(program)
+            )
+        elif os.path.isfile(path):
+            programs.add(path)
+        else:
+            programs.update(glob.glob(path, recursive=True))
+    return sorted(os.path.abspath(program) for program in programs)
+
+
+def output_paths(programs: List[str], output_dir: str) -> List[str]:
+    """Returns the MIR output path of every program.
+
+    The directory structure of the programs, relative to their common directory,
+    is reproduced inside the output directory.
+    """
+    if not programs:
+        return []
+    common_dir = os.path.commonpath([os.path.dirname(path) for path in programs])
+    return [
+        os.path.join(output_dir, os.path.relpath(path, common_dir)[:-3] + MIR_SUFFIX)
+        for path in programs
+    ]
+
+
+def _compile_program(
+    program: str,
+    output_path: str,
+    use_cache: bool,
+    options: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Compile a single program inside a worker process."""
+    result: Dict[str, Any] = {"program": program, "output": output_path}
+    start = time.perf_counter()
+    try:
+        with isolated_compilation(options):
+            output = compile_script(program, cache=MirCache() if use_cache else None)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as file:
+            file.write(output.mir)
+        result["result"] = "Success"
+    except Exception as ex:  # pylint:disable=broad-exception-caught
+        result["result"] = "Failure"
+        result["reason"] = str(ex)
+        result["traceback"] = str(traceback.format_exc())
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def compile_batch(
+    programs: List[str],
+    output_dir: str,
+    jobs: Optional[int] = None,
+    use_cache: bool = True,
+    options: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Compile a list of programs using a pool of worker processes.
+
+    Args:
+        programs (List[str]): The program paths
+        output_dir (str): The directory where the MIR files are written
+        jobs (int, optional): The number of worker processes, defaults to the
+            number of CPUs.
+        use_cache (bool): Whether to use the compilation cache
+        options (Dict[str, Any], optional): The compilation options
+            (see `CompilationContext`)
+
+    Returns:
+        Dict[str, Any]: The compilation summary
+    """
+    start = time.perf_counter()
+    outputs = output_paths(programs, output_dir)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = list(
+            executor.map(
+                _compile_program,
+                programs,
+                outputs,
+                [use_cache] * len(programs),
+                [options] * len(programs),
+            )
+        )
+    failed = sum(1 for result in results if result["result"] != "Success")
+    return {
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "seconds": time.perf_counter() - start,
+        "programs": results,
+    }
+
+
+def main(args=None) -> int:
+    """Batch compilation entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m nada_dsl.compile_batch",
+        description="Compile Nada programs in parallel.",
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="Program files, directories or glob patterns"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, help="Number of worker processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        help="Directory where the MIR files are written (default: target)",
+    )
+    parser.add_argument(
+        "--summary",
+        metavar="PATH",
+        help=f"Path of the summary file (default: OUTPUT_DIR/{SUMMARY_FILE})",
+    )
+    parser.add_argument(
+        "--cse",
+        action="store_true",
+        help="Enable common subexpression elimination",
+    )
+    parser.add_argument(
+        "--rebalance",
+        action="store_true",
+        help="Rebalance chains of secret additions and multiplications",
+    )
+    parser.add_argument(
+        "--dce",
+        action="store_true",
+        help="Free the operations that do not reach an output before generating "
+        "the MIR",
+    )
+    parser.add_argument(
+        "--source-refs",
+        choices=SOURCE_REF_MODES,
+        default="eager",
+        help="How source references are captured (default: eager)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Bypass the compilation cache"
+    )
+    arguments = parser.parse_args(args)
+
+    output_dir = arguments.output_dir or get_target_dir()
+    summary = compile_batch(
+        find_programs(arguments.paths),
+        output_dir,
+        jobs=arguments.jobs,
+        use_cache=not arguments.no_cache,
+        options={
+            "cse": arguments.cse,
+            "rebalance": arguments.rebalance,
+            "source_ref_mode": arguments.source_refs,
+            "eliminate_dead_operations": arguments.dce,
+        },
+    )
+    summary_path = arguments.summary or os.path.join(output_dir, SUMMARY_FILE)
+    os.makedirs(os.path.dirname(os.path.abspath(summary_path)), exist_ok=True)
+    with open(summary_path, "w", encoding="utf-8") as file:
+        json.dump(summary, file, indent=2)
+
+    for result in summary["programs"]:
+        if result["result"] != "Success":
+            print(f"{result['program']}: {result['reason']}", file=sys.stderr)
+    print(
+        f"Compiled {summary['succeeded']} programs, {summary['failed']} failed "
+        f"in {summary['seconds']:.2f}s",
+        file=sys.stderr,
+    )
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,344 @@
+"""
+Compilation cache.
+
+Persistent, content-addressed cache of compiled MIR. The cache key is a hash of
+the program source, the sources of all the local modules it (transitively)
+imports and the nada_dsl version, so unchanged programs can be served from the
+cache without executing `nada_main`. When nada_dsl runs from a source checkout,
+like an editable install, its version does not change with its sources, so the
+key also covers the nada_dsl sources.
+
+The cache is an optimization only: when it cannot be read or written, for
+instance because its directory is read-only, programs are compiled without it.
+"""
+
+import ast
+import functools
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+# Directory of the nada_dsl package
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Default maximum size of the cache in bytes
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+MIR_SUFFIX = ".mir.json"
+STATS_FILE = "stats.json"
+
+
+def get_cache_dir() -> str:
+    """Get the directory where compiled programs are cached."""
+    env_dir = os.environ.get("NADA_CACHE_DIR")
+    if env_dir:
+        return env_dir
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "nada_dsl")
+
+
+def get_max_size() -> int:
+    """Get the maximum size of the cache in bytes."""
+    env_size = os.environ.get("NADA_CACHE_MAX_SIZE")
+    if env_size:
+        return int(env_size)
+    return DEFAULT_MAX_SIZE
+
+
+def nada_dsl_version() -> str:
+    """Returns the installed version of nada_dsl."""
+    # Imported here as it is slow to import and only needed for cache keys
+    # pylint: disable=import-outside-toplevel
+    from importlib import metadata
+
+    try:
+        return metadata.version("nada_dsl")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def is_source_checkout(package_dir: str = PACKAGE_DIR) -> bool:
+    """Whether a nada_dsl package directory is a source checkout, next to its
+    `pyproject.toml`, rather than an installed distribution."""
+    return os.path.isfile(os.path.join(os.path.dirname(package_dir), "pyproject.toml"))
+
+
+@functools.lru_cache(maxsize=None)
+def nada_dsl_sources_digest(package_dir: str = PACKAGE_DIR) -> str:
+    """Returns the digest of the Python sources of a nada_dsl package directory.
+
+    The digest is computed once per process, as the loaded compiler does not
+    change while it runs.
+
+    Args:
+        package_dir (str): The nada_dsl package directory
+
+    Returns:
+        str: The hex digest of the sources.
+    """
+    digest = hashlib.sha256()
+    for dir_path, dir_names, file_names in os.walk(package_dir):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            if not file_name.endswith(".py"):
+                continue
+            path = os.path.join(dir_path, file_name)
+            digest.update(os.path.relpath(path, package_dir).encode("utf-8") + b"\0")
+            with open(path, "rb") as file:
+                digest.update(hashlib.sha256(file.read()).digest())
+    return digest.hexdigest()
+
+
+def _module_candidates(base_dir: str, module: str) -> List[str]:
+    """Returns the files that may implement a (dotted) module inside a directory."""
+    parts = module.split(".")
+    candidates = []
+    for i in range(1, len(parts) + 1):
+        path = os.path.join(base_dir, *parts[:i])
+        candidates.append(os.path.join(path, "__init__.py"))
+        candidates.append(path + ".py")
+    return candidates
+
+
+def local_module_paths(script_path: str) -> List[str]:
+    """Find the program and all the local modules it imports, transitively.
+
+    A module is local if it can be found in the program directory, which is
+    where `compile_script` resolves imports from. Third party and standard
+    library modules are not included.
+
+    Args:
+        script_path (str): The nada program path
+
+    Returns:
+        List[str]: The sorted list of source files, including the program itself.
+    """
+    script_path = os.path.realpath(script_path)
+    root_dir = os.path.dirname(script_path)
+    found = {script_path}
+    stack = [script_path]
+    while stack:
+        path = stack.pop()
+        with open(path, "rb") as file:
+            tree = ast.parse(file.read(), filename=path)
+        for node in ast.walk(tree):
+            candidates = []
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    candidates.extend(_module_candidates(root_dir, alias.name))
+            elif isinstance(node, ast.ImportFrom):
+                base_dir = root_dir
+                if node.level > 0:
+                    base_dir = os.path.dirname(path)
+                    for _ in range(node.level - 1):
+                        base_dir = os.path.dirname(base_dir)
+                module = node.module or ""
+                for alias in node.names:
+                    name = f"{module}.{alias.name}" if module else alias.name
+                    candidates.extend(_module_candidates(base_dir, name))
+            for candidate in candidates:
+                candidate = os.path.realpath(candidate)
+                if candidate not in found and os.path.isfile(candidate):
+                    found.add(candidate)
+                    stack.append(candidate)
+    return sorted(found)
+
+
+def cache_key(script_path: str, options: Optional[Dict[str, Any]] = None) -> str:
+    """Compute the cache key of a program.
+
+    Args:
+        script_path (str): The nada program path
+        options (Dict[str, Any], optional): Compilation options that change the
+            produced MIR.
+
+    Returns:
+        str: The hex digest identifying this program.
+    """
+    root_dir = os.path.dirname(os.path.realpath(script_path))
+    digest = hashlib.sha256()
+    digest.update(nada_dsl_version().encode("utf-8") + b"\0")
+    if is_source_checkout():
+        digest.update(nada_dsl_sources_digest().encode("utf-8") + b"\0")
+    digest.update(json.dumps(options or {}, sort_keys=True).encode("utf-8") + b"\0")
+    for path in local_module_paths(script_path):
+        digest.update(os.path.relpath(path, root_dir).encode("utf-8") + b"\0")
+        with open(path, "rb") as file:
+            digest.update(hashlib.sha256(file.read()).digest())
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Compilation cache statistics."""
+
+    directory: str
+    entries: int
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the statistics into a dictionary."""
+        return {
+            "directory": self.directory,
+            "entries": self.entries,
+            "size": self.size,
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class MirCache:
+    """On-disk MIR cache with size-bounded LRU eviction.
+
+    Every entry is stored in its own file. Recency is tracked with the
+    modification time of the entry, which is refreshed on every hit.
+
+    Attributes
+    ----------
+    directory: str
+        The directory where the entries are stored
+    max_size: int
+        The maximum total size of the entries in bytes
+    """
+
+    directory: str
+    max_size: int
+
+    def __init__(self, directory: Optional[str] = None, max_size: Optional[int] = None):
+        self.directory = directory if directory else get_cache_dir()
+        self.max_size = max_size if max_size is not None else get_max_size()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + MIR_SUFFIX)
+
+    def _entries(self) -> List[os.DirEntry]:
+        try:
+            with os.scandir(self.directory) as entries:
+                return [entry for entry in entries if entry.name.endswith(MIR_SUFFIX)]
+        except OSError:
+            return []
+
+    def _stat_entries(self) -> List[Tuple[os.DirEntry, os.stat_result]]:
+        """Returns the entries with their status, skipping the entries removed
+        meanwhile by another process sharing the cache."""
+        entries = []
+        for entry in self._entries():
+            try:
+                entries.append((entry, entry.stat()))
+            except FileNotFoundError:
+                pass
+        return entries
+
+    def _write(self, path: str, content: str):
+        """Atomically write a file in the cache directory."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                file.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _read_counters(self) -> Dict[str, int]:
+        try:
+            with open(
+                os.path.join(self.directory, STATS_FILE), encoding="utf-8"
+            ) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _bump_counter(self, counter: str, amount: int = 1):
+        """Increment a statistics counter, on a best effort basis."""
+        counters = self._read_counters()
+        counters[counter] = counters.get(counter, 0) + amount
+        try:
+            self._write(os.path.join(self.directory, STATS_FILE), json.dumps(counters))
+        except OSError:
+            pass
+
+    def get(self, key: str) -> Optional[str]:
+        """Get the MIR stored for a key, or None if it is not in the cache or the
+        cache cannot be read."""
+        path = self._entry_path(key)
+        try:
+            with open(path, encoding="utf-8") as file:
+                mir = file.read()
+        except OSError:
+            self._bump_counter("misses")
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process after being read
+            pass
+        self._bump_counter("hits")
+        return mir
+
+    def put(self, key: str, mir: str):
+        """Store the MIR of a program and evict the least recently used entries
+        that do not fit in the cache anymore.
+
+        The MIR is not stored if the cache cannot be written."""
+        try:
+            self._write(self._entry_path(key), mir)
+            self.evict()
+        except OSError:
+            pass
+
+    def evict(self) -> int:
+        """Evict least recently used entries until the cache fits in `max_size`.
+
+        Returns:
+            int: The number of evicted entries.
+        """
+        entries = sorted(self._stat_entries(), key=lambda item: item[1].st_mtime)
+        size = sum(stat.st_size for _, stat in entries)
+        evicted = 0
+        for entry, stat in entries:
+            if size <= self.max_size:
+                break
+            size -= stat.st_size
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+            evicted += 1
+        if evicted:
+            self._bump_counter("evictions", evicted)
+        return evicted
+
+    def clear(self):
+        """Remove all the entries from the cache."""
+        for entry in self._entries():
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> CacheStats:
+        """Returns the statistics of the cache."""
+        entries = self._stat_entries()
+        counters = self._read_counters()
+        return CacheStats(
+            directory=self.directory,
+            entries=len(entries),
+            size=sum(stat.st_size for _, stat in entries),
+            max_size=self.max_size,
+            hits=counters.get("hits", 0),
+            misses=counters.get("misses", 0),
+            evictions=counters.get("evictions", 0),
+        )
@@ -0,0 +1,155 @@
+"""
+Compile server.
+
+Long lived compiler process that serves compilation requests, so the interpreter
+startup and the import of nada_dsl are only paid once.
+
+Requests and responses are JSON objects, one per line. A request has the form
+
+    {"id": 1, "method": "compile_script", "path": "/path/to/program.py"}
+    {"id": 2, "method": "compile_string", "program": "<base64 encoded program>"}
+
+and the response has the same format as the output of `nada_dsl.compile`, plus
+the identifier of the request:
+
+    {"id": 1, "result": "Success", "mir": "..."}
+    {"id": 2, "result": "Failure", "reason": "...", "traceback": "..."}
+
+Requests can also include compilation `options`, for instance
+`"options": {"cse": true}` (see `CompilationContext`).
+
+The server reads requests from stdin and writes responses to stdout, or
+listens on a Unix socket when started with `--socket PATH`.
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import sys
+import traceback
+from typing import Any, Dict, TextIO
+
+from nada_dsl.compile import compile_script, compile_string, isolated_compilation
+
+
+def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Handle a single compilation request.
+
+    Every request is compiled in isolation, the compiler state is fully reset
+    between requests.
+
+    Args:
+        request (Dict[str, Any]): The compilation request
+
+    Returns:
+        Dict[str, Any]: The response to the request
+    """
+    response: Dict[str, Any] = {"id": request.get("id")}
+    try:
+        method = request.get("method")
+        with isolated_compilation(request.get("options")):
+            if method == "compile_script":
+                output = compile_script(request["path"])
+            elif method == "compile_string":
+                output = compile_string(request["program"])
+            else:
+                raise ValueError(f"unknown method: {method}")
+        response["result"] = "Success"
+        response["mir"] = output.mir
+    except Exception as ex:  # pylint:disable=broad-exception-caught
+        response["result"] = "Failure"
+        response["reason"] = str(ex)
+        response["traceback"] = str(traceback.format_exc())
+    return response
+
+
+def serve_stream(rfile: TextIO, wfile: TextIO):
+    """Serve JSON-lines requests read from `rfile` until end of file.
+
+    Args:
+        rfile (TextIO): The stream the requests are read from
+        wfile (TextIO): The stream the responses are written to
+    """
+    for line in rfile:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as ex:
+            response = {"id": None, "result": "Failure", "reason": str(ex)}
+        else:
+            if isinstance(request, dict):
+                response = handle_request(request)
+            else:
+                response = {
+                    "id": None,
+                    "result": "Failure",
+                    "reason": "the request is not a JSON object",
+                }
+        wfile.write(json.dumps(response) + "\n")
+        wfile.flush()
+
+
+class CompileRequestHandler(socketserver.StreamRequestHandler):
+    """Handles a connection to the compile server."""
+
+    def handle(self):
+        serve_stream(
+            (line.decode("utf-8") for line in self.rfile),
+            _SocketWriter(self.wfile),
+        )
+
+
+class _SocketWriter:
+    """Text adapter of the binary socket stream."""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, text: str):
+        """Write text into the socket."""
+        self.wfile.write(text.encode("utf-8"))
+
+    def flush(self):
+        """Flush the socket stream."""
+        self.wfile.flush()
+
+
+def serve_unix_socket(path: str):
+    """Serve compilation requests on a Unix socket.
+
+    Connections are served one at a time, as compilations share the compiler state.
+
+    Args:
+        path (str): The path of the Unix socket
+    """
+    if os.path.exists(path):
+        os.unlink(path)
+    with socketserver.UnixStreamServer(path, CompileRequestHandler) as server:
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(path)
+
+
+def main(args=None):
+    """Compile server entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m nada_dsl.compile_server",
+        description="Serve Nada compilation requests.",
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="Listen on a Unix socket instead of stdin / stdout",
+    )
+    arguments = parser.parse_args(args)
+    if arguments.socket:
+        serve_unix_socket(arguments.socket)
+    else:
+        serve_stream(sys.stdin, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,12 +8,12 @@ import json
 import os
 from json import JSONEncoder
 import inspect
-from typing import List, Dict, Any, Optional, Tuple
-from sortedcontainers import SortedDict
+from typing import List, Dict, Any, Callable, Iterator, Optional, Set, TextIO, Tuple
 
 from nada_dsl.ast_util import (
     AST_OPERATIONS,
     ASTOperation,
+    ArrayAccessorASTOperation,
     BinaryASTOperation,
     CastASTOperation,
     IfElseASTOperation,
@@ -30,14 +30,20 @@ from nada_dsl.ast_util import (
     ReduceASTOperation,
     UnaryASTOperation,
 )
+from nada_dsl.compilation_context import ContextMapping, current_context
+from nada_dsl.optimizations import (
+    eliminate_dead_operations,
+    rebalance_associative_chains,
+)
 from nada_dsl.timer import timer
 from nada_dsl.source_ref import SourceRef
 from nada_dsl.program_io import Output
 
-INPUTS = SortedDict()
-PARTIES = SortedDict()
-FUNCTIONS: Dict[int, NadaFunctionASTOperation] = {}
-LITERALS: Dict[str, Tuple[str, object]] = {}
+# Inputs, parties, functions and literals used in the MIR of the current compilation context
+INPUTS = ContextMapping("inputs")
+PARTIES = ContextMapping("parties")
+FUNCTIONS: Dict[int, NadaFunctionASTOperation] = ContextMapping("functions")
+LITERALS: Dict[str, Tuple[str, object]] = ContextMapping("literals")
 
 
 class ClassEncoder(JSONEncoder):
@@ -49,6 +55,11 @@ class ClassEncoder(JSONEncoder):
         return {type(o).__name__: o.__dict__}
 
 
+def to_mir(operation: ASTOperation) -> Dict[str, Dict]:
+    """Convert an AST operation into its MIR representation."""
+    return operation.to_mir()
+
+
 def get_target_dir() -> str:
     """Get the target directory for compilation output."""
     env_dir = os.environ.get("Nada_TARGET_DIR")
@@ -65,6 +76,16 @@ def get_target_dir() -> str:
     return os.path.join(cwd, "target")
 
 
+def reset_compiler_state():
+    """Reset the current compilation context, so the next program is compiled
+    from scratch.
+
+    This drops the stored AST operations, functions, inputs, parties, literals and
+    source references, and restarts the operation id counter.
+    """
+    current_context().reset()
+
+
 def nada_compile(outputs: List[Output]) -> str:
     """Compile Nada to MIR and dump it as JSON."""
     compiled = nada_dsl_to_nada_mir(outputs)
@@ -73,11 +94,118 @@ def nada_compile(outputs: List[Output]) -> str:
 
 def nada_dsl_to_nada_mir(outputs: List[Output]) -> Dict[str, Any]:
     """Convert Nada DSL to Nada MIR."""
+    operations: Dict[int, Dict] = {}
+    new_outputs = process_outputs(outputs, operations)
+    return {
+        "functions": to_mir_function_list(FUNCTIONS),
+        "parties": to_party_list(PARTIES),
+        "inputs": to_input_list(INPUTS),
+        "literals": to_literal_list(LITERALS),
+        "outputs": new_outputs,
+        "operations": operations,
+        "source_files": SourceRef.get_sources(),
+        "source_refs": SourceRef.get_refs(),
+    }
+
+
+def write_nada_mir(outputs: List[Output], file: TextIO):
+    """Convert Nada DSL to Nada MIR and write it as JSON into a file.
+
+    The MIR is written incrementally: every operation and function is written as
+    soon as it is converted, so the MIR is never fully held in memory. The
+    sections are written in a different order than `nada_compile`, as the
+    operations have to be processed before the sections they populate, but both
+    produce the same JSON object.
+
+    Arguments
+    ---------
+    outputs: List[Output]
+        The outputs of the program
+    file: TextIO
+        The text stream the MIR is written to
+    """
+    file.write('{"operations": {')
+    new_outputs = process_outputs(outputs, OperationWriter(file))
+    file.write('}, "functions": [')
+    for index, function in enumerate(iter_mir_functions(FUNCTIONS)):
+        if index:
+            file.write(", ")
+        json.dump(function, file)
+    file.write('], "parties": ')
+    json.dump(to_party_list(PARTIES), file)
+    file.write(', "inputs": ')
+    json.dump(to_input_list(INPUTS), file)
+    file.write(', "literals": ')
+    json.dump(to_literal_list(LITERALS), file)
+    file.write(', "outputs": ')
+    json.dump(new_outputs, file)
+    file.write(', "source_files": {')
+    for index, (name, content) in enumerate(SourceRef.get_sources().items()):
+        if index:
+            file.write(", ")
+        file.write(f"{json.dumps(name)}: {json.dumps(content)}")
+    file.write('}, "source_refs": ')
+    json.dump(SourceRef.get_refs(), file)
+    file.write("}")
+
+
+class OperationWriter:
+    """Operations map that writes every operation into a JSON stream instead of
+    storing it.
+
+    Only the identifiers of the written operations are kept, so it can be used
+    in place of the operations dictionary of `traverse_and_process_operations`.
+    """
+
+    __slots__ = ("file", "written")
+
+    def __init__(self, file: TextIO):
+        self.file = file
+        self.written: Set[int] = set()
+
+    def __contains__(self, operation_id: int) -> bool:
+        return operation_id in self.written
+
+    def __setitem__(self, operation_id: int, operation: Dict):
+        if self.written:
+            self.file.write(", ")
+        self.written.add(operation_id)
+        self.file.write(f'"{operation_id}": {json.dumps(operation)}')
+
+
+def process_outputs(
+    outputs: List[Output],
+    operations: Dict[int, Any],
+    convert: Callable[[ASTOperation], Any] = to_mir,
+) -> List[Dict[str, Any]]:
+    """Process the operations of the program outputs.
+
+    Runs the enabled optimization passes, adds all the operations reachable from
+    the outputs, converted with `convert`, into `operations` and discovers the
+    functions, parties, inputs and literals used by them.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        The outputs in MIR format
+    """
     new_outputs = []
     PARTIES.clear()
     INPUTS.clear()
     LITERALS.clear()
-    operations: Dict[int, Dict] = {}
+    context = current_context()
+    if context.rebalance:
+        timer.start("nada_dsl.compiler_frontend.nada_dsl_to_nada_mir.rebalance")
+        context.rebalance_report = rebalance_associative_chains(
+            [output.child.child.id for output in outputs]
+        )
+        timer.stop("nada_dsl.compiler_frontend.nada_dsl_to_nada_mir.rebalance")
+    if context.eliminate_dead_operations:
+        timer.start("nada_dsl.compiler_frontend.nada_dsl_to_nada_mir.dead_operations")
+        context.dead_operation_report = eliminate_dead_operations(
+            [output.child.child.id for output in outputs]
+        )
+        timer.stop("nada_dsl.compiler_frontend.nada_dsl_to_nada_mir.dead_operations")
     # Process outputs
     for output in outputs:
         timer.start(
@@ -85,7 +213,7 @@ def nada_dsl_to_nada_mir(outputs: List[Output]) -> Dict[str, Any]:
         )
         out_operation_id = output.child.child.id
         extra_fns = traverse_and_process_operations(
-            out_operation_id, operations, FUNCTIONS
+            out_operation_id, operations, FUNCTIONS, convert
         )
         FUNCTIONS.update(extra_fns)
 
@@ -103,19 +231,9 @@ def nada_dsl_to_nada_mir(outputs: List[Output]) -> Dict[str, Any]:
                 "source_ref_index": output.source_ref.to_index(),
             }
         )
-    # Now we go through all the discovered functions and see if they are
-    # invoking other functions, which we will need to process and add to the FUNCTIONS dictionary
-
-    return {
-        "functions": to_mir_function_list(FUNCTIONS),
-        "parties": to_party_list(PARTIES),
-        "inputs": to_input_list(INPUTS),
-        "literals": to_literal_list(LITERALS),
-        "outputs": new_outputs,
-        "operations": operations,
-        "source_files": SourceRef.get_sources(),
-        "source_refs": SourceRef.get_refs(),
-    }
+    # The discovered functions are processed afterwards, as they may invoke
+    # other functions that need to be added to the FUNCTIONS dictionary
+    return new_outputs
 
 
 def to_party_list(parties) -> List[Dict]:
@@ -179,7 +297,18 @@ def to_mir_function_list(functions: Dict[int, NadaFunctionASTOperation]) -> List
     functions: Dict[int, NadaFunctionASTOperation]
         A dictionary containing a starting list of functions
     """
-    mir_functions = []
+    return list(iter_mir_functions(functions))
+
+
+def iter_mir_functions(
+    functions: Dict[int, NadaFunctionASTOperation],
+    convert: Callable[[ASTOperation], Any] = to_mir,
+) -> Iterator[Dict]:
+    """Generate the MIR representation of the functions one at a time, with their
+    operations converted with `convert`.
+
+    See `to_mir_function_list`.
+    """
     stack = list(functions.values())
     while len(stack) > 0:
         function = stack.pop()
@@ -189,12 +318,12 @@ def to_mir_function_list(functions: Dict[int, NadaFunctionASTOperation]) -> List
             function.child,
             function_operations,
             functions,
+            convert,
         )
         if extra_functions:
             stack.extend(extra_functions.values())
             functions.update(extra_functions)
-        mir_functions.append(function.to_mir(function_operations))
-    return mir_functions
+        yield function.to_mir(function_operations)
 
 
 def add_input_to_map(operation: InputASTOperation):
@@ -219,8 +348,9 @@ class CompilerException(Exception):
 
 def traverse_and_process_operations(
     operation_id: int,
-    operations: Dict[int, Dict],
+    operations: Dict[int, Any],
     functions: Dict[int, NadaFunctionASTOperation],
+    convert: Callable[[ASTOperation], Any] = to_mir,
 ) -> Dict[int, NadaFunctionASTOperation]:
     """Traverses the AST operations finding all the operation tree rooted at the given
     operation. Uses an iterative DFS algorithm.
@@ -238,6 +368,8 @@ def traverse_and_process_operations(
     functions: Dict[int, NadaFunctionASTOperation]
         Dictionary of existing functions. If a function is found that is not in this dictionary
         it will added to the result dictionary
+    convert: Callable[[ASTOperation], Any]
+        Conversion of the operations into their output representation, MIR by default
 
     Returns
     -------
@@ -246,12 +378,13 @@ def traverse_and_process_operations(
     """
 
     extra_functions = {}
+    ast_operations = current_context().operations
     stack = [operation_id]
     while len(stack) > 0:
         operation_id = stack.pop()
         if operation_id not in operations:
-            operation = AST_OPERATIONS[operation_id]
-            wrapped_operation = process_operation(operation, functions)
+            operation = ast_operations[operation_id]
+            wrapped_operation = process_operation(operation, functions, convert)
             operations[operation_id] = wrapped_operation.mir
             if wrapped_operation.extra_function:
                 extra_functions[wrapped_operation.extra_function.id] = (
@@ -265,12 +398,14 @@ def traverse_and_process_operations(
 class ProcessOperationOutput:
     """Output of the process_operation function"""
 
-    mir: Dict[str, Dict]
+    mir: Any
     extra_function: Optional[NadaFunctionASTOperation]
 
 
 def process_operation(
-    operation: ASTOperation, functions: Dict[int, NadaFunctionASTOperation]
+    operation: ASTOperation,
+    functions: Dict[int, NadaFunctionASTOperation],
+    convert: Callable[[ASTOperation], Any] = to_mir,
 ) -> ProcessOperationOutput:
     """Process an AST operation.
 
@@ -286,6 +421,9 @@ def process_operation(
     a MIR representation as functions are processed separately.
 
     It ignores nada function arguments as they should not be present in the MIR.
+
+    The MIR representation is generated by `convert`, which defaults to the
+    JSON representation of the operation.
     """
     processed_operation = None
     if isinstance(
@@ -300,16 +438,17 @@ def process_operation(
             NadaFunctionArgASTOperation,
             NTupleAccessorASTOperation,
             ObjectAccessorASTOperation,
+            ArrayAccessorASTOperation,
         ),
     ):
-        processed_operation = ProcessOperationOutput(operation.to_mir(), None)
+        processed_operation = ProcessOperationOutput(convert(operation), None)
 
     elif isinstance(operation, InputASTOperation):
         add_input_to_map(operation)
-        processed_operation = ProcessOperationOutput(operation.to_mir(), None)
+        processed_operation = ProcessOperationOutput(convert(operation), None)
     elif isinstance(operation, LiteralASTOperation):
-        LITERALS[operation.literal_index] = (str(operation.value), operation.ty)
-        processed_operation = ProcessOperationOutput(operation.to_mir(), None)
+        LITERALS[operation.literal_index] = (operation.mir_value(), operation.ty)
+        processed_operation = ProcessOperationOutput(convert(operation), None)
     elif isinstance(
         operation, (MapASTOperation, ReduceASTOperation, NadaFunctionCallASTOperation)
     ):
@@ -317,7 +456,7 @@ def process_operation(
         if operation.fn not in functions:
             extra_fn = AST_OPERATIONS[operation.fn]
 
-        processed_operation = ProcessOperationOutput(operation.to_mir(), extra_fn)  # type: ignore
+        processed_operation = ProcessOperationOutput(convert(operation), extra_fn)  # type: ignore
     elif isinstance(operation, NadaFunctionASTOperation):
         extra_fn = None
         if operation.id not in functions:
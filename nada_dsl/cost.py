@@ -0,0 +1,285 @@
+"""
+Static cost estimation.
+
+Estimates the MPC cost of a program from its MIR: the number of operations of
+every class that needs communication between the nodes (secret
+multiplications, comparisons, probabilistic truncations...) and the depth of the
+critical path made of these operations, which bounds the number of
+communication rounds.
+
+    mir = nada_dsl_to_nada_mir(nada_main())
+    report = estimate_cost(mir)
+
+The MIR can either be the dictionary produced by `nada_dsl_to_nada_mir` or its
+JSON representation loaded with `json.loads`.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+import math
+from typing import Any, Dict, List, Tuple
+
+# Operations compared through a secure comparison protocol
+COMPARISON_OPERATIONS = frozenset(
+    [
+        "LessThan",
+        "GreaterThan",
+        "LessOrEqualThan",
+        "GreaterOrEqualThan",
+        "Equals",
+        "NotEquals",
+        "PublicOutputEquality",
+    ]
+)
+
+# Prefix of the operations applied to every element of their array operands,
+# which cost as many operations as elements, without the prefix
+ELEMENTWISE_PREFIX = "Elementwise"
+
+# Operations that need communication regardless of their operands
+PROTOCOL_OPERATIONS = {
+    "TruncPr": "trunc_pr",
+    "Reveal": "reveal",
+    "EcdsaSign": "ecdsa_sign",
+}
+
+# Cost classes reported by the estimator, in report order
+COST_CLASSES = (
+    "secret_multiplications",
+    "comparisons",
+    "divisions",
+    "trunc_pr",
+    "reveal",
+    "ecdsa_sign",
+    "random",
+)
+
+# Operands of a MIR operation
+_OPERAND_KEYS = (
+    "left",
+    "right",
+    "this",
+    "arg_0",
+    "arg_1",
+    "inner",
+    "initial",
+    "target",
+    "source",
+)
+_OPERAND_LIST_KEYS = ("elements", "args")
+
+
+@dataclass(slots=True)
+class CostReport:
+    """Estimated cost of a program.
+
+    Attributes
+    ----------
+    operations: int
+        Number of executed operations, with the operations of Nada functions
+        counted once per call, map element and reduce element
+    counts: Dict[str, int]
+        Number of executed operations of every cost class (see `COST_CLASSES`)
+    depth: int
+        Number of communication operations on the critical path of the program
+    """
+
+    operations: int
+    counts: Dict[str, int]
+    depth: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the report into a dictionary."""
+        return {
+            "operations": self.operations,
+            "counts": dict(self.counts),
+            "depth": self.depth,
+        }
+
+
+def _is_secret(ty: Any) -> bool:
+    """Returns true if a MIR type is secret, or an array of secrets."""
+    if isinstance(ty, str):
+        return ty.startswith("Secret")
+    if isinstance(ty, dict) and "Array" in ty:
+        return _is_secret(ty["Array"]["inner_type"])
+    return False
+
+
+def _array_size(ty: Any) -> int:
+    """Returns the size of a MIR array type."""
+    if isinstance(ty, dict) and "Array" in ty:
+        return ty["Array"].get("size", 0)
+    raise ValueError(f"expected an array type, found {ty}")
+
+
+def _shape(ty: Any) -> List[int]:
+    """Returns the sizes of the dimensions of a (nested) MIR array type."""
+    shape = []
+    while isinstance(ty, dict) and "Array" in ty:
+        shape.append(_array_size(ty))
+        ty = ty["Array"]["inner_type"]
+    return shape
+
+
+def _operands(operation: Dict[str, Any]) -> List[int]:
+    """Returns the identifiers of the operands of a MIR operation."""
+    operands = [operation[key] for key in _OPERAND_KEYS if key in operation]
+    for key in _OPERAND_LIST_KEYS:
+        operands.extend(operation.get(key, []))
+    return operands
+
+
+def _flatten(operations: Dict[Any, Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    """Flatten MIR operations into a map of integer identifiers to the content of
+    the operation, the operation name is kept under the "name" key."""
+    flat = {}
+    for operation_id, operation in operations.items():
+        ((name, content),) = operation.items()
+        flat[int(operation_id)] = {**content, "name": name}
+    return flat
+
+
+class _Estimator:
+    """Walks the operations of a MIR, memoizing the cost of every function."""
+
+    def __init__(self, mir: Dict[str, Any]):
+        self.functions = {function["id"]: function for function in mir["functions"]}
+        self.function_costs: Dict[int, Tuple[int, Counter, int]] = {}
+
+    def function_cost(self, function_id: int) -> Tuple[int, Counter, int]:
+        """Returns the cost of one execution of a Nada function."""
+        if function_id not in self.function_costs:
+            function = self.functions[function_id]
+            self.function_costs[function_id] = self.cost(
+                function["operations"], [function["return_operation_id"]]
+            )
+        return self.function_costs[function_id]
+
+    def call_cost(
+        self, name: str, operation: Dict[str, Any], operations: Dict[int, Any]
+    ) -> Tuple[int, Counter, int]:
+        """Returns the cost of a Map, Reduce or NadaFunctionCall operation."""
+        function_id = operation.get("fn", operation.get("function_id"))
+        executed, function_counts, function_depth = self.function_cost(function_id)
+        repetitions = 1
+        if name != "NadaFunctionCall":
+            repetitions = _array_size(operations[operation["inner"]]["type"])
+        counts: Counter = Counter(
+            {
+                cost_class: count * repetitions
+                for cost_class, count in function_counts.items()
+            }
+        )
+        # Map applies the function to all the elements in parallel while
+        # Reduce applies it sequentially.
+        depth = function_depth * (repetitions if name == "Reduce" else 1)
+        return 1 + executed * repetitions, counts, depth
+
+    def operation_cost(
+        self, name: str, operation: Dict[str, Any], operations: Dict[int, Any]
+    ) -> Tuple[int, Counter, int]:
+        """Returns the cost of a single operation, without its operands.
+
+        The returned depth is the number of communication operations between the
+        operands and the result of the operation.
+        """
+        if name in ("Map", "Reduce", "NadaFunctionCall"):
+            return self.call_cost(name, operation, operations)
+
+        elementwise = name.startswith(ELEMENTWISE_PREFIX)
+        if elementwise:
+            name = name[len(ELEMENTWISE_PREFIX) :]
+        counts: Counter = Counter()
+        operand_types = [
+            operations[operand]["type"] for operand in _operands(operation)
+        ]
+        secret_operands = sum(1 for ty in operand_types if _is_secret(ty))
+        if name == "Multiplication" and secret_operands == 2:
+            counts["secret_multiplications"] = 1
+        elif name == "InnerProduct" and secret_operands == 2:
+            counts["secret_multiplications"] = _array_size(operand_types[0])
+        elif name == "MatrixProduct" and secret_operands == 2:
+            left_shape, right_shape = (_shape(ty) for ty in operand_types)
+            counts["secret_multiplications"] = math.prod(left_shape + right_shape[1:])
+        elif name == "IfElse" and _is_secret(operand_types[0]):
+            counts["secret_multiplications"] = 1
+        elif name in COMPARISON_OPERATIONS and secret_operands:
+            counts["comparisons"] = 1
+        elif name in ("Division", "Modulo") and secret_operands:
+            counts["divisions"] = 1
+        elif name in PROTOCOL_OPERATIONS:
+            counts[PROTOCOL_OPERATIONS[name]] = 1
+        elif name == "Random":
+            counts["random"] = 1
+        if elementwise:
+            # Elementwise operations on arrays run all their element operations in
+            # the same round
+            size = _array_size(operation["type"])
+            counts = Counter(
+                {cost_class: count * size for cost_class, count in counts.items()}
+            )
+        communicates = any(
+            counts[cost_class] for cost_class in COST_CLASSES if cost_class != "random"
+        )
+        return 1, counts, 1 if communicates else 0
+
+    def cost(
+        self, operations: Dict[Any, Dict[str, Any]], roots: List[int]
+    ) -> Tuple[int, Counter, int]:
+        """Returns the cost of the operations reachable from the given roots.
+
+        Every operation is counted once, even if it has several users.
+        """
+        flat = _flatten(operations)
+        executed = 0
+        counts: Counter = Counter()
+        depths: Dict[int, int] = {}
+        for root in roots:
+            stack = [root]
+            while stack:
+                operation_id = stack[-1]
+                if operation_id in depths:
+                    stack.pop()
+                    continue
+                operation = flat[operation_id]
+                operands = _operands(operation)
+                pending = [operand for operand in operands if operand not in depths]
+                if pending:
+                    stack.extend(pending)
+                    continue
+                stack.pop()
+                operation_cost = self.operation_cost(operation["name"], operation, flat)
+                executed += operation_cost[0]
+                counts.update(operation_cost[1])
+                depths[operation_id] = operation_cost[2] + max(
+                    (depths[operand] for operand in operands), default=0
+                )
+        depth = max((depths[root] for root in roots), default=0)
+        return executed, counts, depth
+
+
+def estimate_cost(mir: Dict[str, Any]) -> CostReport:
+    """Estimate the MPC cost of a program.
+
+    Map and Reduce operations are expanded by the size of the array they iterate
+    over and count the cost of their function body once per element.
+
+    Arguments
+    ---------
+    mir: Dict[str, Any]
+        The MIR of the program
+
+    Returns
+    -------
+    CostReport
+        The estimated cost of the program
+    """
+    estimator = _Estimator(mir)
+    roots = [output["operation_id"] for output in mir["outputs"]]
+    executed, counts, depth = estimator.cost(mir["operations"], roots)
+    return CostReport(
+        operations=executed,
+        counts={cost_class: counts[cost_class] for cost_class in COST_CLASSES},
+        depth=depth,
+    )
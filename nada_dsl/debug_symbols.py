@@ -0,0 +1,173 @@
+"""
+Debug symbols.
+
+Release builds of a program can be stripped of the debugging information of the
+MIR: the embedded source files and, optionally, the source references. The
+removed information is returned as a separate debug symbols document, that can
+be stored next to the MIR and joined back into it by tooling:
+
+    stripped, symbols = strip_mir(mir, drop_source_refs=True)
+    ...
+    mir = join_debug_symbols(stripped, symbols)
+
+The debug symbols record a hash of the stripped MIR, so they are only joined into
+the MIR they were produced from.
+"""
+
+import copy
+import hashlib
+import json
+from typing import Any, Callable, Dict, List, Tuple
+
+from nada_dsl.source_ref import EMPTY_SOURCE_REF
+
+
+def mir_digest(mir: Dict[str, Any]) -> str:
+    """Returns the SHA-256 digest of a MIR.
+
+    The MIR is normalized into its JSON form first, so the operation identifiers
+    are sorted as strings whether they are integers, as in the MIR produced by
+    `nada_dsl_to_nada_mir`, or strings, as in a MIR loaded from JSON.
+    """
+    normalized = json.loads(json.dumps(mir))
+    return hashlib.sha256(
+        json.dumps(normalized, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def _operation_content(operation: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns the content of a MIR operation, without its variant name."""
+    return next(iter(operation.values()))
+
+
+def _map_source_ref_indexes(
+    mir: Dict[str, Any], update: Callable[[Dict[str, Any]], int]
+) -> Dict[str, Any]:
+    """Apply `update` to every element of a MIR holding a source reference index.
+
+    `update` receives the element and returns its new source reference index.
+    Returns the previous source reference indexes, in the debug symbols format.
+    """
+
+    def operations_indexes(operations: Dict[Any, Dict]) -> Dict[str, int]:
+        indexes = {}
+        for operation_id, operation in operations.items():
+            content = _operation_content(operation)
+            indexes[str(operation_id)] = content["source_ref_index"]
+            content["source_ref_index"] = update(content)
+        return indexes
+
+    def elements_indexes(elements: List[Dict[str, Any]]) -> List[int]:
+        indexes = []
+        for element in elements:
+            indexes.append(element["source_ref_index"])
+            element["source_ref_index"] = update(element)
+        return indexes
+
+    functions = []
+    for function in mir["functions"]:
+        functions.append(
+            {
+                "function": function["source_ref_index"],
+                "args": elements_indexes(function["args"]),
+                "operations": operations_indexes(function["operations"]),
+            }
+        )
+        function["source_ref_index"] = update(function)
+    return {
+        "functions": functions,
+        "parties": elements_indexes(mir["parties"]),
+        "inputs": elements_indexes(mir["inputs"]),
+        "outputs": elements_indexes(mir["outputs"]),
+        "operations": operations_indexes(mir["operations"]),
+    }
+
+
+def strip_mir(
+    mir: Dict[str, Any], drop_source_refs: bool = False
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Strip the debugging information of a MIR.
+
+    The embedded source files are always removed. When `drop_source_refs` is set,
+    the source references are replaced by a single empty source reference and
+    every source reference index is set to 0.
+
+    Arguments
+    ---------
+    mir: Dict[str, Any]
+        The MIR of the program, it is not modified
+    drop_source_refs: bool
+        Whether the source references are also removed
+
+    Returns
+    -------
+    Tuple[Dict[str, Any], Dict[str, Any]]
+        The stripped MIR and its debug symbols
+    """
+    stripped = copy.deepcopy(mir)
+    symbols: Dict[str, Any] = {"source_files": stripped["source_files"]}
+    stripped["source_files"] = {}
+    if drop_source_refs:
+        symbols["source_refs"] = stripped["source_refs"]
+        symbols["source_ref_indexes"] = _map_source_ref_indexes(
+            stripped, lambda element: 0
+        )
+        stripped["source_refs"] = [EMPTY_SOURCE_REF.to_value()]
+    symbols["mir_sha256"] = mir_digest(stripped)
+    return stripped, symbols
+
+
+def join_debug_symbols(mir: Dict[str, Any], symbols: Dict[str, Any]) -> Dict[str, Any]:
+    """Join debug symbols back into the stripped MIR they were produced from.
+
+    Arguments
+    ---------
+    mir: Dict[str, Any]
+        The stripped MIR, it is not modified
+    symbols: Dict[str, Any]
+        The debug symbols returned by `strip_mir`
+
+    Returns
+    -------
+    Dict[str, Any]
+        The MIR with its debugging information
+
+    Raises
+    ------
+    ValueError
+        If the debug symbols were not produced from this MIR
+    """
+    if mir_digest(mir) != symbols["mir_sha256"]:
+        raise ValueError("the debug symbols do not belong to this MIR")
+    joined = copy.deepcopy(mir)
+    joined["source_files"] = symbols["source_files"]
+    if "source_refs" in symbols:
+        joined["source_refs"] = symbols["source_refs"]
+        _restore_source_ref_indexes(joined, symbols["source_ref_indexes"])
+    return joined
+
+
+def _restore_source_ref_indexes(mir: Dict[str, Any], indexes: Dict[str, Any]):
+    """Restore the source reference indexes recorded by `_map_source_ref_indexes`.
+
+    Operations are matched by identifier and the elements of lists by position,
+    so the indexes are restored whatever the order of the keys of the MIR, which
+    is not part of its digest.
+    """
+
+    def restore_operations(operations: Dict[Any, Dict], previous: Dict[str, int]):
+        for operation_id, operation in operations.items():
+            content = _operation_content(operation)
+            content["source_ref_index"] = previous[str(operation_id)]
+
+    def restore_elements(elements: List[Dict[str, Any]], previous: List[int]):
+        for element, index in zip(elements, previous, strict=True):
+            element["source_ref_index"] = index
+
+    for function, previous in zip(mir["functions"], indexes["functions"], strict=True):
+        function["source_ref_index"] = previous["function"]
+        restore_elements(function["args"], previous["args"])
+        restore_operations(function["operations"], previous["operations"])
+    for section in ("parties", "inputs", "outputs"):
+        restore_elements(mir[section], indexes[section])
+    restore_operations(mir["operations"], indexes["operations"])
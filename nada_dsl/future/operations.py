@@ -11,6 +11,8 @@ from nada_dsl.nada_types import AllTypes, AllTypesType
 class Cast:
     """Cast operation."""
 
+    __slots__ = ("id", "target", "to", "source_ref")
+
     target: AllTypes
     to: AllTypesType
     source_ref: SourceRef
@@ -0,0 +1,402 @@
+"""
+Protobuf MIR emitter.
+
+Converts a Nada program into the `ProgramMir` protobuf message defined by the
+`nada_mir_proto` package. The operations are converted directly from the AST
+operations of the compilation context, without building their JSON
+representation.
+
+    mir = nada_dsl_to_proto_mir(nada_main())
+    data = bytes(mir)
+
+Operations without a protobuf variant, like the matrix product and the
+elementwise operations on arrays (`ElementwiseAddition`...), are rejected with a
+`CompilerException`: these programs can only be compiled to the JSON MIR.
+
+This module needs the optional `nada-mir-proto` dependency.
+"""
+
+from typing import Any, Callable, Dict, List, Tuple
+
+from nada_mir_proto.nillion.nada.mir import v1 as mir_pb
+from nada_mir_proto.nillion.nada.operations import v1 as operations_pb
+from nada_mir_proto.nillion.nada.types import v1 as types_pb
+
+from nada_dsl.ast_util import (
+    AST_OPERATIONS,
+    ASTOperation,
+    ArrayAccessorASTOperation,
+    BinaryASTOperation,
+    CastASTOperation,
+    IfElseASTOperation,
+    InputASTOperation,
+    LiteralASTOperation,
+    MapASTOperation,
+    NadaFunctionArgASTOperation,
+    NadaFunctionCallASTOperation,
+    NewASTOperation,
+    RandomASTOperation,
+    ReduceASTOperation,
+    UnaryASTOperation,
+    type_key,
+)
+from nada_dsl.compiler_frontend import (
+    FUNCTIONS,
+    INPUTS,
+    LITERALS,
+    PARTIES,
+    CompilerException,
+    iter_mir_functions,
+    process_outputs,
+    to_input_list,
+    to_literal_list,
+    to_party_list,
+)
+from nada_dsl.nada_types import NadaTypeRepr
+from nada_dsl.program_io import Output
+from nada_dsl.source_ref import SourceRef
+
+# Scalar types, indexed by their MIR name
+SCALAR_TYPES = {
+    "Integer": types_pb.ScalarType.INTEGER,
+    "UnsignedInteger": types_pb.ScalarType.UNSIGNED_INTEGER,
+    "Boolean": types_pb.ScalarType.BOOLEAN,
+    "SecretInteger": types_pb.ScalarType.SECRET_INTEGER,
+    "SecretUnsignedInteger": types_pb.ScalarType.SECRET_UNSIGNED_INTEGER,
+    "SecretBoolean": types_pb.ScalarType.SECRET_BOOLEAN,
+    "SecretBlob": types_pb.ScalarType.SECRET_BLOB,
+    "EcdsaPrivateKey": types_pb.ScalarType.ECDSA_PRIVATE_KEY,
+    "EcdsaDigestMessage": types_pb.ScalarType.ECDSA_DIGEST_MESSAGE,
+}
+
+# Operation variants of the binary operations, indexed by their MIR name
+BINARY_OPERATIONS = {
+    "Addition": operations_pb.OperationVariant.ADDITION,
+    "Subtraction": operations_pb.OperationVariant.SUBTRACTION,
+    "Multiplication": operations_pb.OperationVariant.MULTIPLICATION,
+    "Division": operations_pb.OperationVariant.DIVISION,
+    "Modulo": operations_pb.OperationVariant.MODULO,
+    "Power": operations_pb.OperationVariant.POWER,
+    "LeftShift": operations_pb.OperationVariant.LEFT_SHIFT,
+    "RightShift": operations_pb.OperationVariant.RIGHT_SHIFT,
+    "LessThan": operations_pb.OperationVariant.LESS_THAN,
+    "LessOrEqualThan": operations_pb.OperationVariant.LESS_EQ,
+    "GreaterThan": operations_pb.OperationVariant.GREATER_THAN,
+    "GreaterOrEqualThan": operations_pb.OperationVariant.GREATER_EQ,
+    "PublicOutputEquality": operations_pb.OperationVariant.EQUALS_PUBLIC_OUTPUT,
+    "Equals": operations_pb.OperationVariant.EQUALS,
+    "NotEquals": operations_pb.OperationVariant.NOT_EQUALS,
+    "BooleanAnd": operations_pb.OperationVariant.BOOL_AND,
+    "BooleanOr": operations_pb.OperationVariant.BOOL_OR,
+    "BooleanXor": operations_pb.OperationVariant.BOOL_XOR,
+    "TruncPr": operations_pb.OperationVariant.TRUNC_PR,
+    "InnerProduct": operations_pb.OperationVariant.INNER_PROD,
+    "Zip": operations_pb.OperationVariant.ZIP,
+}
+
+# Operation variants of the unary operations, indexed by their MIR name
+UNARY_OPERATIONS = {
+    "Reveal": operations_pb.OperationVariant.REVEAL,
+    "Not": operations_pb.OperationVariant.NOT,
+    "Unzip": operations_pb.OperationVariant.UNZIP,
+}
+
+
+class ProtoEmitter:
+    """Converts AST operations into protobuf operations.
+
+    Input and literal references point to the index of the input or literal in
+    the program, which is only known once all the operations have been
+    discovered, so they are resolved by `resolve_references`.
+    """
+
+    __slots__ = ("types", "input_references", "literal_references")
+
+    def __init__(self):
+        self.types: Dict[Any, types_pb.NadaType] = {}
+        self.input_references: List[Tuple[operations_pb.InputReference, Tuple]] = []
+        self.literal_references: List[Tuple[operations_pb.InputReference, str]] = []
+
+    def nada_type(self, ty: NadaTypeRepr) -> types_pb.NadaType:
+        """Convert a MIR type representation into a protobuf Nada type."""
+        key = type_key(ty)
+        converted = self.types.get(key)
+        if converted is None:
+            converted = self._convert_type(ty)
+            self.types[key] = converted
+        return converted
+
+    def _convert_type(self, ty: NadaTypeRepr) -> types_pb.NadaType:
+        if isinstance(ty, str):
+            if ty not in SCALAR_TYPES:
+                raise CompilerException(f"Type {ty} is not supported in protobuf MIR")
+            return types_pb.NadaType(scalar=SCALAR_TYPES[ty])
+        ((name, content),) = ty.items()
+        if name == "Array":
+            composite = types_pb.CompositeType(
+                array=types_pb.Array(
+                    inner_type=self.nada_type(content["inner_type"]),
+                    size=content.get("size", 0),
+                )
+            )
+        elif name == "Tuple":
+            composite = types_pb.CompositeType(
+                tuple=types_pb.Tuple(
+                    left=self.nada_type(content["left_type"]),
+                    right=self.nada_type(content["right_type"]),
+                )
+            )
+        elif name == "NTuple":
+            composite = types_pb.CompositeType(
+                ntuple=types_pb.NTuple(
+                    types=[self.nada_type(inner) for inner in content["types"]]
+                )
+            )
+        elif name == "Object":
+            composite = types_pb.CompositeType(
+                object=types_pb.Object(
+                    types={
+                        key: self.nada_type(inner)
+                        for key, inner in content["types"].items()
+                    }
+                )
+            )
+        else:
+            raise CompilerException(f"Type {name} is not supported in protobuf MIR")
+        return types_pb.NadaType(composite=composite)
+
+    def descriptor(self, operation: ASTOperation) -> operations_pb.OperationDescriptor:
+        """Returns the protobuf descriptor of an operation."""
+        return operations_pb.OperationDescriptor(
+            id=operation.id,
+            type=self.nada_type(operation.ty),
+            source_ref_index=operation.source_ref.to_index(),
+        )
+
+    # pylint: disable=too-many-return-statements,too-many-branches
+    def operation(self, operation: ASTOperation) -> operations_pb.Operation:
+        """Convert an AST operation into a protobuf operation."""
+        variant = operations_pb.OperationVariant
+        if isinstance(operation, BinaryASTOperation):
+            if operation.name not in BINARY_OPERATIONS:
+                raise CompilerException(
+                    f"Operation {operation.name} is not supported in protobuf MIR"
+                )
+            return operations_pb.Operation(
+                id=BINARY_OPERATIONS[operation.name],
+                binary=operations_pb.BinaryOperation(
+                    op=self.descriptor(operation),
+                    left=operation.left,
+                    right=operation.right,
+                ),
+            )
+        if isinstance(operation, UnaryASTOperation):
+            if operation.name not in UNARY_OPERATIONS:
+                raise CompilerException(
+                    f"Operation {operation.name} is not supported in protobuf MIR"
+                )
+            return operations_pb.Operation(
+                id=UNARY_OPERATIONS[operation.name],
+                unary=operations_pb.UnaryOperation(
+                    op=self.descriptor(operation), this=operation.child
+                ),
+            )
+        if isinstance(operation, CastASTOperation):
+            return operations_pb.Operation(
+                id=variant.CAST,
+                unary=operations_pb.UnaryOperation(
+                    op=self.descriptor(operation), this=operation.target
+                ),
+            )
+        if isinstance(operation, IfElseASTOperation):
+            return operations_pb.Operation(
+                id=variant.IF_ELSE,
+                ifelse=operations_pb.IfElseOperation(
+                    op=self.descriptor(operation),
+                    cond=operation.condition,
+                    first=operation.true_branch_child,
+                    second=operation.false_branch_child,
+                ),
+            )
+        if isinstance(operation, RandomASTOperation):
+            return operations_pb.Operation(
+                id=variant.RANDOM,
+                random=operations_pb.RandomOperation(op=self.descriptor(operation)),
+            )
+        if isinstance(operation, InputASTOperation):
+            reference = operations_pb.InputReference(op=self.descriptor(operation))
+            self.input_references.append(
+                (reference, (operation.party.name, operation.name))
+            )
+            return operations_pb.Operation(id=variant.INPUT_REF, input=reference)
+        if isinstance(operation, LiteralASTOperation):
+            reference = operations_pb.InputReference(op=self.descriptor(operation))
+            self.literal_references.append((reference, operation.literal_index))
+            return operations_pb.Operation(id=variant.LITERAL_REF, input=reference)
+        if isinstance(operation, NadaFunctionArgASTOperation):
+            function = AST_OPERATIONS[operation.fn]
+            return operations_pb.Operation(
+                id=variant.NADA_FN_ARG_REF,
+                arg=operations_pb.NadaFunctionArgRef(
+                    arg=operations_pb.InputReference(
+                        op=self.descriptor(operation),
+                        refers_to=function.args.index(operation.id),
+                    ),
+                    function_id=operation.fn,
+                ),
+            )
+        if isinstance(operation, MapASTOperation):
+            return operations_pb.Operation(
+                id=variant.MAP,
+                map=operations_pb.MapOperation(
+                    op=self.descriptor(operation),
+                    fn=operation.fn,
+                    inner=operation.child,
+                ),
+            )
+        if isinstance(operation, ReduceASTOperation):
+            return operations_pb.Operation(
+                id=variant.REDUCE,
+                reduce=operations_pb.ReduceOperation(
+                    op=self.descriptor(operation),
+                    fn=operation.fn,
+                    inner=operation.child,
+                    initial=operation.initial,
+                ),
+            )
+        if isinstance(operation, NewASTOperation):
+            return operations_pb.Operation(
+                id=variant.NEW,
+                new=operations_pb.NewOperation(
+                    op=self.descriptor(operation), elements=list(operation.elements)
+                ),
+            )
+        if isinstance(operation, ArrayAccessorASTOperation):
+            return operations_pb.Operation(
+                id=variant.ARRAY_ACC,
+                array_accessor=operations_pb.ArrayAccessor(
+                    op=self.descriptor(operation),
+                    index=operation.index,
+                    source=operation.source,
+                ),
+            )
+        if isinstance(operation, NadaFunctionCallASTOperation):
+            return operations_pb.Operation(
+                id=variant.NADA_FN_CALL,
+                call=operations_pb.NadaFunctionCall(
+                    op=self.descriptor(operation),
+                    function_id=operation.fn,
+                    args=list(operation.args),
+                ),
+            )
+        raise CompilerException(
+            f"Operation {type(operation).__name__} is not supported in protobuf MIR"
+        )
+
+    def resolve_references(
+        self, inputs: List[Dict[str, Any]], literals: List[Dict[str, Any]]
+    ):
+        """Point the input and literal references to the index of the input or
+        literal in the program."""
+        input_indexes = {
+            (program_input["party"], program_input["name"]): index
+            for index, program_input in enumerate(inputs)
+        }
+        for reference, key in self.input_references:
+            reference.refers_to = input_indexes[key]
+        literal_indexes = {
+            literal["name"]: index for index, literal in enumerate(literals)
+        }
+        for reference, name in self.literal_references:
+            reference.refers_to = literal_indexes[name]
+
+
+def _function_to_proto(
+    function: Dict[str, Any], nada_type: Callable[[NadaTypeRepr], types_pb.NadaType]
+) -> mir_pb.NadaFunction:
+    """Convert a function, in MIR format with protobuf operations, into a protobuf
+    function."""
+    return mir_pb.NadaFunction(
+        id=function["id"],
+        args=[
+            mir_pb.NadaFunctionArg(
+                name=arg["name"],
+                type=nada_type(arg["type"]),
+                source_ref_index=arg["source_ref_index"],
+            )
+            for arg in function["args"]
+        ],
+        name=function["function"],
+        operations=list(function["operations"].values()),
+        return_operation_id=function["return_operation_id"],
+        return_type=nada_type(function["return_type"]),
+        source_ref_index=function["source_ref_index"],
+    )
+
+
+def nada_dsl_to_proto_mir(outputs: List[Output]) -> mir_pb.ProgramMir:
+    """Convert Nada DSL to the protobuf Nada MIR.
+
+    The source references are indexed in the same order as in the JSON MIR.
+    """
+    emitter = ProtoEmitter()
+    operations: Dict[int, operations_pb.Operation] = {}
+    new_outputs = process_outputs(outputs, operations, emitter.operation)
+    functions = [
+        _function_to_proto(function, emitter.nada_type)
+        for function in iter_mir_functions(FUNCTIONS, emitter.operation)
+    ]
+    parties = to_party_list(PARTIES)
+    inputs = to_input_list(INPUTS)
+    literals = to_literal_list(LITERALS)
+    emitter.resolve_references(inputs, literals)
+    party_indexes = {party["name"]: index for index, party in enumerate(parties)}
+    return mir_pb.ProgramMir(
+        functions=functions,
+        parties=[
+            mir_pb.Party(
+                id=index,
+                name=party["name"],
+                source_ref_index=party["source_ref_index"],
+            )
+            for index, party in enumerate(parties)
+        ],
+        inputs=[
+            mir_pb.Input(
+                id=index,
+                type=emitter.nada_type(program_input["type"]),
+                party_id=party_indexes[program_input["party"]],
+                name=program_input["name"],
+                doc=program_input["doc"],
+                source_ref_index=program_input["source_ref_index"],
+            )
+            for index, program_input in enumerate(inputs)
+        ],
+        literals=[
+            mir_pb.Literal(
+                id=index,
+                name=literal["name"],
+                value=literal["value"],
+                type=emitter.nada_type(literal["type"]),
+            )
+            for index, literal in enumerate(literals)
+        ],
+        outputs=[
+            mir_pb.Output(
+                name=output["name"],
+                operation_id=output["operation_id"],
+                party=output["party"],
+                type=emitter.nada_type(output["type"]),
+                source_ref_index=output["source_ref_index"],
+            )
+            for output in new_outputs
+        ],
+        operations=list(operations.values()),
+        source_files=dict(SourceRef.get_sources()),
+        source_refs=[mir_pb.SourceRef(**ref) for ref in SourceRef.get_refs()],
+    )
+
+
+def nada_compile_proto(outputs: List[Output]) -> bytes:
+    """Compile Nada to the binary protobuf MIR."""
+    return bytes(nada_dsl_to_proto_mir(outputs))
@@ -3,6 +3,7 @@
 from dataclasses import dataclass
 from enum import Enum
 from typing import Dict, TypeAlias, Union, Type
+from nada_dsl.profiler import profiler
 from nada_dsl.source_ref import SourceRef
 
 
@@ -15,6 +16,8 @@ class Party:
         name (str): The name of the party.
     """
 
+    __slots__ = ("name", "source_ref")
+
     name: str
     source_ref: SourceRef
 
@@ -134,6 +137,8 @@ class NadaType:
 
     """
 
+    __slots__ = ("child",)
+
     child: OperationType
 
     def __init__(self, child: OperationType):
@@ -144,7 +149,10 @@ class NadaType:
         """
         self.child = child
         if self.child is not None:
-            self.child.store_in_ast(self.to_mir())
+            if profiler.enabled:
+                profiler.store(self)
+            else:
+                self.child.store_in_ast(self.to_mir())
 
     def to_mir(self):
         """Default implementation for the Conversion of a type into MIR representation."""
@@ -1,23 +1,32 @@
 """Nada Collection type definitions."""
 
+# pylint: disable=too-many-lines
+
+from array import array as PackedArray
 import copy
 from dataclasses import dataclass
 import inspect
-from typing import Any, Dict, Generic, List
+import operator
+from typing import Any, Dict, Generic, Iterable, List
 import typing
 from typing import TypeVar
 
 from nada_dsl.ast_util import (
     AST_OPERATIONS,
+    ArrayAccessorASTOperation,
     BinaryASTOperation,
+    InputASTOperation,
+    LiteralASTOperation,
+    LiteralBlockASTOperation,
     MapASTOperation,
     NTupleAccessorASTOperation,
     NewASTOperation,
     ObjectAccessorASTOperation,
     ReduceASTOperation,
     UnaryASTOperation,
+    store_literal,
 )
-from nada_dsl.nada_types import NadaType
+from nada_dsl.nada_types import NadaType, Party
 
 # Wildcard import due to non-zero types
 from nada_dsl.nada_types.scalar_types import *  # pylint: disable=W0614:wildcard-import
@@ -27,7 +36,8 @@ from nada_dsl.errors import (
     InvalidTypeError,
     NotAllowedException,
 )
-from nada_dsl.nada_types.function import NadaFunction, nada_fn
+from nada_dsl.nada_types.function import NadaFunction, NadaFunctionCall, nada_fn
+from nada_dsl.profiler import profiler
 from nada_dsl.nada_types.generics import U, T, R
 from . import AllTypes, AllTypesType, NadaTypeRepr, OperationType
 
@@ -50,6 +60,8 @@ def is_primitive_integer(nada_type_str: str):
 class Collection(NadaType):
     """Superclass of collection types"""
 
+    __slots__ = ()
+
     left_type: AllTypesType
     right_type: AllTypesType
     contained_type: AllTypesType
@@ -114,6 +126,18 @@ class Collection(NadaType):
             f"{self.__class__.__name__} is not a valid Nada Collection"
         )
 
+    def shape(self) -> typing.Tuple[int, ...]:
+        """Returns the sizes of the dimensions of a (nested) array, from the
+        outermost one."""
+        if not isinstance(self, Array):
+            raise InvalidTypeError(f"{self.__class__.__name__} has no shape")
+        shape = []
+        collection: Any = self
+        while isinstance(collection, (Array, ArrayType)):
+            shape.append(collection.size)  # pylint: disable=E1101
+            collection = collection.contained_type
+        return tuple(shape)
+
     def retrieve_inner_type(self):
         """Retrieves the child type of this collection"""
         if isinstance(self.contained_type, TypeVar):
@@ -126,6 +150,8 @@ class Collection(NadaType):
 class Map(Generic[T, R]):
     """The Map operation"""
 
+    __slots__ = ("id", "child", "fn", "source_ref")
+
     child: OperationType
     fn: NadaFunction[T, R]
     source_ref: SourceRef
@@ -156,6 +182,8 @@ class Map(Generic[T, R]):
 class Reduce(Generic[T, R]):
     """The Nada Reduce operation."""
 
+    __slots__ = ("id", "child", "fn", "initial", "source_ref")
+
     child: OperationType
     fn: NadaFunction[T, R]
     initial: R
@@ -206,6 +234,8 @@ class TupleType:
 class Tuple(Generic[T, U], Collection):
     """The Tuple type"""
 
+    __slots__ = ("left_type", "right_type")
+
     left_type: T
     right_type: U
 
@@ -262,6 +292,8 @@ def _generate_accessor(value: Any, accessor: Any) -> NadaType:
 class NTuple(Collection):
     """The NTuple type"""
 
+    __slots__ = ("values",)
+
     values: List[NadaType]
 
     def __init__(self, child, values: List[NadaType]):
@@ -297,6 +329,8 @@ class NTuple(Collection):
 class NTupleAccessor:
     """Accessor for NTuple"""
 
+    __slots__ = ("id", "child", "index", "source_ref")
+
     child: NTuple
     index: int
     source_ref: SourceRef
@@ -326,6 +360,8 @@ class NTupleAccessor:
 class Object(Collection):
     """The Object type"""
 
+    __slots__ = ("values",)
+
     values: Dict[str, NadaType]
 
     def __init__(self, child, values: Dict[str, NadaType]):
@@ -363,6 +399,8 @@ class Object(Collection):
 class ObjectAccessor:
     """Accessor for Object"""
 
+    __slots__ = ("id", "child", "key", "source_ref")
+
     child: Object
     key: str
     source_ref: SourceRef
@@ -393,14 +431,14 @@ class ObjectAccessor:
 # TODO: remove this
 def get_inner_type(inner_type):
     """Utility that returns the inner type for a composite type."""
-    inner_type = copy.copy(inner_type)
-    setattr(inner_type, "inner", None)
-    return inner_type
+    return copy.copy(inner_type)
 
 
 class Zip:
     """The Zip operation."""
 
+    __slots__ = ("id", "left", "right", "source_ref")
+
     def __init__(self, left: AllTypes, right: AllTypes, source_ref: SourceRef):
         self.id = next_operation_id()
         self.left = left
@@ -422,6 +460,8 @@ class Zip:
 class Unzip:
     """The Unzip operation."""
 
+    __slots__ = ("id", "child", "source_ref")
+
     def __init__(self, child: AllTypes, source_ref: SourceRef):
         self.id = next_operation_id()
         self.child = child
@@ -441,6 +481,8 @@ class Unzip:
 class InnerProduct:
     """Inner product of two arrays."""
 
+    __slots__ = ("id", "left", "right", "source_ref")
+
     def __init__(self, left: AllTypes, right: AllTypes, source_ref: SourceRef):
         self.id = next_operation_id()
         self.left = left
@@ -459,6 +501,291 @@ class InnerProduct:
         )
 
 
+class ArrayAccessor:
+    """Accessor for an element of an Array."""
+
+    __slots__ = ("id", "child", "index", "source_ref")
+
+    def __init__(self, child: "Array", index: int, source_ref: SourceRef):
+        self.id = next_operation_id()
+        self.child = child
+        self.index = index
+        self.source_ref = source_ref
+
+    def store_in_ast(self, ty: object):
+        """Store this accessor in the AST."""
+        AST_OPERATIONS[self.id] = ArrayAccessorASTOperation(
+            id=self.id,
+            index=self.index,
+            source=self.child.child.id,
+            source_ref=self.source_ref,
+            ty=ty,
+        )
+
+
+class MatrixProduct:
+    """Matrix product of a matrix with a vector or a matrix, or of a vector with a
+    matrix."""
+
+    __slots__ = ("id", "left", "right", "source_ref")
+
+    def __init__(self, left: AllTypes, right: AllTypes, source_ref: SourceRef):
+        self.id = next_operation_id()
+        self.left = left
+        self.right = right
+        self.source_ref = source_ref
+
+    def store_in_ast(self, ty: NadaTypeRepr):
+        """Store the MatrixProduct object in the AST."""
+        AST_OPERATIONS[self.id] = BinaryASTOperation(
+            id=self.id,
+            name="MatrixProduct",
+            left=self.left.child.id,
+            right=self.right.child.id,
+            source_ref=self.source_ref,
+            ty=ty,
+        )
+
+
+class ElementwiseAddition(Addition):
+    """Elementwise addition (+) of arrays, or of an array and a scalar."""
+
+    __slots__ = ()
+
+
+class ElementwiseSubtraction(Subtraction):
+    """Elementwise subtraction (-) of arrays, or of an array and a scalar."""
+
+    __slots__ = ()
+
+
+class ElementwiseMultiplication(Multiplication):
+    """Elementwise multiplication (*) of arrays, or of an array and a scalar."""
+
+    __slots__ = ()
+
+
+class ElementwiseLessThan(LessThan):
+    """Elementwise less than (<) comparison of arrays, or of an array and a
+    scalar."""
+
+    __slots__ = ()
+
+
+class ElementwiseGreaterThan(GreaterThan):
+    """Elementwise greater than (>) comparison of arrays, or of an array and a
+    scalar."""
+
+    __slots__ = ()
+
+
+class ElementwiseLessOrEqualThan(LessOrEqualThan):
+    """Elementwise less or equal than (<=) comparison of arrays, or of an array and a
+    scalar."""
+
+    __slots__ = ()
+
+
+class ElementwiseGreaterOrEqualThan(GreaterOrEqualThan):
+    """Elementwise greater or equal than (>=) comparison of arrays, or of an array and a
+    scalar."""
+
+    __slots__ = ()
+
+
+class ElementwiseEquals(Equals):
+    """Elementwise equality (==) comparison of arrays, or of an array and a
+    scalar."""
+
+    __slots__ = ()
+
+
+class ElementwiseNotEquals(NotEquals):
+    """Elementwise inequality (!=) comparison of arrays, or of an array and a
+    scalar."""
+
+    __slots__ = ()
+
+
+def _scalar_type(contained_type: Any) -> type:
+    """Returns the scalar class of the elements of an array, given its contained
+    type."""
+    if not inspect.isclass(contained_type):
+        contained_type = type(contained_type)
+    if issubclass(contained_type, ScalarType):
+        return contained_type
+    raise InvalidTypeError(
+        f"Expected an array of scalar types, found elements of type "
+        f"{contained_type.__name__}"
+    )
+
+
+def _public_type(scalar_type: type) -> type:
+    """Returns the public type of a literal scalar type, and any other scalar
+    type unchanged.
+
+    Values computed from literals by array operations are not folded, so they
+    are public."""
+    return new_scalar_type(
+        Mode(max(scalar_type.mode.value, Mode.PUBLIC.value)), scalar_type.base_type
+    )
+
+
+def _element_type(value: Any) -> type:
+    """Returns the scalar type of the elements of an array, or the type of a
+    scalar operand of an elementwise operation."""
+    if isinstance(value, Array):
+        return _scalar_type(value.contained_type)
+    if isinstance(value, ScalarType):
+        return type(value)
+    raise InvalidTypeError(f"Invalid elementwise operand: {value}")
+
+
+def _elementwise_operation(
+    operation, symbol: str, left: Any, right: Any, result_type, source_ref
+) -> "Array":
+    """Applies a binary operation to every element of an array.
+
+    At least one of the operands is an array. The other one is either an array
+    of the same size or a scalar, which is combined with every element. The
+    whole operation is stored as a single elementwise operation with an array
+    type, and its element type follows the typing rules of the scalar operation.
+
+    Arguments
+    ---------
+    operation:
+        The elementwise operation class (ElementwiseAddition...)
+    symbol: str
+        The operator symbol, for error messages
+    left:
+        The left array or scalar operand
+    right:
+        The right array or scalar operand
+    result_type:
+        Function returning the mode and base type of the result of the scalar
+        operation (`binary_arithmetic_type`, `binary_relational_type`,
+        `equals_type`)
+    source_ref: SourceRef
+        The source reference of the operation
+    """
+    sizes = {operand.size for operand in (left, right) if isinstance(operand, Array)}
+    if len(sizes) > 1:
+        raise IncompatibleTypesError(
+            f"Cannot apply {symbol} to arrays of different size"
+        )
+    mode, base_type = result_type(symbol, _element_type(left), _element_type(right))
+    # Elementwise operations are not folded, arrays of literals are public
+    mode = Mode(max(mode.value, Mode.PUBLIC.value))
+    return Array(
+        size=sizes.pop(),
+        contained_type=new_scalar_type(mode, base_type),
+        child=operation(left=left, right=right, source_ref=source_ref),
+    )
+
+
+def _tree_reduce(values: List[Any], combine) -> Any:
+    """Combines a list of values pairwise, level by level, into a balanced tree.
+
+    The order of the values is kept, so the result only relies on `combine`
+    being associative.
+    """
+    while len(values) > 1:
+        combined = [
+            combine(left, right) for left, right in zip(values[::2], values[1::2])
+        ]
+        if len(values) % 2:
+            combined.append(values[-1])
+        values = combined
+    return values[0]
+
+
+def _tree_reduction(
+    array: "Array", operation, accepts, source_ref: SourceRef
+) -> AllTypes:
+    """Reduces the elements of an array of scalars with a binary operation,
+    applied as a balanced tree.
+
+    Arguments
+    ---------
+    array: Array
+        The reduced array
+    operation:
+        The associative binary operation class (Addition, BooleanAnd...)
+    accepts:
+        Function returning true if the operation accepts a base type
+    source_ref: SourceRef
+        The source reference of the reduction
+    """
+    element_type = _scalar_type(array.contained_type)
+    if not accepts(element_type.base_type):
+        raise TypeError(
+            f"Invalid operation: {operation.__name__} reduction of an array of "
+            f"{element_type.__name__}"
+        )
+    result_type = _public_type(element_type)
+    return _tree_reduce(
+        array._elements(source_ref),  # pylint: disable=protected-access
+        lambda left, right: result_type(
+            child=operation(left=left, right=right, source_ref=source_ref)
+        ),
+    )
+
+
+def _matrix_product(left: "Array", right: "Array", source_ref: SourceRef) -> AllTypes:
+    """Product of two vectors or matrices, with the semantics of `numpy.matmul`.
+
+    The product of two vectors is their inner product. Otherwise, the last
+    dimension of the left operand is contracted with the first dimension of
+    the right operand, and the whole product is stored as a single
+    MatrixProduct operation.
+
+    Arguments
+    ---------
+    left: Array
+        A vector or a matrix (array of arrays)
+    right: Array
+        A vector or a matrix (array of arrays)
+    source_ref: SourceRef
+        The source reference of the operation
+    """
+    if not isinstance(right, Array):
+        raise InvalidTypeError("Matrix products are only implemented between arrays")
+    left_shape = left.shape()
+    right_shape = right.shape()
+    if not (0 < len(left_shape) <= 2 and 0 < len(right_shape) <= 2):
+        raise InvalidTypeError(
+            "Matrix products are only implemented for vectors and matrices"
+        )
+    if left_shape[-1] != right_shape[0]:
+        raise IncompatibleTypesError(
+            f"Cannot multiply arrays of shapes {left_shape} and {right_shape}"
+        )
+
+    left_element = left
+    for _ in left_shape:
+        left_element = left_element.contained_type
+    right_element = right
+    for _ in right_shape:
+        right_element = right_element.contained_type
+    mode, base_type = binary_arithmetic_type(
+        "@", _scalar_type(left_element), _scalar_type(right_element)
+    )
+    element_type = new_scalar_type(Mode(max(mode.value, Mode.PUBLIC.value)), base_type)
+
+    shape = left_shape[:-1] + right_shape[1:]
+    if not shape:
+        return element_type(
+            child=InnerProduct(left=left, right=right, source_ref=source_ref)
+        )  # type: ignore
+    if len(shape) == 2:
+        element_type = Array(child=None, contained_type=element_type, size=shape[1])
+    return Array(
+        size=shape[0],
+        contained_type=element_type,
+        child=MatrixProduct(left=left, right=right, source_ref=source_ref),
+    )
+
+
 @dataclass
 class ArrayType:
     """Marker type for arrays."""
@@ -492,6 +819,8 @@ class Array(Generic[T], Collection):
         The size of the array
     """
 
+    __slots__ = ("contained_type", "size")
+
     contained_type: T
     size: int
 
@@ -506,7 +835,10 @@ class Array(Generic[T], Collection):
             child if contained_type is not None else getattr(child, "child", None)
         )
         if self.child is not None:
-            self.child.store_in_ast(self.to_mir())
+            if profiler.enabled:
+                profiler.store(self)
+            else:
+                self.child.store_in_ast(self.to_mir())
 
     def __iter__(self):
         raise NotAllowedException(
@@ -525,9 +857,29 @@ class Array(Generic[T], Collection):
         )
 
     def reduce(self: "Array[T]", function, initial: R) -> R:
-        """The Reduce operation for arrays."""
+        """The Reduce operation for arrays.
+
+        The reduction of an array of known size with an associative Nada
+        function is lowered to a balanced tree of calls, which has a logarithmic
+        depth, and the result is combined with the initial value. Otherwise, the
+        elements are folded sequentially.
+        """
         if not isinstance(function, NadaFunction):
             function = nada_fn(function)
+        if function.associative and self.size:
+            source_ref = SourceRef.back_frame()
+            element_type = _public_type(_scalar_type(self.contained_type))
+            if element_type is not function.return_type:
+                raise InvalidTypeError(
+                    "Associative functions must return the type of the array elements"
+                )
+
+            def call(left, right):
+                return function.return_type(
+                    child=NadaFunctionCall(function, [left, right], source_ref)
+                )
+
+            return call(initial, _tree_reduce(self._elements(source_ref), call))
         return function.return_type(
             Reduce(
                 child=self,
@@ -537,6 +889,57 @@ class Array(Generic[T], Collection):
             )
         )
 
+    def sum(self: "Array[T]") -> T:
+        """Sum of the elements of the array, computed by a balanced tree of
+        additions."""
+        return _tree_reduction(
+            self, Addition, BaseType.is_numeric, SourceRef.back_frame()
+        )
+
+    def product(self: "Array[T]") -> T:
+        """Product of the elements of the array, computed by a balanced tree of
+        multiplications, with a logarithmic depth."""
+        return _tree_reduction(
+            self, Multiplication, BaseType.is_numeric, SourceRef.back_frame()
+        )
+
+    def all(self: "Array[T]") -> T:
+        """True if all the elements of a boolean array are true, computed by a
+        balanced tree of conjunctions."""
+        return _tree_reduction(
+            self,
+            BooleanAnd,
+            lambda base_type: base_type == BaseType.BOOLEAN,
+            SourceRef.back_frame(),
+        )
+
+    def any(self: "Array[T]") -> T:
+        """True if any element of a boolean array is true, computed by a balanced
+        tree of disjunctions."""
+        return _tree_reduction(
+            self,
+            BooleanOr,
+            lambda base_type: base_type == BaseType.BOOLEAN,
+            SourceRef.back_frame(),
+        )
+
+    def _elements(self, source_ref: SourceRef) -> List[AllTypes]:
+        """Returns an accessor to every element of an array of scalars.
+
+        The elements of arrays of literals are accessed at runtime, so they are
+        public values."""
+        if not self.size:
+            raise NotAllowedException(
+                "Tree reductions are only implemented for arrays of known size"
+            )
+        element_type = _public_type(_scalar_type(self.contained_type))
+        return [
+            element_type(
+                child=ArrayAccessor(child=self, index=index, source_ref=source_ref)
+            )
+            for index in range(self.size)
+        ]
+
     def zip(self: "Array[T]", other: "Array[U]") -> "Array[Tuple[T, U]]":
         """The Zip operation for Arrays."""
         if self.size != other.size:
@@ -576,6 +979,161 @@ class Array(Generic[T], Collection):
             "Inner product is only implemented for arrays of integer types"
         )
 
+    def matmul(self: "Array[T]", other: "Array[T]") -> AllTypes:
+        """Matrix product with a vector or a matrix, with the semantics of
+        `numpy.matmul`: the product of two vectors is their inner product, the
+        product of a matrix and a vector is a vector and the product of two
+        matrices is a matrix."""
+        return _matrix_product(self, other, SourceRef.back_frame())
+
+    def dot(self: "Array[T]", other: "Array[T]") -> AllTypes:
+        """Dot product of vectors and matrices, same as `matmul`."""
+        return _matrix_product(self, other, SourceRef.back_frame())
+
+    def __matmul__(self, other) -> AllTypes:
+        """Matrix product with the `@` operator, same as `matmul`."""
+        return _matrix_product(self, other, SourceRef.back_frame())
+
+    def __add__(self, other) -> "Array":
+        """Elementwise addition with an array of the same size or a scalar."""
+        return _elementwise_operation(
+            ElementwiseAddition,
+            "+",
+            self,
+            other,
+            binary_arithmetic_type,
+            SourceRef.back_frame(),
+        )
+
+    def __radd__(self, other) -> "Array":
+        """Elementwise addition of a scalar on the left."""
+        return _elementwise_operation(
+            ElementwiseAddition,
+            "+",
+            other,
+            self,
+            binary_arithmetic_type,
+            SourceRef.back_frame(),
+        )
+
+    def __sub__(self, other) -> "Array":
+        """Elementwise subtraction of an array of the same size or a scalar."""
+        return _elementwise_operation(
+            ElementwiseSubtraction,
+            "-",
+            self,
+            other,
+            binary_arithmetic_type,
+            SourceRef.back_frame(),
+        )
+
+    def __rsub__(self, other) -> "Array":
+        """Elementwise subtraction of the array from a scalar on the left."""
+        return _elementwise_operation(
+            ElementwiseSubtraction,
+            "-",
+            other,
+            self,
+            binary_arithmetic_type,
+            SourceRef.back_frame(),
+        )
+
+    def __mul__(self, other) -> "Array":
+        """Elementwise multiplication with an array of the same size or a
+        scalar."""
+        return _elementwise_operation(
+            ElementwiseMultiplication,
+            "*",
+            self,
+            other,
+            binary_arithmetic_type,
+            SourceRef.back_frame(),
+        )
+
+    def __rmul__(self, other) -> "Array":
+        """Elementwise multiplication with a scalar on the left."""
+        return _elementwise_operation(
+            ElementwiseMultiplication,
+            "*",
+            other,
+            self,
+            binary_arithmetic_type,
+            SourceRef.back_frame(),
+        )
+
+    def __lt__(self, other) -> "Array":
+        """Elementwise < comparison with an array of the same size or a scalar."""
+        return _elementwise_operation(
+            ElementwiseLessThan,
+            "<",
+            self,
+            other,
+            binary_relational_type,
+            SourceRef.back_frame(),
+        )
+
+    def __gt__(self, other) -> "Array":
+        """Elementwise > comparison with an array of the same size or a scalar."""
+        return _elementwise_operation(
+            ElementwiseGreaterThan,
+            ">",
+            self,
+            other,
+            binary_relational_type,
+            SourceRef.back_frame(),
+        )
+
+    def __le__(self, other) -> "Array":
+        """Elementwise <= comparison with an array of the same size or a scalar."""
+        return _elementwise_operation(
+            ElementwiseLessOrEqualThan,
+            "<=",
+            self,
+            other,
+            binary_relational_type,
+            SourceRef.back_frame(),
+        )
+
+    def __ge__(self, other) -> "Array":
+        """Elementwise >= comparison with an array of the same size or a scalar."""
+        return _elementwise_operation(
+            ElementwiseGreaterOrEqualThan,
+            ">=",
+            self,
+            other,
+            binary_relational_type,
+            SourceRef.back_frame(),
+        )
+
+    def __eq__(self, other) -> "Array":  # type: ignore
+        """Elementwise == comparison with an array of the same size or a scalar."""
+        if not isinstance(other, (Array, ScalarType)):
+            return NotImplemented
+        return _elementwise_operation(
+            ElementwiseEquals,
+            "==",
+            self,
+            other,
+            equals_type,
+            SourceRef.back_frame(),
+        )
+
+    def __ne__(self, other) -> "Array":  # type: ignore
+        """Elementwise != comparison with an array of the same size or a scalar."""
+        if not isinstance(other, (Array, ScalarType)):
+            return NotImplemented
+        return _elementwise_operation(
+            ElementwiseNotEquals,
+            "!=",
+            self,
+            other,
+            equals_type,
+            SourceRef.back_frame(),
+        )
+
+    # `==` builds an elementwise operation, arrays are still hashed by identity
+    __hash__ = object.__hash__
+
     @classmethod
     def new(cls, *args) -> "Array[T]":
         """Constructs a new Array."""
@@ -595,6 +1153,126 @@ class Array(Generic[T], Collection):
             ),
         )
 
+    @classmethod
+    def from_literals(cls, values: Iterable, element_type: type = Integer) -> "Array":
+        """Constructs a new Array of literals from a sequence of Python values or
+        a NumPy array.
+
+        No Nada value is created for the elements: the array is stored as a
+        single New operation that refers to one literal operation per distinct
+        value.
+
+        Arguments
+        ---------
+        values:
+            The values of the elements, integers for `Integer` and
+            `UnsignedInteger` elements or booleans for `Boolean` elements
+        element_type: type
+            The literal type of the elements, `Integer` by default
+        """
+        if element_type not in (Integer, UnsignedInteger, Boolean):
+            raise InvalidTypeError(
+                f"Expected a literal element type, found {element_type.__name__}"
+            )
+        if hasattr(values, "tolist"):
+            # NumPy arrays, converted to Python values at once
+            values = values.tolist()
+        if element_type is Boolean:
+            values = list(map(bool, values))
+        else:
+            # operator.index rejects floats instead of truncating them
+            values = list(map(operator.index, values))
+            if element_type is UnsignedInteger and values and min(values) < 0:
+                raise ValueError("Unsigned integer literals cannot be negative")
+        if not values:
+            raise ValueError("At least one value is required")
+        return Array(
+            contained_type=element_type,
+            size=len(values),
+            child=LiteralArrayNew(values=values, source_ref=SourceRef.back_frame()),
+        )
+
+    @classmethod
+    def literal_block(
+        cls, values: Iterable[int], element_type: type = Integer
+    ) -> "Array":
+        """Constructs a new Array of integer literals stored as a single literal
+        block.
+
+        The values are kept in a packed `array.array` of 64-bit integers, and
+        are written in the MIR as a single literal of array type, encoded in
+        base64 (see `pack_literal_block`). This is meant for large constant
+        tables, like lookup tables or model weights.
+
+        Arguments
+        ---------
+        values:
+            The values of the elements, as a sequence, a NumPy array or an
+            `array.array`
+        element_type: type
+            `Integer` for signed 64-bit values, `UnsignedInteger` for unsigned
+            64-bit values
+        """
+        typecodes = {Integer: "q", UnsignedInteger: "Q"}
+        if element_type not in typecodes:
+            raise InvalidTypeError(
+                f"Expected an integer literal element type, found {element_type}"
+            )
+        if hasattr(values, "tolist") and not isinstance(values, PackedArray):
+            # NumPy arrays, converted to Python values at once
+            values = values.tolist()
+        block = PackedArray(typecodes[element_type], values)
+        if not block:
+            raise ValueError("At least one value is required")
+        return Array(
+            contained_type=element_type,
+            size=len(block),
+            child=LiteralBlock(values=block, source_ref=SourceRef.back_frame()),
+        )
+
+    @classmethod
+    def from_inputs(
+        cls, element_type: type, party: Party, prefix: str, size: int, start: int = 0
+    ) -> "Array":
+        """Constructs a new Array of the inputs `{prefix}{start}` to
+        `{prefix}{start + size - 1}` of a party.
+
+        No Nada value is created for the elements: the array is stored as a
+        single New operation that refers to the input operations.
+
+        Arguments
+        ---------
+        element_type: type
+            The type of the inputs, like `SecretInteger`
+        party: Party
+            The party providing the inputs
+        prefix: str
+            The prefix of the name of the inputs
+        size: int
+            The number of inputs
+        start: int
+            The number appended to the prefix for the first input
+        """
+        if not (
+            inspect.isclass(element_type)
+            and issubclass(element_type, ScalarType)
+            and element_type.mode != Mode.CONSTANT
+        ):
+            raise InvalidTypeError(
+                f"Expected a public or secret scalar element type, found {element_type}"
+            )
+        if size <= 0:
+            raise ValueError("At least one value is required")
+        return Array(
+            contained_type=element_type,
+            size=size,
+            child=InputArrayNew(
+                names=[f"{prefix}{index}" for index in range(start, start + size)],
+                party=party,
+                source_ref=SourceRef.back_frame(),
+            ),
+        )
+
     @classmethod
     def init_as_template_type(cls, contained_type) -> "Array[T]":
         """Construct an empty template array with the given child type."""
@@ -607,6 +1285,8 @@ class TupleNew(Generic[T, U]):
     Represents the creation of a new Tuple.
     """
 
+    __slots__ = ("id", "child", "source_ref")
+
     child: typing.Tuple[T, U]
     source_ref: SourceRef
 
@@ -632,6 +1312,8 @@ class NTupleNew:
     Represents the creation of a new Tuple.
     """
 
+    __slots__ = ("id", "child", "source_ref")
+
     child: List[NadaType]
     source_ref: SourceRef
 
@@ -657,6 +1339,8 @@ class ObjectNew:
     Represents the creation of a new Object.
     """
 
+    __slots__ = ("id", "child", "source_ref")
+
     child: Dict[str, NadaType]
     source_ref: SourceRef
 
@@ -695,6 +1379,8 @@ def unzip(array: Array[Tuple[T, R]]) -> Tuple[Array[T], Array[R]]:
 class ArrayNew(Generic[T]):
     """MIR Array new operation"""
 
+    __slots__ = ("id", "child", "source_ref")
+
     child: List[T]
     source_ref: SourceRef
 
@@ -712,3 +1398,118 @@ class ArrayNew(Generic[T]):
             source_ref=self.source_ref,
             ty=ty,
         )
+
+
+class LiteralArrayNew:
+    """MIR Array new operation of literal elements.
+
+    The elements are kept as Python values, and their literal operations are
+    only created when the array is stored in the AST.
+    """
+
+    __slots__ = ("id", "values", "source_ref")
+
+    values: List[Any]
+    source_ref: SourceRef
+
+    def __init__(self, values: List[Any], source_ref: SourceRef):
+        self.id = next_operation_id()
+        self.values = values
+        self.source_ref = source_ref
+
+    def store_in_ast(self, ty: NadaTypeRepr):
+        """Store this LiteralArrayNew object and its literals in the AST."""
+        element_ty = ty["Array"]["inner_type"]  # type: ignore
+        # Equal values share the same literal operation
+        literal_ids: Dict[Any, int] = {}
+        elements = []
+        for value in self.values:
+            literal_id = literal_ids.get(value)
+            if literal_id is None:
+                literal_id = literal_ids[value] = store_literal(
+                    LiteralASTOperation(
+                        operation_id=next_operation_id(),
+                        name="Literal",
+                        ty=element_ty,
+                        value=value,
+                        source_ref=self.source_ref,
+                    )
+                )
+            elements.append(literal_id)
+        AST_OPERATIONS[self.id] = NewASTOperation(
+            id=self.id,
+            name=self.__class__.__name__,
+            elements=elements,
+            source_ref=self.source_ref,
+            ty=ty,
+        )
+
+
+class InputArrayNew:
+    """MIR Array new operation of input elements.
+
+    The elements are kept as input names, and their input operations are only
+    created when the array is stored in the AST.
+    """
+
+    __slots__ = ("id", "names", "party", "source_ref")
+
+    names: List[str]
+    party: Party
+    source_ref: SourceRef
+
+    def __init__(self, names: List[str], party: Party, source_ref: SourceRef):
+        self.id = next_operation_id()
+        self.names = names
+        self.party = party
+        self.source_ref = source_ref
+
+    def store_in_ast(self, ty: NadaTypeRepr):
+        """Store this InputArrayNew object and its inputs in the AST."""
+        element_ty = ty["Array"]["inner_type"]  # type: ignore
+        elements = []
+        for name in self.names:
+            input_id = next_operation_id()
+            AST_OPERATIONS[input_id] = InputASTOperation(
+                id=input_id,
+                name=name,
+                ty=element_ty,
+                party=self.party,
+                doc="",
+                source_ref=self.source_ref,
+            )
+            elements.append(input_id)
+        AST_OPERATIONS[self.id] = NewASTOperation(
+            id=self.id,
+            name=self.__class__.__name__,
+            elements=elements,
+            source_ref=self.source_ref,
+            ty=ty,
+        )
+
+
+class LiteralBlock:
+    """MIR literal block, an array of integer literals stored as a single
+    literal."""
+
+    __slots__ = ("id", "values", "source_ref")
+
+    values: PackedArray
+    source_ref: SourceRef
+
+    def __init__(self, values: PackedArray, source_ref: SourceRef):
+        self.id = next_operation_id()
+        self.values = values
+        self.source_ref = source_ref
+
+    def store_in_ast(self, ty: NadaTypeRepr):
+        """Store this LiteralBlock object in the AST."""
+        self.id = store_literal(
+            LiteralBlockASTOperation(
+                operation_id=self.id,
+                name=self.__class__.__name__,
+                ty=ty,
+                value=self.values,
+                source_ref=self.source_ref,
+            )
+        )
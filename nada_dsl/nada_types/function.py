@@ -24,6 +24,8 @@ from nada_dsl.errors import NotAllowedException
 class NadaFunctionArg(Generic[T]):
     """Represents a Nada function argument."""
 
+    __slots__ = ("id", "function_id", "name", "type", "source_ref")
+
     function_id: int
     name: str
     type: T
@@ -55,13 +57,28 @@ class NadaFunction(Generic[T, R]):
     in map / reduce operations.
 
     They are decorated using the `@nada_fn` decorator.
+
+    An associative function can be applied in any grouping of its arguments, so
+    reductions with it are lowered to a tree of calls instead of a sequential
+    fold.
     """
 
+    __slots__ = (
+        "id",
+        "args",
+        "function",
+        "return_type",
+        "source_ref",
+        "child",
+        "associative",
+    )
+
     id: int
     args: List[NadaFunctionArg]
     function: Callable[[T], R]
     return_type: R
     source_ref: SourceRef
+    associative: bool
 
     def __init__(
         self,
@@ -71,6 +88,7 @@ class NadaFunction(Generic[T, R]):
         return_type: R,
         source_ref: SourceRef,
         child: NadaType,
+        associative: bool = False,
     ):
         if issubclass(return_type, ScalarType) and return_type.mode == Mode.CONSTANT:
             raise NotAllowedException(
@@ -93,6 +111,7 @@ class NadaFunction(Generic[T, R]):
 
         self.return_type = return_type
         self.source_ref = source_ref
+        self.associative = associative
         self.store_in_ast()
 
     def store_in_ast(self):
@@ -116,6 +135,8 @@ class NadaFunction(Generic[T, R]):
 class NadaFunctionCall(Generic[R]):
     """Represents a call to a Nada Function."""
 
+    __slots__ = ("id", "args", "fn", "source_ref")
+
     fn: NadaFunction
     args: List[NadaType]
     source_ref: SourceRef
@@ -151,7 +172,9 @@ def contained_types(ty):
     return origin_ty(child=None)
 
 
-def nada_fn(fn, args_ty=None, return_ty=None) -> NadaFunction[T, R]:
+def nada_fn(
+    fn=None, args_ty=None, return_ty=None, associative: bool = False
+) -> NadaFunction[T, R]:
     """
     Can be used also for lambdas
     ```python
@@ -160,8 +183,27 @@ def nada_fn(fn, args_ty=None, return_ty=None) -> NadaFunction[T, R]:
             lambda x: x.cast(SecretInteger),
             args_ty={'x': SecretInteger}, return_ty=SecretInteger))
     ```
+
+    Associative functions are declared with `@nada_fn(associative=True)`, their
+    reductions are lowered to a tree of calls (see `Array.reduce`).
     """
+    if fn is None:
+
+        def decorator(fn) -> NadaFunction[T, R]:
+            return _new_nada_function(
+                fn, args_ty, return_ty, associative, SourceRef.back_frame()
+            )
+
+        return decorator  # type: ignore
+    return _new_nada_function(
+        fn, args_ty, return_ty, associative, SourceRef.back_frame()
+    )
+
 
+def _new_nada_function(
+    fn, args_ty, return_ty, associative: bool, source_ref: SourceRef
+) -> NadaFunction[T, R]:
+    """Build a Nada function from a Python function."""
     args = inspect.getfullargspec(fn)
     nada_args = []
     function_id = next_operation_id()
@@ -173,7 +215,7 @@ def nada_fn(fn, args_ty=None, return_ty=None) -> NadaFunction[T, R]:
             function_id,
             name=arg,
             arg_type=arg_type,
-            source_ref=SourceRef.back_frame(),
+            source_ref=source_ref,
         )
         nada_args.append(nada_arg)
 
@@ -193,5 +235,6 @@ def nada_fn(fn, args_ty=None, return_ty=None) -> NadaFunction[T, R]:
         args=nada_args,
         child=child,
         return_type=return_type,
-        source_ref=SourceRef.back_frame(),
+        source_ref=source_ref,
+        associative=associative,
     )
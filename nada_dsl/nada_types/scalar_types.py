@@ -55,12 +55,18 @@ class ScalarType(NadaType):
         - UnsignedInteger, PublicUnsignedInteger, SecretUnsignedInteger
     `ScalarType` provides common operation implementations for all the scalar types
     based on the typing rules of the Nada model.
+
+    The `base_type` and `mode` of a scalar type are class attributes, set by
+    `register_scalar_type`.
     """
 
-    def __init__(self, child: OperationType, base_type: BaseType, mode: Mode):
+    __slots__ = ()
+
+    base_type: BaseType
+    mode: Mode
+
+    def __init__(self, child: OperationType):
         super().__init__(child=child)
-        self.base_type = base_type
-        self.mode = mode
 
     def __eq__(self, other) -> AnyBoolean:  # type: ignore
         return equals_operation(
@@ -81,14 +87,23 @@ class ScalarType(NadaType):
         return True
 
 
+def equals_type(operator, left: ScalarType, right: ScalarType) -> tuple[Mode, BaseType]:
+    """Returns the mode and base type of the result of an equality operation."""
+    if left.base_type != right.base_type:
+        raise TypeError(f"Invalid operation: {left} {operator} {right}")
+    return Mode(max([left.mode.value, right.mode.value])), BaseType.BOOLEAN
+
+
 def equals_operation(
     operation, operator, left: ScalarType, right: ScalarType, f
 ) -> AnyBoolean:
-    """This function is an abstraction for the equality operations"""
-    base_type = left.base_type
-    if base_type != right.base_type:
-        raise TypeError(f"Invalid operation: {left} {operator} {right}")
-    mode = Mode(max([left.mode.value, right.mode.value]))
+    """This function is an abstraction for the equality operations.
+
+    Comparisons with other Nada types, like arrays, are delegated to their
+    reflected operator."""
+    if isinstance(right, NadaType) and not isinstance(right, ScalarType):
+        return NotImplemented
+    mode, _ = equals_type(operator, left, right)
     match mode:
         case Mode.CONSTANT:
             return Boolean(value=bool(f(left.value, right.value)))
@@ -130,6 +145,8 @@ class NumericType(ScalarType):
     on the typing rules of the Nada model.
     """
 
+    __slots__ = ()
+
     value: int
 
     def __add__(self, other):
@@ -212,16 +229,30 @@ class NumericType(ScalarType):
         return self.__add__(other)
 
 
+def binary_arithmetic_type(
+    operator, left: ScalarType, right: ScalarType
+) -> tuple[Mode, BaseType]:
+    """Returns the mode and base type of the result of a binary arithmetic
+    operation.
+
+    Arithmetic operations apply to Numeric types only in Nada. The operands can
+    be scalar values or scalar types."""
+    base_type = left.base_type
+    if base_type != right.base_type or not base_type.is_numeric():
+        raise TypeError(f"Invalid operation: {left} {operator} {right}")
+    return Mode(max([left.mode.value, right.mode.value])), base_type
+
+
 def binary_arithmetic_operation(
     operation, operator, left: ScalarType, right: ScalarType, f
 ) -> ScalarType:
     """This function is an abstraction for the binary arithmetic operations.
 
-    Arithmetic operations apply to Numeric types only in Nada."""
-    base_type = left.base_type
-    if base_type != right.base_type or not base_type.is_numeric():
-        raise TypeError(f"Invalid operation: {left} {operator} {right}")
-    mode = Mode(max([left.mode.value, right.mode.value]))
+    Arithmetic operations apply to Numeric types only in Nada. Operations with
+    other Nada types, like arrays, are delegated to their reflected operator."""
+    if isinstance(right, NadaType) and not isinstance(right, ScalarType):
+        return NotImplemented
+    mode, base_type = binary_arithmetic_type(operator, left, right)
     match mode:
         case Mode.CONSTANT:
             return new_scalar_type(mode, base_type)(f(left.value, right.value))
@@ -254,22 +285,33 @@ def shift_operation(
             return new_scalar_type(mode, base_type)(child)
 
 
+def binary_relational_type(
+    operator, left: ScalarType, right: ScalarType
+) -> tuple[Mode, BaseType]:
+    """Returns the mode and base type of the result of a binary relational
+    operation."""
+    mode, _ = binary_arithmetic_type(operator, left, right)
+    return mode, BaseType.BOOLEAN
+
+
 def binary_relational_operation(
     operation, operator, left: ScalarType, right: ScalarType, f
 ) -> AnyBoolean:
-    """This function is an abstraction for the binary relational operations"""
-    base_type = left.base_type
-    if base_type != right.base_type or not base_type.is_numeric():
-        raise TypeError(f"Invalid operation: {left} {operator} {right}")
-    mode = Mode(max([left.mode.value, right.mode.value]))
+    """This function is an abstraction for the binary relational operations.
+
+    Comparisons with other Nada types, like arrays, are delegated to their
+    reflected operator."""
+    if isinstance(right, NadaType) and not isinstance(right, ScalarType):
+        return NotImplemented
+    mode, base_type = binary_relational_type(operator, left, right)
     match mode:
         case Mode.CONSTANT:
-            return new_scalar_type(mode, BaseType.BOOLEAN)(f(left.value, right.value))  # type: ignore
+            return new_scalar_type(mode, base_type)(f(left.value, right.value))  # type: ignore
         case Mode.PUBLIC | Mode.SECRET:
             child = globals()[operation](
                 left=left, right=right, source_ref=SourceRef.back_frame().back_frame()
             )
-            return new_scalar_type(mode, BaseType.BOOLEAN)(child)  # type: ignore
+            return new_scalar_type(mode, base_type)(child)  # type: ignore
 
 
 def public_equals_operation(left: ScalarType, right: ScalarType) -> "PublicBoolean":
@@ -293,6 +335,8 @@ class BooleanType(ScalarType):
     It provides common operation implementations for all the boolean types, defined above.
     """
 
+    __slots__ = ()
+
     def __and__(self, other):
         return binary_logical_operation(
             "BooleanAnd", "&", self, other, lambda lhs, rhs: lhs & rhs
@@ -354,13 +398,11 @@ class Integer(NumericType):
 
     Represents a constant (literal) integer."""
 
+    __slots__ = ("value",)
+
     def __init__(self, value):
         value = int(value)
-        super().__init__(
-            Literal(value=value, source_ref=SourceRef.back_frame()),
-            BaseType.INTEGER,
-            Mode.CONSTANT,
-        )
+        super().__init__(Literal(value=value, source_ref=SourceRef.back_frame()))
         self.value = value
 
     def __eq__(self, other) -> AnyBoolean:
@@ -378,15 +420,13 @@ class UnsignedInteger(NumericType):
 
     Represents a constant (literal) unsigned integer."""
 
+    __slots__ = ("value",)
+
     value: int
 
     def __init__(self, value):
         value = int(value)
-        super().__init__(
-            Literal(value=value, source_ref=SourceRef.back_frame()),
-            BaseType.UNSIGNED_INTEGER,
-            Mode.CONSTANT,
-        )
+        super().__init__(Literal(value=value, source_ref=SourceRef.back_frame()))
         self.value = value
 
     def __eq__(self, other) -> AnyBoolean:
@@ -403,15 +443,13 @@ class Boolean(BooleanType):
 
     Represents a constant (literal) boolean."""
 
+    __slots__ = ("value",)
+
     value: bool
 
     def __init__(self, value):
         value = bool(value)
-        super().__init__(
-            Literal(value=value, source_ref=SourceRef.back_frame()),
-            BaseType.BOOLEAN,
-            Mode.CONSTANT,
-        )
+        super().__init__(Literal(value=value, source_ref=SourceRef.back_frame()))
         self.value = value
 
     def __bool__(self) -> bool:
@@ -435,8 +473,10 @@ class PublicInteger(NumericType):
     Represents a public unsigned integer in a program. This is a public variable
     evaluated at runtime."""
 
+    __slots__ = ()
+
     def __init__(self, child: NadaType):
-        super().__init__(child, BaseType.INTEGER, Mode.PUBLIC)
+        super().__init__(child)
 
     def __eq__(self, other) -> AnyBoolean:
         return ScalarType.__eq__(self, other)
@@ -455,8 +495,10 @@ class PublicUnsignedInteger(NumericType):
     Represents a public integer in a program. This is a public variable
     evaluated at runtime."""
 
+    __slots__ = ()
+
     def __init__(self, child: NadaType):
-        super().__init__(child, BaseType.UNSIGNED_INTEGER, Mode.PUBLIC)
+        super().__init__(child)
 
     def __eq__(self, other) -> AnyBoolean:
         return ScalarType.__eq__(self, other)
@@ -476,8 +518,10 @@ class PublicBoolean(BooleanType):
     Represents a public boolean in a program. This is a public variable
     evaluated at runtime."""
 
+    __slots__ = ()
+
     def __init__(self, child: NadaType):
-        super().__init__(child, BaseType.BOOLEAN, Mode.PUBLIC)
+        super().__init__(child)
 
     def __eq__(self, other) -> AnyBoolean:
         return ScalarType.__eq__(self, other)
@@ -498,8 +542,10 @@ class PublicBoolean(BooleanType):
 class SecretInteger(NumericType):
     """The Nada secret integer type."""
 
+    __slots__ = ()
+
     def __init__(self, child: NadaType):
-        super().__init__(child, BaseType.INTEGER, Mode.SECRET)
+        super().__init__(child)
 
     def __eq__(self, other) -> AnyBoolean:
         return ScalarType.__eq__(self, other)
@@ -543,8 +589,10 @@ class SecretInteger(NumericType):
 class SecretUnsignedInteger(NumericType):
     """The Nada Secret Unsigned integer type."""
 
+    __slots__ = ()
+
     def __init__(self, child: NadaType):
-        super().__init__(child, BaseType.UNSIGNED_INTEGER, Mode.SECRET)
+        super().__init__(child)
 
     def __eq__(self, other) -> AnyBoolean:
         return ScalarType.__eq__(self, other)
@@ -590,8 +638,10 @@ class SecretUnsignedInteger(NumericType):
 class SecretBoolean(BooleanType):
     """The SecretBoolean Nada MIR type."""
 
+    __slots__ = ()
+
     def __init__(self, child: NadaType):
-        super().__init__(child, BaseType.BOOLEAN, Mode.SECRET)
+        super().__init__(child)
 
     def __eq__(self, other) -> AnyBoolean:
         return ScalarType.__eq__(self, other)
@@ -615,6 +665,8 @@ class SecretBoolean(BooleanType):
 class EcdsaSignature(NadaType):
     """The EcdsaSignature Nada MIR type."""
 
+    __slots__ = ()
+
     def __init__(self, child: OperationType):
         super().__init__(child=child)
 
@@ -623,6 +675,8 @@ class EcdsaSignature(NadaType):
 class EcdsaDigestMessage(NadaType):
     """The EcdsaDigestMessage Nada MIR type."""
 
+    __slots__ = ()
+
     def __init__(self, child: OperationType):
         super().__init__(child=child)
 
@@ -631,6 +685,8 @@ class EcdsaDigestMessage(NadaType):
 class EcdsaPrivateKey(NadaType):
     """The EcdsaPrivateKey Nada MIR type."""
 
+    __slots__ = ()
+
     def __init__(self, child: OperationType):
         super().__init__(child=child)
 
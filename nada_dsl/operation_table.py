@@ -0,0 +1,104 @@
+"""
+Operation table.
+
+Dense store of the AST operations of a program, indexed by operation identifier.
+"""
+
+from collections.abc import MutableMapping
+from typing import Any, Iterator, List, Optional
+
+
+class OperationTable(MutableMapping):
+    """Append-only table of operations indexed by operation identifier.
+
+    Operation identifiers are handed out in increasing order by
+    `next_operation_id()`, so operations are stored in a list where the position
+    of an operation is its identifier minus the identifier of the first operation.
+    Storing an operation is an append in the common case and looking it up is a
+    list indexing.
+
+    Identifiers that were handed out but never stored (for instance inputs that
+    were never wrapped in a Nada type) are kept as empty slots.
+    """
+
+    __slots__ = ("_base", "_operations", "_count")
+
+    _base: int
+    _operations: List[Optional[Any]]
+    _count: int
+
+    def __init__(self):
+        self._base = 0
+        self._operations = []
+        self._count = 0
+
+    def __getitem__(self, operation_id: int) -> Any:
+        index = operation_id - self._base
+        if index >= 0:
+            try:
+                operation = self._operations[index]
+            except IndexError:
+                operation = None
+            if operation is not None:
+                return operation
+        raise KeyError(operation_id)
+
+    def __setitem__(self, operation_id: int, operation: Any):
+        operations = self._operations
+        if not operations:
+            self._base = operation_id
+        index = operation_id - self._base
+        size = len(operations)
+        if index == size:
+            operations.append(operation)
+            self._count += 1
+            return
+        if index > size:
+            operations.extend([None] * (index - size))
+            operations.append(operation)
+            self._count += 1
+            return
+        if index < 0:
+            operations[0:0] = [None] * -index
+            self._base = operation_id
+            index = 0
+        if operations[index] is None:
+            self._count += 1
+        operations[index] = operation
+
+    def __delitem__(self, operation_id: int):
+        index = operation_id - self._base
+        if index < 0 or index >= len(self._operations):
+            raise KeyError(operation_id)
+        if self._operations[index] is None:
+            raise KeyError(operation_id)
+        self._operations[index] = None
+        self._count -= 1
+
+    def __contains__(self, operation_id) -> bool:
+        index = operation_id - self._base
+        return 0 <= index < len(self._operations) and (
+            self._operations[index] is not None
+        )
+
+    def __iter__(self) -> Iterator[int]:
+        base = self._base
+        return (
+            base + index
+            for index, operation in enumerate(self._operations)
+            if operation is not None
+        )
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __repr__(self) -> str:
+        return f"OperationTable({dict(self.items())})"
+
+    def values(self):
+        return [operation for operation in self._operations if operation is not None]
+
+    def clear(self):
+        self._base = 0
+        self._operations = []
+        self._count = 0
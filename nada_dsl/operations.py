@@ -10,6 +10,7 @@ from nada_dsl.ast_util import (
     IfElseASTOperation,
     RandomASTOperation,
     UnaryASTOperation,
+    common_subexpression,
     next_operation_id,
 )
 from nada_dsl.nada_types import AllTypes
@@ -18,6 +19,13 @@ from nada_dsl.nada_types import AllTypes
 class BinaryOperation:
     """Superclass of all the binary operations."""
 
+    __slots__ = ("id", "left", "right", "source_ref")
+
+    # Whether the operands can be swapped without changing the result
+    commutative = False
+    # Whether equal operations can be merged by common subexpression elimination
+    deduplicable = True
+
     def __init__(self, left: AllTypes, right: AllTypes, source_ref: SourceRef):
         self.id = next_operation_id()
         self.left = left
@@ -26,11 +34,22 @@ class BinaryOperation:
 
     def store_in_ast(self, ty: object):
         """Store object in AST"""
+        name = self.__class__.__name__
+        left = self.left.child.id
+        right = self.right.child.id
+        if self.deduplicable:
+            children = (
+                (right, left) if self.commutative and right < left else (left, right)
+            )
+            operation_id = common_subexpression(self.id, name, children, ty)
+            if operation_id != self.id:
+                self.id = operation_id
+                return
         AST_OPERATIONS[self.id] = BinaryASTOperation(
             id=self.id,
-            name=self.__class__.__name__,
-            left=self.left.child.id,
-            right=self.right.child.id,
+            name=name,
+            left=left,
+            right=right,
             source_ref=self.source_ref,
             ty=ty,
         )
@@ -39,6 +58,8 @@ class BinaryOperation:
 class UnaryOperation:
     """Superclass of all the unary operations."""
 
+    __slots__ = ("id", "child", "source_ref")
+
     def __init__(self, child: AllTypes, source_ref: SourceRef):
         self.id = next_operation_id()
         self.child = child
@@ -46,10 +67,16 @@ class UnaryOperation:
 
     def store_in_ast(self, ty: object):
         """Store object in AST."""
+        name = self.__class__.__name__
+        child = self.child.child.id
+        operation_id = common_subexpression(self.id, name, (child,), ty)
+        if operation_id != self.id:
+            self.id = operation_id
+            return
         AST_OPERATIONS[self.id] = UnaryASTOperation(
             id=self.id,
-            name=self.__class__.__name__,
-            child=self.child.child.id,
+            name=name,
+            child=child,
             source_ref=self.source_ref,
             ty=ty,
         )
@@ -58,79 +85,129 @@ class UnaryOperation:
 class Addition(BinaryOperation):
     """Addition operation"""
 
+    __slots__ = ()
+
+    commutative = True
+
 
 class Subtraction(BinaryOperation):
     """Subtraction operation."""
 
+    __slots__ = ()
+
 
 class Multiplication(BinaryOperation):
     """Multiplication operation"""
 
+    __slots__ = ()
+
+    commutative = True
+
 
 class Division(BinaryOperation):
     """Division operation"""
 
+    __slots__ = ()
+
 
 class Modulo(BinaryOperation):
     """Modulo operation"""
 
+    __slots__ = ()
+
 
 class Power(BinaryOperation):
     """Power operation"""
 
+    __slots__ = ()
+
 
 class RightShift(BinaryOperation):
     """Right shift (>>) operation."""
 
+    __slots__ = ()
+
 
 class LeftShift(BinaryOperation):
     """Left shift (<<)operation."""
 
+    __slots__ = ()
+
 
 class LessThan(BinaryOperation):
     """Less than (<) operation"""
 
+    __slots__ = ()
+
 
 class GreaterThan(BinaryOperation):
     """Greater than (>) operation."""
 
+    __slots__ = ()
+
 
 class LessOrEqualThan(BinaryOperation):
     """Less or equal (<=) operation."""
 
+    __slots__ = ()
+
 
 class GreaterOrEqualThan(BinaryOperation):
     """Greater or equal (>=) operation."""
 
+    __slots__ = ()
+
 
 class Equals(BinaryOperation):
     """Equals (==) operation"""
 
+    __slots__ = ()
+
+    commutative = True
+
 
 class NotEquals(BinaryOperation):
     """Not equals (!=) operation."""
 
+    __slots__ = ()
+
+    commutative = True
+
 
 class PublicOutputEquality(BinaryOperation):
     """Public output equality operation."""
 
+    __slots__ = ()
+
 
 class BooleanAnd(BinaryOperation):
     """Boolean AND (&) operation."""
 
+    __slots__ = ()
+
+    commutative = True
+
 
 class BooleanOr(BinaryOperation):
     """Boolean OR (|) operation."""
 
+    __slots__ = ()
+
+    commutative = True
+
 
 class BooleanXor(BinaryOperation):
     """Boolean XOR (^) operation."""
 
+    __slots__ = ()
+
+    commutative = True
+
 
 class Random:
     """Random operation."""
 
-    source_ref: SourceRef
+    __slots__ = ("id", "source_ref")
 
     def __init__(self, source_ref):
         self.id = next_operation_id()
@@ -149,6 +226,8 @@ class IfElse:
     cond.if_else(left, right)
     """
 
+    __slots__ = ("id", "this", "arg_0", "arg_1", "source_ref")
+
     this: AllTypes  # cond
     arg_0: AllTypes  # left
     arg_1: AllTypes  # right
@@ -178,6 +257,8 @@ class IfElse:
 class Reveal(UnaryOperation):
     """Reveal (i.e. make public) operation."""
 
+    __slots__ = ()
+
     def __init__(self, this: AllTypes, source_ref: SourceRef):
         super().__init__(child=this, source_ref=source_ref)
 
@@ -185,13 +266,25 @@ class Reveal(UnaryOperation):
 class TruncPr(BinaryOperation):
     """Probabilistic Truncation operation."""
 
+    __slots__ = ()
+
+    # Randomized operation, equal operations may have different results
+    deduplicable = False
+
 
 class Not(UnaryOperation):
     """Not (!) Operation"""
 
+    __slots__ = ()
+
     def __init__(self, this: AllTypes, source_ref: SourceRef):
         super().__init__(child=this, source_ref=source_ref)
 
 
 class EcdsaSign(BinaryOperation):
     """Ecdsa signing operation."""
+
+    __slots__ = ()
+
+    # Randomized operation, equal operations may have different results
+    deduplicable = False
@@ -0,0 +1,320 @@
+"""
+Optimization passes.
+
+Passes that rewrite the AST operations of the current compilation context after
+the program has been captured and before it is converted into MIR.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Set, Tuple
+
+from nada_dsl.ast_util import (
+    ASTOperation,
+    BinaryASTOperation,
+    MapASTOperation,
+    NadaFunctionASTOperation,
+    NadaFunctionCallASTOperation,
+    ReduceASTOperation,
+)
+from nada_dsl.compilation_context import current_context
+
+# Associative and commutative operations whose chains are rebalanced
+ASSOCIATIVE_OPERATIONS = frozenset(["Addition", "Multiplication"])
+
+
+@dataclass(slots=True)
+class RebalanceReport:
+    """Result of the rebalancing pass.
+
+    Attributes
+    ----------
+    chains: int
+        Number of chains that were rebalanced
+    depth_before: int
+        Critical path depth of the program outputs before the pass
+    depth_after: int
+        Critical path depth of the program outputs after the pass
+    """
+
+    chains: int
+    depth_before: int
+    depth_after: int
+
+    def to_dict(self) -> Dict[str, int]:
+        """Convert the report into a dictionary."""
+        return {
+            "chains": self.chains,
+            "depth_before": self.depth_before,
+            "depth_after": self.depth_after,
+        }
+
+
+@dataclass(slots=True)
+class DeadOperationReport:
+    """Result of the dead operation elimination pass.
+
+    Attributes
+    ----------
+    operations: int
+        Number of stored operations before the pass
+    removed: int
+        Number of unreachable operations that were removed
+    """
+
+    operations: int
+    removed: int
+
+    def to_dict(self) -> Dict[str, int]:
+        """Convert the report into a dictionary."""
+        return {"operations": self.operations, "removed": self.removed}
+
+
+def _is_secret(operation: ASTOperation) -> bool:
+    """Returns true if an operation produces a secret scalar."""
+    return isinstance(operation.ty, str) and operation.ty.startswith("Secret")
+
+
+def _is_chain_operation(operation: ASTOperation) -> bool:
+    """Returns true if an operation can be part of a rebalanced chain."""
+    return (
+        isinstance(operation, BinaryASTOperation)
+        and operation.name in ASSOCIATIVE_OPERATIONS
+        and _is_secret(operation)
+    )
+
+
+def _use_counts(
+    operations: Dict[int, ASTOperation], roots: Iterable[int]
+) -> Dict[int, int]:
+    """Count the uses of every operation.
+
+    The return operation of a Nada function and the given roots (the program
+    outputs) count as uses.
+    """
+    uses: Counter = Counter(roots)
+    for operation in operations.values():
+        uses.update(operation.child_operations())
+        if isinstance(operation, NadaFunctionASTOperation):
+            uses[operation.child] += 1
+    return uses
+
+
+def critical_path_depth(
+    operations: Dict[int, ASTOperation], roots: Iterable[int]
+) -> int:
+    """Returns the critical path depth of the given root operations.
+
+    The depth of an operation is the number of operations on the longest path
+    between the operation and the inputs or literals it depends on. Nada
+    functions are not followed.
+    """
+    depths: Dict[int, int] = {}
+    result = 0
+    for root in roots:
+        stack = [root]
+        while stack:
+            operation_id = stack[-1]
+            if operation_id in depths:
+                stack.pop()
+                continue
+            children = operations[operation_id].child_operations()
+            pending = [child for child in children if child not in depths]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            if children:
+                depths[operation_id] = 1 + max(depths[child] for child in children)
+            else:
+                depths[operation_id] = 0
+        result = max(result, depths[root])
+    return result
+
+
+def _chain(
+    operations: Dict[int, ASTOperation], root: BinaryASTOperation, interior: set
+) -> Tuple[List[int], List[int]]:
+    """Collect the interior operations and the leaves of the chain rooted at
+    `root`, leaves in left to right order."""
+    chain_operations = []
+    leaves = []
+    stack = [root.id]
+    while stack:
+        operation_id = stack.pop()
+        if operation_id in interior or operation_id == root.id:
+            operation = operations[operation_id]
+            chain_operations.append(operation_id)
+            stack.append(operation.right)
+            stack.append(operation.left)
+        else:
+            leaves.append(operation_id)
+    return chain_operations, leaves
+
+
+def _balanced_tree(
+    operations: Dict[int, ASTOperation],
+    root: BinaryASTOperation,
+    chain_operations: List[int],
+    leaves: List[int],
+):
+    """Replace the chain rooted at `root` by a balanced tree over its leaves.
+
+    The identifiers and source references of the chain operations are reused and
+    the root keeps its identifier. Non secret leaves are first combined with the
+    secret leaves, so every operation of the new tree is secret.
+    """
+    source_refs = {
+        operation_id: operations[operation_id].source_ref
+        for operation_id in chain_operations
+    }
+    free_ids = sorted(chain_operations[1:])
+
+    def combine(left: int, right: int, operation_id: int) -> int:
+        operations[operation_id] = BinaryASTOperation(
+            id=operation_id,
+            name=root.name,
+            left=left,
+            right=right,
+            source_ref=source_refs[operation_id],
+            ty=root.ty,
+        )
+        return operation_id
+
+    terms = [leaf for leaf in leaves if _is_secret(operations[leaf])]
+    public_leaves = [leaf for leaf in leaves if not _is_secret(operations[leaf])]
+    for index, leaf in enumerate(public_leaves):
+        position = index % len(terms)
+        # With a single secret leaf, the last combination is the root of the tree
+        last = len(terms) == 1 and index == len(public_leaves) - 1
+        operation_id = root.id if last else free_ids.pop()
+        terms[position] = combine(terms[position], leaf, operation_id)
+
+    def build(start: int, end: int) -> int:
+        if end - start == 1:
+            return terms[start]
+        middle = (start + end) // 2
+        left = build(start, middle)
+        right = build(middle, end)
+        operation_id = root.id if end - start == len(terms) else free_ids.pop()
+        return combine(left, right, operation_id)
+
+    build(0, len(terms))
+
+
+def rebalance_associative_chains(outputs: List[int]) -> RebalanceReport:
+    """Rebalance the chains of secret associative operations.
+
+    A chain like `a * b * c * d` is captured as a left-deep tree whose depth grows
+    linearly with its length, and every secret multiplication on the critical path
+    costs a communication round. This pass rewrites every chain of secret
+    additions or multiplications, whose intermediate results are not used
+    anywhere else, into a balanced tree of logarithmic depth.
+
+    Arguments
+    ---------
+    outputs: List[int]
+        The identifiers of the output operations of the program
+
+    Returns
+    -------
+    RebalanceReport
+        The number of rebalanced chains and the depth before and after the pass
+    """
+    operations = current_context().operations
+    depth_before = critical_path_depth(operations, outputs)
+    uses = _use_counts(operations, outputs)
+
+    interior = set()
+    for operation in operations.values():
+        if not _is_chain_operation(operation):
+            continue
+        for child_id in (operation.left, operation.right):
+            child = operations[child_id]
+            if (
+                _is_chain_operation(child)
+                and child.name == operation.name
+                and child.ty == operation.ty
+                and uses[child_id] == 1
+            ):
+                interior.add(child_id)
+
+    chains = 0
+    for root in list(operations.values()):
+        if not _is_chain_operation(root) or root.id in interior:
+            continue
+        chain_operations, leaves = _chain(operations, root, interior)
+        if len(leaves) < 3 or not any(_is_secret(operations[leaf]) for leaf in leaves):
+            continue
+        _balanced_tree(operations, root, chain_operations, leaves)
+        chains += 1
+
+    return RebalanceReport(
+        chains=chains,
+        depth_before=depth_before,
+        depth_after=critical_path_depth(operations, outputs),
+    )
+
+
+def reachable_operations(
+    operations: Dict[int, ASTOperation], roots: Iterable[int]
+) -> Set[int]:
+    """Returns the identifiers of the operations reachable from the given roots.
+
+    Nada functions are followed: a Map, Reduce or function call reaches its
+    function, and a function reaches its arguments and its return operation.
+    """
+    reachable: Set[int] = set()
+    stack = list(roots)
+    while stack:
+        operation_id = stack.pop()
+        if operation_id in reachable:
+            continue
+        reachable.add(operation_id)
+        operation = operations[operation_id]
+        stack.extend(operation.child_operations())
+        if isinstance(
+            operation,
+            (MapASTOperation, ReduceASTOperation, NadaFunctionCallASTOperation),
+        ):
+            stack.append(operation.fn)
+        elif isinstance(operation, NadaFunctionASTOperation):
+            stack.append(operation.child)
+            stack.extend(operation.args)
+    return reachable
+
+
+def eliminate_dead_operations(outputs: List[int]) -> DeadOperationReport:
+    """Remove the operations that are not reachable from the program outputs.
+
+    Every Nada value stores its operation when it is built, including
+    intermediate values that never reach an output. The MIR only contains the
+    reachable operations, so this pass does not change it, but it frees the
+    memory held by the unreachable ones.
+
+    Arguments
+    ---------
+    outputs: List[int]
+        The identifiers of the output operations of the program
+
+    Returns
+    -------
+    DeadOperationReport
+        The number of operations before the pass and of removed operations
+    """
+    context = current_context()
+    operations = context.operations
+    reachable = reachable_operations(operations, outputs)
+    dead = [
+        operation_id for operation_id in operations if operation_id not in reachable
+    ]
+    report = DeadOperationReport(operations=len(operations), removed=len(dead))
+    for operation_id in dead:
+        del operations[operation_id]
+    # Drop the common subexpressions that refer to removed operations
+    context.cse_table = {
+        key: operation_id
+        for key, operation_id in context.cse_table.items()
+        if operation_id in reachable
+    }
+    return report
@@ -0,0 +1,168 @@
+"""
+Operation profiler.
+
+Profiles the construction of the operations of a program: for every operation
+class (Addition, IfElse, Map, Literal, Input...), the number of created
+operations and the time spent building them, from the operation constructor to
+the storage of the operation into the AST, and the lines of the program that
+created the most operations.
+
+The construction of an operation starts when its identifier is allocated with
+`next_operation_id()`. The source reference of an operation is captured before
+its constructor runs, so the time spent in `SourceRef.back_frame` is measured
+separately and attributed to the next stored operation.
+
+The profiler is disabled by default. The compiler enables it when the
+`NADA_PROFILE` environment variable is set and writes the report into
+`nada-operations.json`, next to `nada-timers.json`.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+import os
+import sys
+import time
+from typing import Any, Dict, Tuple
+
+# Directory of the nada_dsl package, its frames are skipped when looking for the
+# program line that created an operation
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+
+@dataclass(slots=True)
+class OperationStats:
+    """Construction measurements of an operation class.
+
+    Attributes
+    ----------
+    count: int
+        Number of stored operations. An operation wrapped into several Nada
+        values, like an input wrapped into an array, is counted once per value
+    construct_seconds: float
+        Time spent from the constructors of the operations to their storage in
+        the AST, including `store_in_ast`
+    source_ref_seconds: float
+        Time spent capturing the source references of the operations, before
+        their constructors
+    store_seconds: float
+        Time spent in `store_in_ast`
+    """
+
+    count: int = 0
+    construct_seconds: float = 0.0
+    source_ref_seconds: float = 0.0
+    store_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the measurements into a dictionary."""
+        return {
+            "count": self.count,
+            "construct_seconds": self.construct_seconds,
+            "source_ref_seconds": self.source_ref_seconds,
+            "store_seconds": self.store_seconds,
+        }
+
+
+class Profiler:
+    """Operation construction profiler.
+
+    Nada values call `store()` instead of storing their child operation
+    themselves when the profiler is enabled. `next_operation_id()` calls
+    `start()` and `SourceRef.back_frame` calls `source_ref()`.
+    """
+
+    enabled: bool
+    operations: Dict[str, OperationStats]
+    lines: Dict[Tuple[str, int], Counter]
+    # Start time of the operations that were not stored yet, by identifier
+    started: Dict[int, float]
+    # Time spent capturing source references since the last stored operation
+    pending_source_ref_seconds: float
+
+    def __init__(self):
+        self.enabled = False
+        self.operations = {}
+        self.lines = {}
+        self.started = {}
+        self.pending_source_ref_seconds = 0.0
+
+    def enable(self):
+        """Enable the profiler, dropping previous measurements."""
+        self.enabled = True
+        self.operations = {}
+        self.lines = {}
+        self.started = {}
+        self.pending_source_ref_seconds = 0.0
+
+    def disable(self):
+        """Disable the profiler."""
+        self.enabled = False
+        self.started = {}
+
+    def start(self, operation_id: int):
+        """Record the start of the construction of an operation."""
+        self.started[operation_id] = time.perf_counter()
+
+    def source_ref(self, seconds: float):
+        """Record the time spent capturing a source reference."""
+        self.pending_source_ref_seconds += seconds
+
+    def store(self, value):
+        """Store the child operation of a Nada value, measuring it.
+
+        An operation wrapped into several Nada values is only measured from its
+        constructor for the first one.
+        """
+        wrap_start = time.perf_counter()
+        start = self.started.pop(value.child.id, wrap_start)
+        ty = value.to_mir()
+        store_start = time.perf_counter()
+        value.child.store_in_ast(ty)
+        end = time.perf_counter()
+
+        name = type(value.child).__name__
+        stats = self.operations.get(name)
+        if stats is None:
+            stats = self.operations[name] = OperationStats()
+        stats.count += 1
+        stats.construct_seconds += end - start
+        stats.source_ref_seconds += self.pending_source_ref_seconds
+        self.pending_source_ref_seconds = 0.0
+        stats.store_seconds += end - store_start
+
+        frame = sys._getframe(1)  # pylint: disable=protected-access
+        while frame is not None and frame.f_code.co_filename.startswith(PACKAGE_DIR):
+            frame = frame.f_back
+        if frame is not None:
+            line = (frame.f_code.co_filename, frame.f_lineno)
+            counts = self.lines.get(line)
+            if counts is None:
+                counts = self.lines[line] = Counter()
+            counts[name] += 1
+
+    def report(self, top_lines: int = 20) -> Dict[str, Any]:
+        """Returns the measurements of every operation class, from the most
+        created one, and the `top_lines` program lines that created the most
+        operations."""
+        operations = sorted(
+            self.operations.items(), key=lambda item: item[1].count, reverse=True
+        )
+        lines = sorted(
+            self.lines.items(), key=lambda item: item[1].total(), reverse=True
+        )
+        return {
+            "operations": {name: stats.to_dict() for name, stats in operations},
+            "lines": [
+                {
+                    "file": file,
+                    "lineno": lineno,
+                    "count": counts.total(),
+                    "operations": dict(counts.most_common()),
+                }
+                for (file, lineno), counts in lines[:top_lines]
+            ],
+        }
+
+
+# Global profiler
+profiler = Profiler()
@@ -12,6 +12,7 @@ from nada_dsl.ast_util import (
     InputASTOperation,
     LiteralASTOperation,
     next_operation_id,
+    store_literal,
 )
 from nada_dsl.errors import InvalidTypeError
 from nada_dsl.nada_types import AllTypes, Party
@@ -29,6 +30,8 @@ class Input(NadaType):
         doc (str): Documentation for the input (default "").
     """
 
+    __slots__ = ("id", "name", "party", "doc", "source_ref")
+
     name: str
     party: Party
     doc: str
@@ -63,6 +66,8 @@ class Literal(NadaType):
         value (Any): The value of the literal.
     """
 
+    __slots__ = ("id", "value", "source_ref")
+
     value: Any
     source_ref: SourceRef
 
@@ -75,12 +80,14 @@ class Literal(NadaType):
 
     def store_in_ast(self, ty: object):
         """Store object in AST"""
-        AST_OPERATIONS[self.id] = LiteralASTOperation(
-            operation_id=self.id,
-            name=self.__class__.__name__,
-            ty=ty,
-            value=self.value,
-            source_ref=self.source_ref,
+        self.id = store_literal(
+            LiteralASTOperation(
+                operation_id=self.id,
+                name=self.__class__.__name__,
+                ty=ty,
+                value=self.value,
+                source_ref=self.source_ref,
+            )
         )
 
 
@@ -2,23 +2,35 @@
 Source reference representation data structure.
 """
 
-# pylint: disable=W0603
-
 import os
 from dataclasses import dataclass
-from typing import Tuple
+from bisect import bisect_right
+from itertools import accumulate
+from types import CodeType
+from typing import List, Optional, Tuple
 import inspect
+import time
+from nada_dsl.compilation_context import ContextList, ContextMapping, current_context
+from nada_dsl.profiler import profiler
+
+# Source files used in the current compilation context
+USED_SOURCES = ContextMapping("used_sources")
+# Source references of the current compilation context
+REFS = ContextList("source_refs")
+
+# Map of source references to their index in REFS, in the current compilation context
+index_map = ContextMapping("source_ref_indexes")
 
-USED_SOURCES = {}
-REFS = []
 
-# Global variable that holds the map of source references
-index_map = {}
-# Global variable that holds the global counter of source reference identifiers.
-next_index = 0  # pylint:disable=C0103
+def build_line_table(src: str) -> Tuple[List[int], List[int]]:
+    """Build the line table of a source file: the start offset and the length of
+    every line, so the position of a line is found in constant time."""
+    lengths = [len(line) for line in src.splitlines()]
+    offsets = list(accumulate((length + 1 for length in lengths), initial=0))
+    return offsets, lengths
 
 
-@dataclass
+@dataclass(slots=True)
 class SourceRef:
     """
     Source reference representation, i.e., a specific location in the source code.
@@ -31,45 +43,63 @@ class SourceRef:
 
     @classmethod
     def back_frame(cls) -> "SourceRef":
-        """Get the source reference of the calling frame."""
+        """Get the source reference of the calling frame.
+
+        Depending on the source reference mode of the compilation context, the
+        reference is resolved immediately ("eager"), when it is added to the MIR
+        ("lazy"), or not captured at all ("off").
+        """
+        mode = current_context().source_ref_mode
+        if mode == "off":
+            return EMPTY_SOURCE_REF
+        start = time.perf_counter() if profiler.enabled else 0.0
         backend_frame = inspect.currentframe().f_back.f_back
-        lineno = backend_frame.f_lineno
-        (offset, length) = SourceRef.try_get_line_info(backend_frame, lineno)
-        return cls(
-            lineno=lineno,
-            offset=offset,
-            file=os.path.basename(backend_frame.f_code.co_filename),
-            length=length,
-        )
+        if mode == "lazy":
+            source_ref = LazySourceRef(backend_frame.f_code, backend_frame.f_lasti)
+        else:
+            lineno = backend_frame.f_lineno
+            (offset, length) = SourceRef.try_get_line_info(backend_frame, lineno)
+            source_ref = cls(
+                lineno=lineno,
+                offset=offset,
+                file=os.path.basename(backend_frame.f_code.co_filename),
+                length=length,
+            )
+        if profiler.enabled:
+            profiler.source_ref(time.perf_counter() - start)
+        return source_ref
 
     @staticmethod
     def try_get_line_info(backend_frame, lineno) -> Tuple[int, int]:
         """Try to get line information from the source code."""
+        return SourceRef.line_info(backend_frame.f_code.co_filename, lineno)
+
+    @staticmethod
+    def line_info(path: str, lineno: int) -> Tuple[int, int]:
+        """Try to get the offset and the length of a line of a source file."""
         # We don't include file sources from nada_dsl package.
         # This is to prevent 'nada_fn' wrongly adding nada_dsl source files from this package.
-        if "nada_dsl" in backend_frame.f_code.co_filename:
-            return 0, 0
-        filename = os.path.basename(backend_frame.f_code.co_filename)
-
-        src = None
-        try:
-            if filename not in USED_SOURCES:
-                with open(
-                    f"{backend_frame.f_code.co_filename}", encoding="utf-8"
-                ) as file:
-                    src = file.read()
-                USED_SOURCES[filename] = src
-            else:
-                src = USED_SOURCES[filename]
-        except OSError:
+        if "nada_dsl" in path:
             return 0, 0
-
-        lines = src.splitlines()
-        if lineno < len(lines):
-            offset = 0
-            for i in range(lineno - 1):
-                offset += len(lines[i]) + 1
-            return offset, len(lines[lineno - 1])
+        filename = os.path.basename(path)
+
+        context = current_context()
+        line_table = context.source_lines.get(filename)
+        if line_table is None:
+            src = context.used_sources.get(filename)
+            if src is None:
+                try:
+                    with open(path, encoding="utf-8") as file:
+                        src = file.read()
+                except OSError:
+                    return 0, 0
+                context.used_sources[filename] = src
+            line_table = build_line_table(src)
+            context.source_lines[filename] = line_table
+
+        offsets, lengths = line_table
+        if lineno < len(lengths):
+            return offsets[lineno - 1], lengths[lineno - 1]
 
         return 0, 0
 
@@ -77,16 +107,14 @@ class SourceRef:
         """Index Source Reference objects.
         Adds the current object into a dict as a key
         as well as an entry in an array, and returns an index to it"""
-        global next_index
+        context = current_context()
         key = self.to_key()
-        value = self.to_value()
-        if key in index_map:
-            return index_map[key]
-
-        index_map[key] = next_index
-        REFS.append(value)
-        next_index += 1
-        return index_map[key]
+        index = context.source_ref_indexes.get(key)
+        if index is None:
+            index = len(context.source_refs)
+            context.source_ref_indexes[key] = index
+            context.source_refs.append(self.to_value())
+        return index
 
     def to_value(self):
         """Convert the SourceRef object to a dictionary."""
@@ -104,9 +132,94 @@ class SourceRef:
     @staticmethod
     def get_sources():
         """Get all sources."""
-        return USED_SOURCES
+        return current_context().used_sources
 
     @staticmethod
     def get_refs():
         """Get all refs."""
-        return REFS
+        return current_context().source_refs
+
+
+# Source reference of the operations compiled without source references. It is
+# the only source reference in the MIR, so every `source_ref_index` is 0.
+EMPTY_SOURCE_REF = SourceRef(file="", lineno=0, offset=0, length=0)
+
+
+def code_line_table(code: CodeType) -> Tuple[List[int], List[int]]:
+    """Returns the bytecode offset where every line of a code object starts and the
+    line numbers, computed once per code object."""
+    context = current_context()
+    line_table = context.code_lines.get(code)
+    if line_table is None:
+        starts = []
+        linenos = []
+        for start, _, lineno in code.co_lines():
+            starts.append(start)
+            linenos.append(lineno or 0)
+        line_table = (starts, linenos)
+        context.code_lines[code] = line_table
+    return line_table
+
+
+class LazySourceRef:
+    """Source reference that only records the code object and the bytecode offset
+    of the calling frame.
+
+    The line number, offset and length are resolved into a `SourceRef` the first
+    time they are needed, usually when the reference is added to the MIR.
+    """
+
+    __slots__ = ("code", "lasti", "resolved")
+
+    back_frame = SourceRef.back_frame
+
+    def __init__(self, code: CodeType, lasti: int):
+        self.code = code
+        self.lasti = lasti
+        self.resolved: Optional[SourceRef] = None
+
+    def resolve(self) -> SourceRef:
+        """Returns the resolved source reference."""
+        if self.resolved is None:
+            starts, linenos = code_line_table(self.code)
+            lineno = linenos[bisect_right(starts, self.lasti) - 1]
+            (offset, length) = SourceRef.line_info(self.code.co_filename, lineno)
+            self.resolved = SourceRef(
+                lineno=lineno,
+                offset=offset,
+                file=os.path.basename(self.code.co_filename),
+                length=length,
+            )
+        return self.resolved
+
+    @property
+    def file(self) -> str:
+        """The file name."""
+        return self.resolve().file
+
+    @property
+    def lineno(self) -> int:
+        """The line number."""
+        return self.resolve().lineno
+
+    @property
+    def offset(self) -> int:
+        """The offset of the line in the file."""
+        return self.resolve().offset
+
+    @property
+    def length(self) -> int:
+        """The length of the line."""
+        return self.resolve().length
+
+    def to_index(self) -> int:
+        """See `SourceRef.to_index`."""
+        return self.resolve().to_index()
+
+    def to_value(self):
+        """See `SourceRef.to_value`."""
+        return self.resolve().to_value()
+
+    def to_key(self):
+        """See `SourceRef.to_key`."""
+        return self.resolve().to_key()
@@ -3,12 +3,24 @@ Timer class
 
 This is a timer class used to measure the performance of different stages
 in the compilation process.
+
+Timers are hierarchical: a timer started while another one is running is
+recorded as its child, and timers can be nested and started again with the
+same name. The time of every timer is aggregated by its path from the outermost
+timer (count, total, min and max), and can be exported as a Chrome trace
+(loaded in chrome://tracing or https://ui.perfetto.dev) and as folded stacks
+(for flamegraph.pl or speedscope).
 """
 
 from dataclasses import dataclass
 import functools
+import os
 import time
-from typing import Dict
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+# Separator of the timer names in the path of a timer
+PATH_SEPARATOR = ";"
 
 
 class TimerError(Exception):
@@ -24,39 +36,186 @@ class Clock:
     def stop(self, timer_name: str):
         """Stop the timer"""
 
-    def report(self) -> Dict[str, float]:
+    def report(self) -> Dict[str, Dict[str, Any]]:
         """Report"""
         return {}
 
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Chrome trace-event report"""
+        return {"traceEvents": []}
+
+    def folded_stacks(self) -> str:
+        """Folded stacks report"""
+        return ""
+
+
+@dataclass(slots=True)
+class SpanStats:
+    """Aggregated measurements of a timer path.
+
+    Attributes
+    ----------
+    count: int
+        Number of times the timer was stopped
+    total: float
+        Total elapsed time, in seconds
+    min: float
+        Shortest elapsed time, in seconds
+    max: float
+        Longest elapsed time, in seconds
+    peak_memory: Optional[int]
+        Largest amount of memory allocated while the timer was running, above the
+        memory in use when it started, in bytes. Only measured when memory
+        tracking is enabled.
+    """
+
+    count: int = 0
+    total: float = 0.0
+    min: float = float("inf")
+    max: float = 0.0
+    peak_memory: Optional[int] = None
+
+    def add(self, elapsed: float, peak_memory: Optional[int]):
+        """Add a measurement."""
+        self.count += 1
+        self.total += elapsed
+        self.min = min(self.min, elapsed)
+        self.max = max(self.max, elapsed)
+        if peak_memory is not None:
+            self.peak_memory = max(self.peak_memory or 0, peak_memory)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the measurements into a dictionary."""
+        stats: Dict[str, Any] = {
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+        if self.peak_memory is not None:
+            stats["peak_memory"] = self.peak_memory
+        return stats
+
+
+@dataclass(slots=True)
+class _RunningSpan:
+    """A running timer."""
+
+    name: str
+    path: Tuple[str, ...]
+    start: float
+    memory_start: int
+    peak_memory: int
+
 
-@dataclass
 class DefaultClock(Clock):
     """Default implementation for a clock
 
-    The clock keeps a list of timers and implements functions to keep track of
-    different timers in a dictionary.
+    The clock keeps the stack of running timers, the aggregated measurements of
+    every timer path and the list of measured spans for the Chrome trace.
 
+    When `track_memory` is set, memory allocations are traced with `tracemalloc`
+    and the peak memory of every timer is measured.
     """
 
-    timers: Dict[str, float]
-
-    def __init__(self):
-        self.timers = {}
+    origin: float
+    running: List[_RunningSpan]
+    stats: Dict[Tuple[str, ...], SpanStats]
+    events: List[Tuple[str, float, float]]
+    track_memory: bool
+
+    def __init__(self, track_memory: bool = False):
+        self.origin = time.perf_counter()
+        self.running = []
+        self.stats = {}
+        self.events = []
+        self.track_memory = track_memory
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _update_peak_memory(self) -> int:
+        """Account the memory peak since the last update to the running timers and
+        return the memory currently in use."""
+        current, peak = tracemalloc.get_traced_memory()
+        for span in self.running:
+            span.peak_memory = max(span.peak_memory, peak - span.memory_start)
+        tracemalloc.reset_peak()
+        return current
 
     def start(self, timer_name: str):
-        if timer_name in self.timers:
-            raise TimerError(f"timer {timer_name} already running.")
-        self.timers[timer_name] = time.perf_counter()
+        memory = 0
+        if self.track_memory:
+            memory = self._update_peak_memory()
+        parent_path = self.running[-1].path if self.running else ()
+        self.running.append(
+            _RunningSpan(
+                name=timer_name,
+                path=parent_path + (timer_name.replace(PATH_SEPARATOR, ","),),
+                start=time.perf_counter(),
+                memory_start=memory,
+                peak_memory=0,
+            )
+        )
 
     def stop(self, timer_name: str):
-        if self.timers.get(timer_name) is None:
+        """Stop the innermost running timer with the given name.
+
+        Timers started inside it that are still running, for instance because an
+        exception skipped their `stop()`, are stopped too.
+        """
+        end = time.perf_counter()
+        for position in range(len(self.running) - 1, -1, -1):
+            if self.running[position].name == timer_name:
+                break
+        else:
             raise TimerError(
                 f"timer {timer_name} is not running, use start() to start it."
             )
-        self.timers[timer_name] = time.perf_counter() - self.timers[timer_name]
-
-    def report(self) -> Dict[str, float]:
-        return self.timers
+        if self.track_memory:
+            self._update_peak_memory()
+        while len(self.running) > position:
+            span = self.running.pop()
+            elapsed = end - span.start
+            stats = self.stats.get(span.path)
+            if stats is None:
+                stats = self.stats[span.path] = SpanStats()
+            stats.add(elapsed, span.peak_memory if self.track_memory else None)
+            self.events.append((span.name, span.start - self.origin, elapsed))
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            PATH_SEPARATOR.join(path): stats.to_dict()
+            for path, stats in sorted(self.stats.items())
+        }
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": start * 1e6,
+                    "dur": elapsed * 1e6,
+                    "pid": pid,
+                    "tid": 0,
+                }
+                for name, start, elapsed in sorted(self.events, key=lambda e: e[1])
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def folded_stacks(self) -> str:
+        """Returns the self time of every timer path, in microseconds, one
+        `parent;child time` line per path."""
+        self_times = {path: stats.total for path, stats in self.stats.items()}
+        for path, stats in self.stats.items():
+            if path[:-1] in self_times:
+                self_times[path[:-1]] -= stats.total
+        return "".join(
+            f"{PATH_SEPARATOR.join(path)} {max(round(seconds * 1e6), 0)}\n"
+            for path, seconds in sorted(self_times.items())
+        )
 
 
 @dataclass
@@ -71,9 +230,14 @@ class Timer:
     def __init__(self):
         self.clock = Clock()
 
-    def enable(self):
-        """Enable the timer."""
-        self.clock = DefaultClock()
+    def enable(self, track_memory: bool = False):
+        """Enable the timer.
+
+        Args:
+            track_memory (bool): Measure the peak memory of every timer with
+                `tracemalloc`, which slows down the program.
+        """
+        self.clock = DefaultClock(track_memory)
 
     def is_enabled(self) -> bool:
         """Returns true if the timer is enabled."""
@@ -95,6 +259,14 @@ class Timer:
         """Returns the report provided by the clock implementation."""
         return self.clock.report()
 
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Returns the measured timers in the Chrome trace-event format."""
+        return self.clock.chrome_trace()
+
+    def folded_stacks(self) -> str:
+        """Returns the measured timers in the folded stacks format."""
+        return self.clock.folded_stacks()
+
 
 # Global timer
 timer = Timer()
@@ -115,9 +287,10 @@ def add_timer(timer_name: str):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             timer.start(timer_name)
-            value = func(*args, **kwargs)
-            timer.stop(timer_name)
-            return value
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timer.stop(timer_name)
 
         return wrapper
 
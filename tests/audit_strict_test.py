@@ -2,8 +2,12 @@
 Nada DSL audit component tests.
 """
 
+import subprocess
+import sys
+
 import richreports
 
+import nada_dsl
 from nada_dsl.audit.strict import strict
 
 
@@ -126,3 +130,9 @@ def nada_main():
     return outputs
 """
     assert isinstance(strict(source), richreports.report)
+
+
+def test_audit_imported_lazily():
+    code = "import sys, nada_dsl; assert 'nada_dsl.audit' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
+    assert nada_dsl.strict is strict
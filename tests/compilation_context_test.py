@@ -0,0 +1,57 @@
+"""
+Compilation context tests.
+"""
+
+# pylint: disable=missing-function-docstring
+
+from concurrent.futures import ThreadPoolExecutor
+from nada_dsl.ast_util import AST_OPERATIONS, next_operation_id
+from nada_dsl.compilation_context import CompilationContext, current_context
+from nada_dsl.compiler_frontend import nada_compile
+from nada_dsl.nada_types import Party
+from nada_dsl.nada_types.scalar_types import Integer, SecretInteger
+from nada_dsl.program_io import Input, Output
+
+
+def nada_main(size: int):
+    party = Party(name="Party1")
+    total = SecretInteger(Input(name="input_0", party=party))
+    for i in range(1, size):
+        total = total * SecretInteger(Input(name=f"input_{i}", party=party))
+    return [Output(total + Integer(size), "output", party)]
+
+
+def compile_in_context(size: int) -> str:
+    with CompilationContext():
+        return nada_compile(nada_main(size))
+
+
+def test_context_owns_compiler_state():
+    outer = current_context()
+    with CompilationContext() as context:
+        assert current_context() is context
+        assert next_operation_id() == 1
+        nada_main(3)
+        assert len(context.operations) > 0
+        assert len(context.source_refs) == 0
+        assert AST_OPERATIONS.target() is context.operations
+    assert current_context() is outer
+    assert len(context.operations) > 0
+
+
+def test_nested_contexts():
+    with CompilationContext() as first:
+        with CompilationContext() as second:
+            assert current_context() is second
+        assert current_context() is first
+
+
+def test_deterministic_ids():
+    assert compile_in_context(4) == compile_in_context(4)
+
+
+def test_thread_parallel_compilation():
+    sizes = [2, 3, 4, 5] * 4
+    expected = [compile_in_context(size) for size in sizes]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(compile_in_context, sizes)) == expected
@@ -0,0 +1,67 @@
+"""
+Batch compilation tests.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import json
+import os
+from nada_dsl import compile_batch as compile_batch_module
+from nada_dsl.compile_batch import find_programs, main, output_paths
+
+
+def get_test_programs_folder():
+    this_directory = os.path.dirname(os.path.realpath(__file__))
+    return os.path.realpath(os.path.join(this_directory, "..", "test-programs"))
+
+
+def test_find_programs(tmp_path):
+    os.mkdir(tmp_path / "nested")
+    (tmp_path / "nested" / "program.py").write_text("def nada_main():\n    pass\n")
+    (tmp_path / "helper.py").write_text("VALUE = 1\n")
+    programs = find_programs([str(tmp_path)])
+    assert programs == [str(tmp_path / "nested" / "program.py")]
+
+    assert output_paths(programs, "out") == [os.path.join("out", "program.mir.json")]
+
+
+def test_compile_batch(tmp_path):
+    output_dir = str(tmp_path / "target")
+    exit_code = main(
+        [get_test_programs_folder(), "-j", "2", "-o", output_dir, "--no-cache"]
+    )
+    assert exit_code == 1
+
+    with open(os.path.join(output_dir, "summary.json"), encoding="utf-8") as file:
+        summary = json.load(file)
+    results = {
+        os.path.basename(result["program"]): result for result in summary["programs"]
+    }
+    assert len(results) == 6
+    assert summary["failed"] == 1
+    assert results["nada_fn_literal.py"]["result"] == "Failure"
+    with open(results["sum_integers.py"]["output"], encoding="utf-8") as file:
+        mir = json.load(file)
+    assert mir["outputs"][0]["name"] == "my_output"
+    assert results["sum_integers.py"]["seconds"] > 0
+
+
+def test_compile_batch_options(tmp_path, monkeypatch):
+    calls = []
+
+    def compile_batch(programs, output_dir, **kwargs):
+        calls.append(kwargs["options"])
+        return {"succeeded": len(programs), "failed": 0, "seconds": 0, "programs": []}
+
+    monkeypatch.setattr(compile_batch_module, "compile_batch", compile_batch)
+    program = os.path.join(get_test_programs_folder(), "sum_integers.py")
+    output_dir = str(tmp_path / "target")
+    assert main([program, "-o", output_dir, "--cse", "--dce"]) == 0
+    assert calls == [
+        {
+            "cse": True,
+            "rebalance": False,
+            "source_ref_mode": "eager",
+            "eliminate_dead_operations": True,
+        }
+    ]
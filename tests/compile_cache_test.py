@@ -0,0 +1,164 @@
+"""
+Compilation cache tests.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import json
+import os
+import pytest
+from nada_dsl import compile as nada_compile_module
+from nada_dsl.ast_util import AST_OPERATIONS
+from nada_dsl.compile import compile_script
+from nada_dsl import compile_cache
+from nada_dsl.compile_cache import (
+    MirCache,
+    cache_key,
+    is_source_checkout,
+    local_module_paths,
+    nada_dsl_sources_digest,
+)
+from nada_dsl.compiler_frontend import FUNCTIONS, INPUTS, PARTIES
+
+
+@pytest.fixture(autouse=True)
+def clean_inputs():
+    PARTIES.clear()
+    INPUTS.clear()
+    FUNCTIONS.clear()
+    AST_OPERATIONS.clear()
+    yield
+
+
+def write(path, content: str) -> str:
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(content)
+    return str(path)
+
+
+def get_test_programs_folder():
+    this_directory = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(this_directory, "..", "test-programs")
+
+
+def test_local_module_paths(tmp_path):
+    write(tmp_path / "helpers.py", "from pkg import util\n")
+    os.mkdir(tmp_path / "pkg")
+    write(tmp_path / "pkg" / "__init__.py", "")
+    write(tmp_path / "pkg" / "util.py", "from . import other\nimport json\n")
+    write(tmp_path / "pkg" / "other.py", "")
+    main = write(tmp_path / "main.py", "import helpers\nfrom nada_dsl import *\n")
+
+    paths = [os.path.relpath(path, tmp_path) for path in local_module_paths(main)]
+    assert paths == [
+        "helpers.py",
+        "main.py",
+        os.path.join("pkg", "__init__.py"),
+        os.path.join("pkg", "other.py"),
+        os.path.join("pkg", "util.py"),
+    ]
+
+
+def test_cache_key_depends_on_imported_modules(tmp_path):
+    helper = write(tmp_path / "helpers.py", "VALUE = 1\n")
+    main = write(tmp_path / "main.py", "from helpers import VALUE\n")
+    key = cache_key(main)
+    assert key == cache_key(main)
+    assert key != cache_key(main, {"option": True})
+
+    write(helper, "VALUE = 2\n")
+    assert key != cache_key(main)
+
+
+def test_nada_dsl_sources_digest(tmp_path):
+    package_dir = tmp_path / "nada_dsl"
+    os.mkdir(package_dir)
+    source = write(package_dir / "compiler.py", "VALUE = 1\n")
+    assert not is_source_checkout(str(package_dir))
+    write(tmp_path / "pyproject.toml", "")
+    assert is_source_checkout(str(package_dir))
+
+    digest = nada_dsl_sources_digest(str(package_dir))
+    write(source, "VALUE = 2\n")
+    nada_dsl_sources_digest.cache_clear()
+    assert nada_dsl_sources_digest(str(package_dir)) != digest
+
+
+def test_cache_key_depends_on_nada_dsl_sources(tmp_path, monkeypatch):
+    main = write(tmp_path / "main.py", "VALUE = 1\n")
+    monkeypatch.setattr(compile_cache, "is_source_checkout", lambda: True)
+    monkeypatch.setattr(compile_cache, "nada_dsl_sources_digest", lambda: "before")
+    key = cache_key(main)
+    monkeypatch.setattr(compile_cache, "nada_dsl_sources_digest", lambda: "after")
+    assert key != cache_key(main)
+    # Installed distributions are identified by their version only
+    monkeypatch.setattr(compile_cache, "is_source_checkout", lambda: False)
+    key = cache_key(main)
+    monkeypatch.setattr(compile_cache, "nada_dsl_sources_digest", lambda: "before")
+    assert key == cache_key(main)
+
+
+def test_compile_script_uses_cache(tmp_path, monkeypatch):
+    cache = MirCache(str(tmp_path))
+    program = os.path.join(get_test_programs_folder(), "sum_integers.py")
+    mir = compile_script(program, cache=cache).mir
+
+    def fail(_outputs):
+        raise AssertionError("the program should not be compiled")
+
+    monkeypatch.setattr(nada_compile_module, "nada_compile", fail)
+    assert compile_script(program, cache=cache).mir == mir
+    stats = cache.stats()
+    assert (stats.entries, stats.hits, stats.misses) == (1, 1, 1)
+    assert json.loads(mir)["outputs"][0]["name"] == "my_output"
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = MirCache(str(tmp_path), max_size=25)
+    cache.put("first", "0123456789")
+    cache.put("second", "0123456789")
+    os.utime(tmp_path / "first.mir.json", (0, 0))
+    os.utime(tmp_path / "second.mir.json", (1, 1))
+    # Refresh the first entry so the second one is the least recently used.
+    assert cache.get("first") == "0123456789"
+    cache.put("third", "0123456789")
+
+    assert cache.get("second") is None
+    assert cache.get("third") == "0123456789"
+    stats = cache.stats()
+    assert stats.entries == 2
+    assert stats.size == 20
+    assert stats.evictions == 1
+
+
+def test_unwritable_cache(tmp_path):
+    # The cache directory cannot be created below a regular file
+    write(tmp_path / "file", "")
+    cache = MirCache(str(tmp_path / "file" / "cache"))
+    program = os.path.join(get_test_programs_folder(), "sum_integers.py")
+
+    for _ in range(2):
+        mir = compile_script(program, cache=cache).mir
+        assert json.loads(mir)["outputs"][0]["name"] == "my_output"
+    assert cache.stats().entries == 0
+
+
+def test_entries_removed_by_another_process(tmp_path, monkeypatch):
+    cache = MirCache(str(tmp_path), max_size=15)
+    cache.put("first", "0123456789")
+    cache.put("second", "0123456789")
+    entries = cache._entries()  # pylint: disable=protected-access
+    # Another process evicts the entries after they are listed
+    for entry in entries:
+        os.unlink(entry.path)
+    monkeypatch.setattr(cache, "_entries", lambda: entries)
+    assert cache.evict() == 0
+    assert cache.stats().entries == 0
+
+    def evicted_utime(path, *_args):
+        raise FileNotFoundError(path)
+
+    monkeypatch.undo()
+    cache.put("third", "0123456789")
+    monkeypatch.setattr(os, "utime", evicted_utime)
+    assert cache.get("third") == "0123456789"
@@ -0,0 +1,114 @@
+"""
+Compile server tests.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import base64
+import io
+import json
+import os
+import socket
+import socketserver
+import threading
+import pytest
+from nada_dsl.ast_util import AST_OPERATIONS
+from nada_dsl.compile_server import CompileRequestHandler, handle_request, serve_stream
+from nada_dsl.compiler_frontend import FUNCTIONS, INPUTS, PARTIES
+
+
+@pytest.fixture(autouse=True)
+def clean_inputs():
+    PARTIES.clear()
+    INPUTS.clear()
+    FUNCTIONS.clear()
+    AST_OPERATIONS.clear()
+    yield
+
+
+PROGRAM = """
+from nada_dsl import *
+
+def nada_main():
+    party1 = Party(name="Party1")
+    my_int1 = SecretInteger(Input(name="my_int1", party=party1))
+    my_int2 = SecretInteger(Input(name="my_int2", party=party1))
+    return [Output(my_int1 * my_int2, "my_output", party1)]
+"""
+
+
+def get_test_programs_folder():
+    this_directory = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(this_directory, "..", "test-programs")
+
+
+def test_requests_are_isolated():
+    request = {
+        "id": 1,
+        "method": "compile_script",
+        "path": os.path.join(get_test_programs_folder(), "sum_integers.py"),
+    }
+    first = handle_request(request)
+    second = handle_request(request)
+    assert first["result"] == "Success"
+    # The operation ids and source references restart for every request.
+    assert first == second
+    assert len(AST_OPERATIONS) == 0
+
+
+def test_program_is_reloaded(tmp_path):
+    path = tmp_path / "program.py"
+    path.write_text(PROGRAM, encoding="utf-8")
+    request = {"id": 1, "method": "compile_script", "path": str(path)}
+    first = json.loads(handle_request(request)["mir"])
+    path.write_text(PROGRAM.replace("my_int1 * my_int2", "my_int1"), encoding="utf-8")
+    second = json.loads(handle_request(request)["mir"])
+    assert len(first["operations"]) == 3
+    assert len(second["operations"]) == 1
+
+
+def test_serve_stream():
+    program = base64.b64encode(PROGRAM.encode("utf-8")).decode("utf-8")
+    requests = [
+        {"id": "a", "method": "compile_string", "program": program},
+        {"id": "b", "method": "unknown"},
+    ]
+    rfile = io.StringIO("\n".join(json.dumps(request) for request in requests))
+    wfile = io.StringIO()
+    serve_stream(rfile, wfile)
+
+    responses = [json.loads(line) for line in wfile.getvalue().splitlines()]
+    assert [response["id"] for response in responses] == ["a", "b"]
+    assert responses[0]["result"] == "Success"
+    assert len(json.loads(responses[0]["mir"])["operations"]) == 3
+    assert responses[1]["result"] == "Failure"
+    assert responses[1]["reason"] == "unknown method: unknown"
+
+
+def test_serve_stream_invalid_requests():
+    lines = ["[1]", '"x"', "null", "{", json.dumps({"id": "a", "method": "?"})]
+    wfile = io.StringIO()
+    serve_stream(io.StringIO("\n".join(lines)), wfile)
+
+    responses = [json.loads(line) for line in wfile.getvalue().splitlines()]
+    assert [response["result"] for response in responses] == ["Failure"] * 5
+    assert [response["id"] for response in responses] == [None] * 4 + ["a"]
+    assert responses[0]["reason"] == "the request is not a JSON object"
+
+
+def test_serve_unix_socket(tmp_path):
+    socket_path = str(tmp_path / "nada.sock")
+    server = socketserver.UnixStreamServer(socket_path, CompileRequestHandler)
+    thread = threading.Thread(target=server.handle_request)
+    thread.start()
+    program = base64.b64encode(PROGRAM.encode("utf-8")).decode("utf-8")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        request = {"id": 7, "method": "compile_string", "program": program}
+        client.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        client.shutdown(socket.SHUT_WR)
+        response = json.loads(client.makefile("r", encoding="utf-8").readline())
+    thread.join()
+    server.server_close()
+    assert response["id"] == 7
+    assert response["result"] == "Success"
@@ -7,7 +7,14 @@ import os
 import json
 import pytest
 from nada_dsl.ast_util import AST_OPERATIONS
-from nada_dsl.compile import compile_script, compile_string, print_output
+from nada_dsl.compile import (
+    compile_script,
+    compile_string,
+    isolated_compilation,
+    load_script,
+    print_output,
+    write_mir,
+)
 from nada_dsl.compiler_frontend import FUNCTIONS, INPUTS, PARTIES
 from nada_dsl.errors import NotAllowedException
 
@@ -188,3 +195,15 @@ def test_compile_ntuple():
 def test_compile_object():
     mir_str = compile_script(f"{get_test_programs_folder()}/object_accessor.py").mir
     assert mir_str != ""
+
+
+@pytest.mark.parametrize("program", ["map_simple.py", "nada_fn_simple.py"])
+def test_write_mir(program, tmp_path):
+    script_path = f"{get_test_programs_folder()}/{program}"
+    with isolated_compilation():
+        expected = json.loads(compile_script(script_path).mir)
+    mir_path = tmp_path / "program.mir.json"
+    with isolated_compilation():
+        write_mir(load_script(script_path), str(mir_path))
+    with open(mir_path, encoding="utf-8") as mir_file:
+        assert json.load(mir_file) == expected
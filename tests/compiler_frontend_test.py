@@ -4,17 +4,23 @@ Compiler frontend tests.
 
 # pylint: disable=missing-function-docstring
 
+import array as pyarray
 import operator
 from typing import Any
 import pytest
+from nada_dsl.compilation_context import CompilationContext
 from nada_dsl.ast_util import (
     AST_OPERATIONS,
+    ArrayAccessorASTOperation,
     BinaryASTOperation,
     InputASTOperation,
     LiteralASTOperation,
     NadaFunctionASTOperation,
+    NadaFunctionCallASTOperation,
     ReduceASTOperation,
     UnaryASTOperation,
+    pack_literal_block,
+    unpack_literal_block,
 )
 
 # pylint: disable=wildcard-import,unused-wildcard-import
@@ -29,6 +35,7 @@ from nada_dsl.compiler_frontend import (
     FUNCTIONS,
     traverse_and_process_operations,
 )
+from nada_dsl.errors import IncompatibleTypesError, InvalidTypeError
 from nada_dsl.nada_types import AllTypes, Party
 from nada_dsl.nada_types.collections import Array, Tuple, NTuple, Object, unzip
 from nada_dsl.nada_types.function import NadaFunctionArg, NadaFunctionCall, nada_fn
@@ -484,6 +491,375 @@ def test_array_new_same_type():
     assert str(e.value) == "All arguments must be of the same type"
 
 
+@pytest.mark.parametrize(
+    ("binary_operator", "name", "inner_type"),
+    [
+        (operator.add, "ElementwiseAddition", "SecretInteger"),
+        (operator.sub, "ElementwiseSubtraction", "SecretInteger"),
+        (operator.mul, "ElementwiseMultiplication", "SecretInteger"),
+        (operator.lt, "ElementwiseLessThan", "SecretBoolean"),
+        (operator.gt, "ElementwiseGreaterThan", "SecretBoolean"),
+        (operator.le, "ElementwiseLessOrEqualThan", "SecretBoolean"),
+        (operator.ge, "ElementwiseGreaterOrEqualThan", "SecretBoolean"),
+        (operator.eq, "ElementwiseEquals", "SecretBoolean"),
+        (operator.ne, "ElementwiseNotEquals", "SecretBoolean"),
+    ],
+)
+def test_array_elementwise_operation(binary_operator, name, inner_type):
+    left = create_collection(Array, create_input(SecretInteger, "left", "party"), 3)
+    right = create_collection(Array, create_input(PublicInteger, "right", "party"), 3)
+    result = binary_operator(left, right)
+
+    assert isinstance(result, Array)
+    op = process_operation(AST_OPERATIONS[result.child.id], {}).mir
+    assert list(op.keys()) == [name]
+    child = op[name]
+    assert (
+        input_reference(process_operation(AST_OPERATIONS[child["left"]], {}).mir)
+        == "left"
+    )
+    assert child["type"] == {"Array": {"inner_type": inner_type, "size": 3}}
+
+
+def test_array_elementwise_operation_with_scalar():
+    array = create_collection(Array, create_input(PublicInteger, "array", "party"), 3)
+    scalar = create_input(SecretInteger, "scalar", "party")
+    result = array * scalar
+
+    op = process_operation(AST_OPERATIONS[result.child.id], {}).mir
+    child = op["ElementwiseMultiplication"]
+    assert isinstance(AST_OPERATIONS[child["right"]], InputASTOperation)
+    assert child["type"] == {"Array": {"inner_type": "SecretInteger", "size": 3}}
+
+
+@pytest.mark.parametrize(
+    ("binary_operator", "name", "scalar_side", "inner_type"),
+    [
+        (lambda s, a: s + a, "ElementwiseAddition", "left", "SecretInteger"),
+        (lambda s, a: s - a, "ElementwiseSubtraction", "left", "SecretInteger"),
+        (lambda s, a: s * a, "ElementwiseMultiplication", "left", "SecretInteger"),
+        (lambda s, a: s < a, "ElementwiseGreaterThan", "right", "SecretBoolean"),
+        (lambda s, a: s >= a, "ElementwiseLessOrEqualThan", "right", "SecretBoolean"),
+        (lambda s, a: s == a, "ElementwiseEquals", "right", "SecretBoolean"),
+        (lambda s, a: s != a, "ElementwiseNotEquals", "right", "SecretBoolean"),
+    ],
+)
+def test_array_elementwise_operation_with_scalar_on_the_left(
+    binary_operator, name, scalar_side, inner_type
+):
+    array = create_collection(Array, create_input(PublicInteger, "array", "party"), 3)
+    scalar = create_input(SecretInteger, "scalar", "party")
+    result = binary_operator(scalar, array)
+
+    assert isinstance(result, Array)
+    op = process_operation(AST_OPERATIONS[result.child.id], {}).mir
+    assert list(op.keys()) == [name]
+    child = op[name]
+    assert isinstance(AST_OPERATIONS[child[scalar_side]], InputASTOperation)
+    assert child["type"] == {"Array": {"inner_type": inner_type, "size": 3}}
+
+
+def test_array_elementwise_operation_invalid():
+    integers = create_collection(Array, create_input(SecretInteger, "a", "party"), 3)
+    shorter = create_collection(Array, create_input(SecretInteger, "b", "party"), 2)
+    unsigned = create_collection(
+        Array, create_input(SecretUnsignedInteger, "c", "party"), 3
+    )
+    booleans = create_collection(Array, create_input(SecretBoolean, "d", "party"), 3)
+
+    with pytest.raises(IncompatibleTypesError):
+        integers + shorter
+    with pytest.raises(TypeError):
+        integers + unsigned
+    with pytest.raises(TypeError):
+        booleans * booleans
+    with pytest.raises(InvalidTypeError):
+        integers.zip(integers) + integers
+    with pytest.raises(TypeError):
+        create_input(SecretUnsignedInteger, "e", "party") * integers
+    with pytest.raises(TypeError):
+        integers == unsigned  # pylint: disable=pointless-statement
+    with pytest.raises(IncompatibleTypesError):
+        integers != shorter  # pylint: disable=pointless-statement
+
+
+def test_array_equality_with_other_objects():
+    array = create_collection(Array, create_input(SecretInteger, "a", "party"), 3)
+    assert (array == None) is False  # pylint: disable=singleton-comparison
+    assert array != "array"
+    assert array in [array]
+    assert {array: 1}[array] == 1
+
+
+def create_matrix(cls, name: str, rows: int, columns: int) -> Array:
+    return Array(Array(create_input(cls, name, "party"), size=columns), size=rows)
+
+
+@pytest.mark.parametrize(
+    ("left_shape", "right_shape", "result_type"),
+    [
+        (
+            (2, 3),
+            (3, 4),
+            {
+                "Array": {
+                    "inner_type": {"Array": {"inner_type": "SecretInteger", "size": 4}},
+                    "size": 2,
+                }
+            },
+        ),
+        ((2, 3), (3,), {"Array": {"inner_type": "SecretInteger", "size": 2}}),
+        ((2,), (2, 3), {"Array": {"inner_type": "SecretInteger", "size": 3}}),
+    ],
+)
+def test_matrix_product(left_shape, right_shape, result_type):
+    def create_operand(name, shape):
+        if len(shape) == 2:
+            return create_matrix(SecretInteger, name, *shape)
+        return create_collection(
+            Array, create_input(SecretInteger, name, "party"), shape[0]
+        )
+
+    left = create_operand("left", left_shape)
+    right = create_operand("right", right_shape)
+
+    assert left.shape() == left_shape
+    result = left @ right
+    op = process_operation(AST_OPERATIONS[result.child.id], {}).mir
+    assert list(op.keys()) == ["MatrixProduct"]
+    assert op["MatrixProduct"]["type"] == result_type
+    assert left.dot(right).to_mir() == left.matmul(right).to_mir() == result_type
+
+
+def test_matrix_product_of_vectors():
+    left = create_collection(Array, create_input(SecretInteger, "left", "party"), 3)
+    right = create_collection(Array, create_input(SecretInteger, "right", "party"), 3)
+    result = left @ right
+
+    assert isinstance(result, SecretInteger)
+    op = process_operation(AST_OPERATIONS[result.child.id], {}).mir
+    assert list(op.keys()) == ["InnerProduct"]
+
+
+def test_matrix_product_invalid_shapes():
+    left = create_matrix(SecretInteger, "left", 2, 3)
+    right = create_matrix(SecretInteger, "right", 2, 3)
+    with pytest.raises(IncompatibleTypesError) as e:
+        left @ right
+    assert str(e.value) == "Cannot multiply arrays of shapes (2, 3) and (2, 3)"
+
+    cube = Array(create_matrix(SecretInteger, "cube", 3, 3), size=3)
+    with pytest.raises(InvalidTypeError):
+        cube @ left
+    with pytest.raises(TypeError):
+        left @ create_matrix(SecretUnsignedInteger, "unsigned", 3, 2)
+
+
+def operation_depth(operation_id: int, name: str) -> int:
+    """Number of nested `name` operations below an operation."""
+    operation = AST_OPERATIONS[operation_id]
+    if not isinstance(operation, BinaryASTOperation) or operation.name != name:
+        return 0
+    return 1 + max(
+        operation_depth(operation.left, name), operation_depth(operation.right, name)
+    )
+
+
+@pytest.mark.parametrize(
+    ("method", "input_type", "name"),
+    [
+        ("sum", SecretInteger, "Addition"),
+        ("product", SecretInteger, "Multiplication"),
+        ("all", SecretBoolean, "BooleanAnd"),
+        ("any", PublicBoolean, "BooleanOr"),
+    ],
+)
+def test_array_tree_reduction(method, input_type, name):
+    array = create_collection(Array, create_input(input_type, "array", "party"), 9)
+    result = getattr(array, method)()
+
+    assert isinstance(result, input_type)
+    op = process_operation(AST_OPERATIONS[result.child.id], {}).mir
+    assert list(op.keys()) == [name]
+    # 9 elements are reduced in ceil(log2(9)) levels
+    assert operation_depth(result.child.id, name) == 4
+    accessors = [
+        operation
+        for operation in AST_OPERATIONS.values()
+        if isinstance(operation, ArrayAccessorASTOperation)
+    ]
+    assert sorted(accessor.index for accessor in accessors) == list(range(9))
+    assert {accessor.source for accessor in accessors} == {array.child.id}
+
+
+@pytest.mark.parametrize(
+    "array",
+    [
+        lambda: Array.new(Integer(1), Integer(2), Integer(3)),
+        lambda: Array.from_literals([1, 2, 3]),
+        lambda: Array.literal_block([1, 2, 3]),
+    ],
+)
+def test_array_tree_reduction_of_literals(array):
+    party = Party(name="party")
+    array = array()
+    total = array.sum()
+    product = array.product()
+
+    assert isinstance(total, PublicInteger)
+    assert isinstance(product, PublicInteger)
+    mir = nada_dsl_to_nada_mir([Output(total + product, "result", party)])
+    accessors = [
+        operation["ArrayAccessor"]
+        for operation in mir["operations"].values()
+        if "ArrayAccessor" in operation
+    ]
+    assert {accessor["type"] for accessor in accessors} == {"Integer"}
+
+    booleans = Array.from_literals([True, False], element_type=Boolean)
+    assert isinstance(booleans.all(), PublicBoolean)
+    assert isinstance(booleans.any(), PublicBoolean)
+
+
+def test_associative_reduce_of_literals():
+    @nada_fn(associative=True)
+    def add(left: PublicInteger, right: PublicInteger) -> PublicInteger:
+        return left + right
+
+    initial = create_input(PublicInteger, "initial", "party")
+    result = Array.from_literals([1, 2, 3]).reduce(add, initial)
+
+    assert isinstance(result, PublicInteger)
+    assert isinstance(AST_OPERATIONS[result.child.id], NadaFunctionCallASTOperation)
+
+
+def test_array_tree_reduction_invalid():
+    integers = create_collection(Array, create_input(SecretInteger, "a", "party"), 3)
+    booleans = create_collection(Array, create_input(SecretBoolean, "b", "party"), 3)
+    with pytest.raises(TypeError):
+        integers.all()
+    with pytest.raises(TypeError):
+        booleans.sum()
+    with pytest.raises(InvalidTypeError):
+        integers.zip(integers).sum()
+
+
+def test_associative_reduce():
+    array = create_collection(Array, create_input(SecretInteger, "array", "party"), 4)
+    initial = create_input(SecretInteger, "initial", "party")
+
+    @nada_fn(associative=True)
+    def multiply(left: SecretInteger, right: SecretInteger) -> SecretInteger:
+        return left * right
+
+    assert multiply.associative
+    result = array.reduce(multiply, initial)
+
+    call = AST_OPERATIONS[result.child.id]
+    assert isinstance(call, NadaFunctionCallASTOperation)
+    assert call.fn == multiply.id
+    assert isinstance(AST_OPERATIONS[call.args[0]], InputASTOperation)
+    # ((a[0] * a[1]) * (a[2] * a[3]))
+    tree = AST_OPERATIONS[call.args[1]]
+    assert isinstance(tree, NadaFunctionCallASTOperation)
+    left, right = (AST_OPERATIONS[arg] for arg in tree.args)
+    assert [AST_OPERATIONS[arg].index for arg in left.args] == [0, 1]
+    assert [AST_OPERATIONS[arg].index for arg in right.args] == [2, 3]
+
+
+def test_array_from_literals():
+    array = Array.from_literals(pyarray.array("q", [3, -1, 3]))
+
+    assert array.to_mir() == {"Array": {"inner_type": "Integer", "size": 3}}
+    op = process_operation(AST_OPERATIONS[array.child.id], {}).mir
+    elements = op["New"]["elements"]
+    # Equal values share the same literal
+    assert elements[0] == elements[2]
+    literals = [AST_OPERATIONS[element] for element in elements]
+    assert all(isinstance(literal, LiteralASTOperation) for literal in literals)
+    assert [literal.value for literal in literals] == [3, -1, 3]
+    assert {literal.ty for literal in literals} == {"Integer"}
+
+    booleans = Array.from_literals([1, 0], element_type=Boolean)
+    elements = AST_OPERATIONS[booleans.child.id].elements
+    assert [AST_OPERATIONS[element].value for element in elements] == [True, False]
+
+
+def test_array_from_literals_invalid():
+    with pytest.raises(TypeError):
+        Array.from_literals([1.5])
+    with pytest.raises(ValueError):
+        Array.from_literals([1, -1], element_type=UnsignedInteger)
+    with pytest.raises(ValueError):
+        Array.from_literals(range(0))
+    with pytest.raises(InvalidTypeError):
+        Array.from_literals([1], element_type=SecretInteger)
+
+
+def test_array_literal_block():
+    party = Party(name="party")
+    values = [2**63 - 1, -(2**63), 0, 5]
+    first = Array.literal_block(values)
+    second = Array.literal_block(pyarray.array("q", values))
+    unsigned = Array.literal_block(range(3), element_type=UnsignedInteger)
+    mir = nada_dsl_to_nada_mir(
+        [
+            Output(first, "first", party),
+            Output(second, "second", party),
+            Output(unsigned, "unsigned", party),
+        ]
+    )
+
+    assert isinstance(first.child.values, pyarray.array)
+    # Equal blocks are interned into the same literal
+    literals = sorted(mir["literals"], key=lambda literal: int(literal["name"]))
+    assert len(literals) == 2
+    assert literals[0]["type"] == {"Array": {"inner_type": "Integer", "size": 4}}
+    assert list(unpack_literal_block(literals[0]["value"])) == values
+    assert literals[1]["type"] == {
+        "Array": {"inner_type": "UnsignedInteger", "size": 3}
+    }
+    assert list(unpack_literal_block(literals[1]["value"], "Q")) == [0, 1, 2]
+    references = [
+        operation["LiteralReference"]
+        for operation in mir["operations"].values()
+        if "LiteralReference" in operation
+    ]
+    assert len(references) == 3
+
+
+def test_pack_literal_block():
+    values = pyarray.array("q", [1, -2])
+    assert pack_literal_block(values) == "AQAAAAAAAAD+/////////w=="
+    assert unpack_literal_block(pack_literal_block(values)) == values
+
+
+def test_array_literal_block_invalid():
+    with pytest.raises(TypeError):
+        Array.literal_block([1.5])
+    with pytest.raises(OverflowError):
+        Array.literal_block([-1], element_type=UnsignedInteger)
+    with pytest.raises(ValueError):
+        Array.literal_block([])
+    with pytest.raises(InvalidTypeError):
+        Array.literal_block([True], element_type=Boolean)
+
+
+def test_array_from_inputs():
+    party = Party("party")
+    array = Array.from_inputs(SecretInteger, party, "x", 3, start=1)
+
+    assert array.to_mir() == {"Array": {"inner_type": "SecretInteger", "size": 3}}
+    op = process_operation(AST_OPERATIONS[array.child.id], {}).mir
+    inputs = [AST_OPERATIONS[element] for element in op["New"]["elements"]]
+    assert [program_input.name for program_input in inputs] == ["x1", "x2", "x3"]
+    assert {program_input.ty for program_input in inputs} == {"SecretInteger"}
+    assert {program_input.party.name for program_input in inputs} == {"party"}
+
+    with pytest.raises(InvalidTypeError):
+        Array.from_inputs(Integer, party, "x", 3)
+
+
 def test_tuple_new():
     first_input = create_input(SecretInteger, "first", "party", **{})
     second_input = create_input(PublicInteger, "second", "party", **{})
@@ -668,3 +1044,23 @@ def test_not():
     bool1 = Boolean(True)
     bool2 = ~bool1
     assert bool2 == Boolean(False)
+
+
+def test_literal_interning():
+    party = Party(name="party")
+    total = SecretInteger(Input(name="a", party=party))
+    for value in [1, 2, 1, 2, 3]:
+        total = total + Integer(value)
+    mir = nada_dsl_to_nada_mir([Output(total, "total", party)])
+    literals = [(literal["value"], literal["type"]) for literal in mir["literals"]]
+    assert sorted(literals) == [("1", "Integer"), ("2", "Integer"), ("3", "Integer")]
+
+
+def test_literal_indexes_reset_between_compilations():
+    party = Party(name="party")
+    for value in [5, 7]:
+        with CompilationContext() as context:
+            secret = SecretInteger(Input(name="a", party=party)) + Integer(value)
+            mir = nada_dsl_to_nada_mir([Output(secret, "total", party)])
+            assert list(context.literal_indexes) == [(int, value, "Integer")]
+        assert [literal["name"] for literal in mir["literals"]] == ["0"]
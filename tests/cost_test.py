@@ -0,0 +1,103 @@
+"""
+Cost estimation tests.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import json
+from nada_dsl.compilation_context import CompilationContext
+from nada_dsl.compiler_frontend import nada_compile, nada_dsl_to_nada_mir
+from nada_dsl.cost import estimate_cost
+from nada_dsl.nada_types import Party
+from nada_dsl.nada_types.collections import Array
+from nada_dsl.nada_types.function import nada_fn
+from nada_dsl.nada_types.scalar_types import Integer, SecretInteger
+from nada_dsl.program_io import Input, Output
+
+
+def scalar_program():
+    party = Party(name="Party1")
+    a = SecretInteger(Input(name="a", party=party))
+    b = SecretInteger(Input(name="b", party=party))
+    product = a * b * a
+    scaled = product * Integer(3)
+    return [
+        Output(scaled, "product", party),
+        Output((product < b).if_else(a, b), "select", party),
+    ]
+
+
+def array_program():
+    party = Party(name="Party1")
+    array = Array(SecretInteger(Input(name="array", party=party)), size=4)
+    factor = SecretInteger(Input(name="factor", party=party))
+
+    @nada_fn
+    def multiply(left: SecretInteger, right: SecretInteger) -> SecretInteger:
+        return left * right
+
+    @nada_fn
+    def scale(value: SecretInteger) -> SecretInteger:
+        return value * factor
+
+    return [
+        Output(array.map(scale), "scaled", party),
+        Output(array.reduce(multiply, factor), "product", party),
+    ]
+
+
+def test_scalar_cost():
+    with CompilationContext():
+        report = estimate_cost(nada_dsl_to_nada_mir(scalar_program()))
+    assert report.counts["secret_multiplications"] == 3
+    assert report.counts["comparisons"] == 1
+    assert report.counts["trunc_pr"] == 0
+    # a * b, * a, < b, if_else
+    assert report.depth == 4
+
+
+def test_map_reduce_cost():
+    with CompilationContext():
+        report = estimate_cost(json.loads(nada_compile(array_program())))
+    assert report.counts["secret_multiplications"] == 8
+    # The reduce multiplies the four elements sequentially
+    assert report.depth == 4
+    assert report.to_dict()["counts"] == report.counts
+
+
+def test_elementwise_cost():
+    with CompilationContext():
+        party = Party(name="Party1")
+        left = Array(SecretInteger(Input(name="left", party=party)), size=4)
+        right = Array(SecretInteger(Input(name="right", party=party)), size=4)
+        report = estimate_cost(
+            nada_dsl_to_nada_mir([Output(left * right < right, "less", party)])
+        )
+    assert report.counts["secret_multiplications"] == 4
+    assert report.counts["comparisons"] == 4
+    # All the elements are multiplied, then compared, in the same round
+    assert report.depth == 2
+
+
+def test_matrix_product_cost():
+    with CompilationContext():
+        party = Party(name="Party1")
+        matrix = Array(Array(SecretInteger(Input(name="m", party=party)), 3), 2)
+        vector = Array(SecretInteger(Input(name="v", party=party)), size=3)
+        report = estimate_cost(
+            nada_dsl_to_nada_mir([Output(matrix @ vector, "product", party)])
+        )
+    assert report.counts["secret_multiplications"] == 6
+    assert report.depth == 1
+
+
+def test_tree_reduction_cost():
+    with CompilationContext():
+        party = Party(name="Party1")
+        array = Array(SecretInteger(Input(name="array", party=party)), size=8)
+        report = estimate_cost(
+            nada_dsl_to_nada_mir([Output(array.product(), "product", party)])
+        )
+    assert report.counts["secret_multiplications"] == 7
+    # log2(8) rounds instead of 8 for a Reduce
+    assert report.depth == 3
@@ -0,0 +1,87 @@
+"""
+Common subexpression elimination tests.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import json
+from nada_dsl.compilation_context import CompilationContext
+from nada_dsl.compiler_frontend import nada_compile
+from nada_dsl.nada_types import Party
+from nada_dsl.nada_types.scalar_types import Integer, SecretInteger, UnsignedInteger
+from nada_dsl.program_io import Input, Output
+
+
+def repeated_products():
+    party = Party(name="Party1")
+    a = SecretInteger(Input(name="a", party=party))
+    b = SecretInteger(Input(name="b", party=party))
+    return [
+        Output(a * b, "first", party),
+        Output(a * b, "second", party),
+        Output(b * a, "third", party),
+    ]
+
+
+def repeated_truncations():
+    party = Party(name="Party1")
+    a = SecretInteger(Input(name="a", party=party))
+    return [
+        Output(a.trunc_pr(UnsignedInteger(2)), "first", party),
+        Output(a.trunc_pr(UnsignedInteger(2)), "second", party),
+    ]
+
+
+def repeated_literal_products():
+    party = Party(name="Party1")
+    a = SecretInteger(Input(name="a", party=party))
+    return [
+        Output(a * Integer(2), "first", party),
+        Output(a * Integer(2), "second", party),
+    ]
+
+
+def count_operations(mir: str, name: str) -> int:
+    operations = json.loads(mir)["operations"].values()
+    return sum(1 for operation in operations if name in operation)
+
+
+def test_cse_deduplicates_commutative_operations():
+    with CompilationContext(cse=True) as context:
+        mir = nada_compile(repeated_products())
+    assert count_operations(mir, "Multiplication") == 1
+    assert context.deduplicated_operations == 2
+    outputs = json.loads(mir)["outputs"]
+    assert len({output["operation_id"] for output in outputs}) == 1
+
+
+def test_cse_disabled_by_default():
+    with CompilationContext() as context:
+        mir = nada_compile(repeated_products())
+    assert count_operations(mir, "Multiplication") == 3
+    assert context.deduplicated_operations == 0
+
+
+def test_cse_keeps_randomized_operations():
+    with CompilationContext(cse=True) as context:
+        mir = nada_compile(repeated_truncations())
+    assert count_operations(mir, "TruncPr") == 2
+    # Only the literal operand is shared
+    assert count_operations(mir, "LiteralReference") == 1
+    assert context.deduplicated_operations == 1
+
+
+def test_cse_option():
+    assert CompilationContext(cse=True).options() != CompilationContext().options()
+
+
+def test_cse_deduplicates_literal_operands():
+    with CompilationContext():
+        mir = nada_compile(repeated_literal_products())
+    assert count_operations(mir, "Multiplication") == 2
+    assert count_operations(mir, "LiteralReference") == 2
+    with CompilationContext(cse=True):
+        mir = nada_compile(repeated_literal_products())
+    assert count_operations(mir, "Multiplication") == 1
+    assert count_operations(mir, "LiteralReference") == 1
+    assert len(json.loads(mir)["literals"]) == 1
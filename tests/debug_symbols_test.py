@@ -0,0 +1,129 @@
+"""
+Debug symbols tests.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import json
+import os
+import pytest
+from nada_dsl.compile import (
+    compile_script,
+    isolated_compilation,
+    parse_args,
+    strip_debug_symbols,
+)
+from nada_dsl.compilation_context import CompilationContext
+from nada_dsl.compiler_frontend import nada_dsl_to_nada_mir
+from nada_dsl.debug_symbols import join_debug_symbols, strip_mir
+from nada_dsl.nada_types import Party
+from nada_dsl.nada_types.scalar_types import SecretInteger
+from nada_dsl.program_io import Input, Output
+from nada_dsl.source_ref import EMPTY_SOURCE_REF
+
+PROGRAMS = os.path.join(os.path.dirname(__file__), "..", "test-programs")
+
+
+def compile_program(program: str):
+    with isolated_compilation():
+        return json.loads(compile_script(os.path.join(PROGRAMS, program)).mir)
+
+
+def source_ref_indexes(mir):
+    indexes = [
+        next(iter(operation.values()))["source_ref_index"]
+        for operation in mir["operations"].values()
+    ]
+    for function in mir["functions"]:
+        indexes.append(function["source_ref_index"])
+        indexes.extend(arg["source_ref_index"] for arg in function["args"])
+        indexes.extend(
+            next(iter(operation.values()))["source_ref_index"]
+            for operation in function["operations"].values()
+        )
+    for section in ("parties", "inputs", "outputs"):
+        indexes.extend(element["source_ref_index"] for element in mir[section])
+    return indexes
+
+
+@pytest.mark.parametrize("program", ["map_simple.py", "nada_fn_simple.py"])
+def test_strip_source_files(program):
+    mir = compile_program(program)
+    stripped, symbols = strip_mir(mir)
+    assert mir["source_files"]
+    assert stripped["source_files"] == {}
+    assert stripped["source_refs"] == mir["source_refs"]
+    assert symbols["source_files"] == mir["source_files"]
+    assert join_debug_symbols(stripped, symbols) == mir
+
+
+@pytest.mark.parametrize("program", ["map_simple.py", "nada_fn_simple.py"])
+def test_strip_source_refs(program):
+    mir = compile_program(program)
+    stripped, symbols = strip_mir(mir, drop_source_refs=True)
+    assert stripped["source_refs"] == [EMPTY_SOURCE_REF.to_value()]
+    assert set(source_ref_indexes(stripped)) == {0}
+    assert set(source_ref_indexes(mir)) != {0}
+    # The debug symbols survive a JSON round trip
+    symbols = json.loads(json.dumps(symbols))
+    assert join_debug_symbols(stripped, symbols) == mir
+
+
+@pytest.mark.parametrize("drop_source_refs", [False, True])
+def test_strip_api_mir(drop_source_refs):
+    with CompilationContext():
+        party = Party(name="Party1")
+        total = SecretInteger(Input(name="a", party=party))
+        for value in range(12):
+            total = total * SecretInteger(Input(name=f"b{value}", party=party))
+        mir = nada_dsl_to_nada_mir([Output(total, "total", party)])
+    assert len(mir["operations"]) >= 10
+
+    stripped, symbols = strip_mir(mir, drop_source_refs=drop_source_refs)
+    # The stripped MIR and its debug symbols are saved as JSON
+    stripped = json.loads(json.dumps(stripped))
+    symbols = json.loads(json.dumps(symbols))
+    assert join_debug_symbols(stripped, symbols) == json.loads(json.dumps(mir))
+
+
+@pytest.mark.parametrize("program", ["map_simple.py", "nada_fn_simple.py", None])
+def test_join_reordered_mir(program):
+    if program is None:
+        with CompilationContext():
+            party = Party(name="Party1")
+            total = SecretInteger(Input(name="a", party=party))
+            for value in range(12):
+                total = total * SecretInteger(Input(name=f"b{value}", party=party))
+            mir = json.loads(
+                json.dumps(nada_dsl_to_nada_mir([Output(total, "total", party)]))
+            )
+    else:
+        mir = compile_program(program)
+    stripped, symbols = strip_mir(mir, drop_source_refs=True)
+    # The stripped MIR is saved with sorted keys, which reorders its operations
+    stripped = json.loads(json.dumps(stripped, sort_keys=True))
+    symbols = json.loads(json.dumps(symbols))
+    joined = join_debug_symbols(stripped, symbols)
+    assert joined == mir
+
+
+def test_join_other_mir():
+    _, symbols = strip_mir(compile_program("map_simple.py"))
+    stripped, _ = strip_mir(compile_program("nada_fn_simple.py"))
+    with pytest.raises(ValueError):
+        join_debug_symbols(stripped, symbols)
+
+
+def test_strip_debug_symbols_file(tmp_path):
+    mir = compile_program("map_simple.py")
+    path = tmp_path / "debug.json"
+    stripped = strip_debug_symbols(mir, "all", str(path))
+    with open(path, encoding="utf-8") as file:
+        assert join_debug_symbols(stripped, json.load(file)) == mir
+
+
+def test_strip_needs_json_file():
+    with pytest.raises(SystemExit):
+        parse_args(["program.py", "--strip", "all", "-o", "-"])
+    with pytest.raises(SystemExit):
+        parse_args(["program.py", "--strip", "all", "-o", "a", "--format", "protobuf"])
@@ -0,0 +1,142 @@
+"""
+Protobuf MIR tests.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import array as pyarray
+import json
+import pytest
+from nada_dsl.ast_util import pack_literal_block
+from nada_dsl.compilation_context import CompilationContext
+from nada_dsl.compiler_frontend import CompilerException, nada_compile
+from nada_dsl.nada_types import Party
+from nada_dsl.nada_types.collections import Array, NTuple
+from nada_dsl.nada_types.function import nada_fn
+from nada_dsl.nada_types.scalar_types import Integer, SecretInteger
+from nada_dsl.program_io import Input, Output
+
+mir_proto = pytest.importorskip("nada_dsl.mir_proto")
+mir_pb = pytest.importorskip("nada_mir_proto.nillion.nada.mir.v1")
+operations_pb = pytest.importorskip("nada_mir_proto.nillion.nada.operations.v1")
+types_pb = pytest.importorskip("nada_mir_proto.nillion.nada.types.v1")
+
+
+def program():
+    party1 = Party(name="Party1")
+    party2 = Party(name="Party2")
+    a = SecretInteger(Input(name="a", party=party1))
+    b = SecretInteger(Input(name="b", party=party2))
+    array = Array(SecretInteger(Input(name="array", party=party2)), size=3)
+
+    @nada_fn
+    def scale(value: SecretInteger) -> SecretInteger:
+        return value * Integer(7)
+
+    return [
+        Output(a * b + Integer(3), "sum", party1),
+        Output(array.map(scale), "scaled", party2),
+    ]
+
+
+def test_proto_mir():
+    with CompilationContext():
+        data = mir_proto.nada_compile_proto(program())
+    with CompilationContext():
+        expected = json.loads(nada_compile(program()))
+    mir = mir_pb.ProgramMir().parse(data)
+
+    assert [party.name for party in mir.parties] == ["Party1", "Party2"]
+    assert [(i.name, i.party_id) for i in mir.inputs] == [
+        ("a", 0),
+        ("b", 1),
+        ("array", 1),
+    ]
+    assert [literal.value for literal in mir.literals] == ["3", "7"]
+    assert len(mir.operations) == len(expected["operations"])
+    assert len(mir.source_refs) == len(expected["source_refs"])
+    assert mir.source_files == expected["source_files"]
+
+    (output,) = [
+        operation
+        for operation in mir.operations
+        if operation.id == operations_pb.OperationVariant.ADDITION
+    ]
+    assert output.binary.op.id == mir.outputs[0].operation_id
+    assert output.binary.op.type.scalar == types_pb.ScalarType.SECRET_INTEGER
+
+    input_references = [
+        operation.input.refers_to
+        for operation in mir.operations
+        if operation.id == operations_pb.OperationVariant.INPUT_REF
+    ]
+    assert sorted(input_references) == [0, 1, 2]
+
+    (function,) = mir.functions
+    assert function.name == "scale"
+    assert function.args[0].type.scalar == types_pb.ScalarType.SECRET_INTEGER
+    variants = {operation.id for operation in function.operations}
+    assert operations_pb.OperationVariant.NADA_FN_ARG_REF in variants
+    assert operations_pb.OperationVariant.LITERAL_REF in variants
+
+
+def test_proto_mir_unsupported_operation():
+    party = Party(name="Party1")
+    with CompilationContext():
+        ntuple = NTuple.new([SecretInteger(Input(name="a", party=party)), Integer(1)])
+        with pytest.raises(CompilerException):
+            mir_proto.nada_compile_proto([Output(ntuple[0], "first", party)])
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        lambda left, right, scalar: left + right,
+        lambda left, right, scalar: left < right,
+        lambda left, right, scalar: scalar == left,
+        lambda left, right, scalar: scalar * left,
+        lambda left, right, scalar: Array(left, size=2) @ right,
+    ],
+)
+def test_proto_mir_unsupported_array_operation(operation):
+    party = Party(name="Party1")
+    with CompilationContext():
+        left = Array(SecretInteger(Input(name="left", party=party)), size=2)
+        right = Array(SecretInteger(Input(name="right", party=party)), size=2)
+        scalar = SecretInteger(Input(name="scalar", party=party))
+        output = Output(operation(left, right, scalar), "out", party)
+        with pytest.raises(CompilerException, match="not supported in protobuf MIR"):
+            mir_proto.nada_compile_proto([output])
+
+
+def test_proto_mir_array_accessor():
+    party = Party(name="Party1")
+    with CompilationContext():
+        array = Array(SecretInteger(Input(name="array", party=party)), size=2)
+        data = mir_proto.nada_compile_proto([Output(array.sum(), "sum", party)])
+    mir = mir_pb.ProgramMir().parse(data)
+
+    accessors = [
+        operation.array_accessor
+        for operation in mir.operations
+        if operation.id == operations_pb.OperationVariant.ARRAY_ACC
+    ]
+    assert sorted(accessor.index for accessor in accessors) == [0, 1]
+    (array_input,) = [
+        operation
+        for operation in mir.operations
+        if operation.id == operations_pb.OperationVariant.INPUT_REF
+    ]
+    assert {accessor.source for accessor in accessors} == {array_input.input.op.id}
+
+
+def test_proto_mir_literal_block():
+    party = Party(name="Party1")
+    with CompilationContext():
+        block = Array.literal_block([1, 2, 3])
+        data = mir_proto.nada_compile_proto([Output(block, "block", party)])
+    mir = mir_pb.ProgramMir().parse(data)
+
+    (literal,) = mir.literals
+    assert literal.type.composite.array.size == 3
+    assert literal.value == pack_literal_block(pyarray.array("q", [1, 2, 3]))
@@ -1,8 +1,10 @@
 """Tests for NadaType."""
 
 import pytest
-from nada_dsl.nada_types import NadaType
+from nada_dsl.ast_util import AST_OPERATIONS
+from nada_dsl.nada_types import NadaType, Party
 from nada_dsl.nada_types.scalar_types import Integer, PublicBoolean, SecretInteger
+from nada_dsl.program_io import Input
 
 
 @pytest.mark.parametrize(
@@ -16,3 +18,19 @@ from nada_dsl.nada_types.scalar_types import Integer, PublicBoolean, SecretInteg
 def test_class_to_mir(cls: NadaType, expected: str):
     """Tests `NadaType.class_to_mir()"""
     assert cls.class_to_mir() == expected
+
+
+def test_slotted_instances():
+    """Tests that Nada types, operations and AST operations don't have a `__dict__`"""
+    party = Party("party")
+    value = SecretInteger(Input(name="value", party=party)) + Integer(1)
+    instances = [
+        party,
+        value,
+        value.child,
+        value.child.source_ref,
+        AST_OPERATIONS[value.child.id],
+        Integer(2),
+    ]
+    for instance in instances:
+        assert not hasattr(instance, "__dict__"), type(instance).__name__
@@ -0,0 +1,35 @@
+"""Tests for OperationTable."""
+
+# pylint: disable=missing-function-docstring
+
+import pytest
+from nada_dsl.operation_table import OperationTable
+
+
+def test_operation_table():
+    table = OperationTable()
+    table[5] = "five"
+    table[6] = "six"
+    table[9] = "nine"
+    # Operations stored after their children, like nada functions
+    table[3] = "three"
+    table[6] = "six again"
+
+    assert len(table) == 4
+    assert list(table) == [3, 5, 6, 9]
+    assert table.values() == ["three", "five", "six again", "nine"]
+    assert table[6] == "six again"
+    assert 7 not in table and 9 in table and 1 not in table
+    for missing in (1, 4, 7, 10):
+        with pytest.raises(KeyError):
+            _ = table[missing]
+
+    del table[5]
+    assert list(table.items()) == [(3, "three"), (6, "six again"), (9, "nine")]
+    with pytest.raises(KeyError):
+        del table[5]
+
+    table.clear()
+    assert len(table) == 0
+    table[100] = "hundred"
+    assert list(table) == [100]
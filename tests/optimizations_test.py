@@ -0,0 +1,147 @@
+"""
+Optimization pass tests.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import json
+from nada_dsl.compilation_context import CompilationContext
+from nada_dsl.compiler_frontend import nada_compile
+from nada_dsl.nada_types import Party
+from nada_dsl.nada_types.collections import Array
+from nada_dsl.nada_types.function import nada_fn
+from nada_dsl.nada_types.scalar_types import Integer, PublicInteger, SecretInteger
+from nada_dsl.program_io import Input, Output
+
+
+def product_chain(size: int):
+    party = Party(name="Party1")
+    total = SecretInteger(Input(name="input_0", party=party))
+    for i in range(1, size):
+        total = total * SecretInteger(Input(name=f"input_{i}", party=party))
+    return [Output(total, "product", party)]
+
+
+def map_program(party: Party):
+    array = Array(SecretInteger(Input(name="array", party=party)), size=3)
+    secret = SecretInteger(Input(name="secret", party=party))
+
+    @nada_fn
+    def add(a: SecretInteger) -> SecretInteger:
+        return a + secret
+
+    return [Output(array.map(add), "output", party)]
+
+
+def depth(mir: dict, operation_id: int) -> int:
+    operation = next(iter(mir["operations"][str(operation_id)].values()))
+    children = [operation[key] for key in ("left", "right") if key in operation]
+    return 1 + max((depth(mir, child) for child in children), default=-1)
+
+
+def test_rebalance_product_chain():
+    with CompilationContext(rebalance=True) as context:
+        mir = json.loads(nada_compile(product_chain(16)))
+    assert context.rebalance_report.to_dict() == {
+        "chains": 1,
+        "depth_before": 15,
+        "depth_after": 4,
+    }
+    multiplications = [
+        operation
+        for operation in mir["operations"].values()
+        if "Multiplication" in operation
+    ]
+    assert len(multiplications) == 15
+    assert depth(mir, mir["outputs"][0]["operation_id"]) == 4
+    assert len(mir["inputs"]) == 16
+
+
+def test_rebalance_disabled_by_default():
+    with CompilationContext() as context:
+        mir = json.loads(nada_compile(product_chain(16)))
+    assert context.rebalance_report is None
+    assert depth(mir, mir["outputs"][0]["operation_id"]) == 15
+
+
+def test_rebalance_keeps_shared_results():
+    party = Party(name="Party1")
+    with CompilationContext(rebalance=True) as context:
+        a, b, c, d = (SecretInteger(Input(name=name, party=party)) for name in "abcd")
+        shared = a + b + c
+        outputs = [
+            Output(shared + d, "first", party),
+            Output(shared, "second", party),
+        ]
+        mir = json.loads(nada_compile(outputs))
+    assert context.rebalance_report.chains == 1
+    second = mir["outputs"][1]["operation_id"]
+    assert depth(mir, second) == 2
+    assert depth(mir, mir["outputs"][0]["operation_id"]) == 3
+
+
+def test_rebalance_non_secret_leaves():
+    party = Party(name="Party1")
+    with CompilationContext(rebalance=True) as context:
+        total = SecretInteger(Input(name="a", party=party))
+        total = total + PublicInteger(Input(name="b", party=party))
+        total = total + Integer(3)
+        for name in "cde":
+            total = total + SecretInteger(Input(name=name, party=party))
+        mir = json.loads(nada_compile([Output(total, "sum", party)]))
+    assert context.rebalance_report.depth_after == 3
+    additions = [
+        next(iter(operation.values()))
+        for operation in mir["operations"].values()
+        if "Addition" in operation
+    ]
+    assert len(additions) == 5
+    assert all(addition["type"] == "SecretInteger" for addition in additions)
+
+
+def test_rebalance_single_secret_leaf():
+    party = Party(name="Party1")
+    with CompilationContext(rebalance=True) as context:
+        total = SecretInteger(Input(name="a", party=party))
+        for value in range(3, 6):
+            total = total + Integer(value)
+        mir = json.loads(nada_compile([Output(total, "sum", party)]))
+    assert context.rebalance_report.chains == 1
+    output = mir["outputs"][0]["operation_id"]
+    assert "Addition" in mir["operations"][str(output)]
+    assert depth(mir, output) == 3
+    additions = [
+        operation for operation in mir["operations"].values() if "Addition" in operation
+    ]
+    assert len(additions) == 3
+
+
+def dead_operations_program(party: Party):
+    a, b = (SecretInteger(Input(name=name, party=party)) for name in "ab")
+    unused = a * b + Integer(3)
+    return [Output(a + b, "sum", party)], unused
+
+
+def test_eliminate_dead_operations():
+    party = Party(name="Party1")
+    with CompilationContext(eliminate_dead_operations=True) as context:
+        outputs, unused = dead_operations_program(party)
+        mir = json.loads(nada_compile(outputs))
+    report = context.dead_operation_report
+    assert report.removed == 3
+    assert unused.child.id not in context.operations
+    assert len(context.operations) == report.operations - report.removed == 3
+    with CompilationContext() as context:
+        outputs, unused = dead_operations_program(party)
+        assert json.loads(nada_compile(outputs)) == mir
+    assert context.dead_operation_report is None
+    assert unused.child.id in context.operations
+
+
+def test_eliminate_dead_operations_keeps_functions():
+    party = Party(name="Party1")
+    with CompilationContext(eliminate_dead_operations=True) as context:
+        mir = json.loads(nada_compile(map_program(party)))
+    assert context.dead_operation_report.removed == 0
+    with CompilationContext() as context:
+        assert json.loads(nada_compile(map_program(party))) == mir
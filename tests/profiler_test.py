@@ -0,0 +1,77 @@
+"""
+Operation profiler tests.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import itertools
+import time
+import pytest
+from nada_dsl.compilation_context import CompilationContext
+from nada_dsl.nada_types import Party
+from nada_dsl.nada_types.scalar_types import Integer, SecretInteger
+from nada_dsl.profiler import profiler
+from nada_dsl.program_io import Input
+
+
+@pytest.fixture(name="enabled_profiler")
+def fixture_enabled_profiler():
+    profiler.enable()
+    yield profiler
+    profiler.disable()
+
+
+def build_program():
+    party = Party(name="Party1")
+    a = SecretInteger(Input(name="a", party=party))
+    b = SecretInteger(Input(name="b", party=party))
+    total = a
+    for _ in range(5):
+        total = total * b + Integer(1)
+    return total
+
+
+def test_profile_operations(enabled_profiler):
+    with CompilationContext():
+        build_program()
+    report = enabled_profiler.report()
+    assert list(report["operations"]) == [
+        "Multiplication",
+        "Literal",
+        "Addition",
+        "Input",
+    ]
+    counts = {name: stats["count"] for name, stats in report["operations"].items()}
+    assert counts == {"Multiplication": 5, "Literal": 5, "Addition": 5, "Input": 2}
+    for stats in report["operations"].values():
+        assert 0 <= stats["store_seconds"] <= stats["construct_seconds"]
+    assert report["operations"]["Multiplication"]["source_ref_seconds"] > 0
+    top_line = report["lines"][0]
+    assert top_line["file"] == __file__
+    assert top_line["count"] == 15
+    assert top_line["operations"] == {"Multiplication": 5, "Literal": 5, "Addition": 5}
+
+
+def test_profile_operation_constructors(enabled_profiler, monkeypatch):
+    # Every reading of the clock advances it by one second
+    clock = itertools.count()
+    monkeypatch.setattr(time, "perf_counter", lambda: float(next(clock)))
+    with CompilationContext():
+        party = Party(name="Party1")
+        a = SecretInteger(Input(name="a", party=party))
+        a * a  # pylint: disable=pointless-statement
+    stats = enabled_profiler.report()["operations"]["Multiplication"]
+    # The operator walks two frames back to the program line, then runs the
+    # constructor, converts the type and stores the operation
+    assert stats["source_ref_seconds"] == 2
+    assert stats["construct_seconds"] == 3
+    assert stats["store_seconds"] == 1
+    assert not enabled_profiler.started
+
+
+def test_profiler_disabled():
+    profiler.enable()
+    profiler.disable()
+    with CompilationContext():
+        build_program()
+    assert profiler.report() == {"operations": {}, "lines": []}
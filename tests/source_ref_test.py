@@ -0,0 +1,67 @@
+"""
+Source reference tests.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import json
+import pytest
+from nada_dsl.compilation_context import CompilationContext
+from nada_dsl.compiler_frontend import nada_compile
+from nada_dsl.nada_types import Party
+from nada_dsl.nada_types.scalar_types import SecretInteger
+from nada_dsl.program_io import Input, Output
+from nada_dsl.source_ref import build_line_table
+
+
+def test_build_line_table():
+    src = "first\n\nthird line\r\nlast"
+    offsets, lengths = build_line_table(src)
+    lines = src.splitlines()
+    assert lengths == [len(line) for line in lines]
+    for lineno in range(1, len(lines) + 1):
+        assert offsets[lineno - 1] == sum(len(line) + 1 for line in lines[: lineno - 1])
+
+
+def test_source_ref_offsets():
+    party = Party(name="Party1")
+    with CompilationContext() as context:
+        secret = SecretInteger(Input(name="a", party=party))
+        mir = json.loads(nada_compile([Output(secret, "output", party)]))
+    assert __file__.endswith(mir["source_refs"][0]["file"])
+    src = mir["source_files"][mir["source_refs"][0]["file"]]
+    for ref in mir["source_refs"]:
+        line = src[ref["offset"] : ref["offset"] + ref["length"]]
+        assert line == src.splitlines()[ref["lineno"] - 1]
+    assert list(context.source_lines) == list(context.used_sources)
+
+
+def source_ref_program():
+    party = Party(name="Party1")
+    a = SecretInteger(Input(name="a", party=party))
+    b = SecretInteger(Input(name="b", party=party))
+    return [Output(a * b, "product", party)]
+
+
+def test_lazy_source_refs():
+    with CompilationContext():
+        eager = nada_compile(source_ref_program())
+    with CompilationContext(source_ref_mode="lazy") as context:
+        outputs = source_ref_program()
+        assert not context.used_sources
+        lazy = nada_compile(outputs)
+    assert lazy == eager
+
+
+def test_no_source_refs():
+    with CompilationContext(source_ref_mode="off"):
+        mir = json.loads(nada_compile(source_ref_program()))
+    assert mir["source_files"] == {}
+    assert mir["source_refs"] == [{"lineno": 0, "offset": 0, "file": "", "length": 0}]
+    for operation in mir["operations"].values():
+        assert next(iter(operation.values()))["source_ref_index"] == 0
+
+
+def test_invalid_source_ref_mode():
+    with pytest.raises(ValueError):
+        CompilationContext(source_ref_mode="sampled")
@@ -0,0 +1,80 @@
+"""
+Timer tests.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import tracemalloc
+import pytest
+from nada_dsl.timer import DefaultClock, TimerError
+
+
+def test_nested_timers():
+    clock = DefaultClock()
+    clock.start("compile")
+    for _ in range(3):
+        clock.start("output")
+        clock.stop("output")
+    clock.stop("compile")
+    report = clock.report()
+    assert list(report) == ["compile", "compile;output"]
+    output = report["compile;output"]
+    assert output["count"] == 3
+    assert output["min"] <= output["max"] <= output["total"]
+    assert report["compile"]["total"] >= output["total"]
+    assert "peak_memory" not in output
+
+
+def test_reentrant_timers():
+    clock = DefaultClock()
+    clock.start("function")
+    clock.start("function")
+    clock.stop("function")
+    clock.stop("function")
+    assert clock.report()["function;function"]["count"] == 1
+    assert clock.report()["function"]["count"] == 1
+    with pytest.raises(TimerError):
+        clock.stop("function")
+
+
+def test_stop_closes_inner_timers():
+    clock = DefaultClock()
+    clock.start("outer")
+    clock.start("inner")
+    clock.stop("outer")
+    assert not clock.running
+    assert set(clock.report()) == {"outer", "outer;inner"}
+
+
+def test_memory_tracking():
+    tracing = tracemalloc.is_tracing()
+    clock = DefaultClock(track_memory=True)
+    try:
+        clock.start("outer")
+        clock.start("inner")
+        data = [bytearray(1024) for _ in range(1024)]
+        clock.stop("inner")
+        del data
+        clock.stop("outer")
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    report = clock.report()
+    assert report["outer;inner"]["peak_memory"] >= 1024 * 1024
+    assert report["outer"]["peak_memory"] >= report["outer;inner"]["peak_memory"]
+
+
+def test_exports():
+    clock = DefaultClock()
+    clock.start("outer")
+    clock.start("inner")
+    clock.stop("inner")
+    clock.stop("outer")
+    events = clock.chrome_trace()["traceEvents"]
+    assert [event["name"] for event in events] == ["outer", "inner"]
+    assert all(event["ph"] == "X" for event in events)
+    assert events[0]["ts"] <= events[1]["ts"]
+    assert events[1]["dur"] <= events[0]["dur"]
+    lines = clock.folded_stacks().splitlines()
+    assert [line.rsplit(" ", 1)[0] for line in lines] == ["outer", "outer;inner"]
+    assert all(int(line.rsplit(" ", 1)[1]) >= 0 for line in lines)